@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Benchmark command startup through dotenv-run.
+
+Compares the wall time of starting ``true`` with a 200-variable .env file:
+- current pattern: sh -c 'load-dotenv FILE && true'
+- exec mode: dotenv-run -f FILE -- true
+
+Usage: python benchmarks/bench_exec.py [runs]
+"""
+
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parent.parent / 'src')
+CLI = [sys.executable, '-c', 'from dotenv_tools.cli import cli; cli()']
+
+
+def time_command(cmd, cwd, env, runs):
+    """Return the median wall time of a command in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, env=env, stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / 'app.env'
+        env_file.write_text(''.join(f'KEY_{i}=value_{i}\n' for i in range(200)))
+        state_file = Path(tmpdir) / 'state.json'
+        env = dict(os.environ, PYTHONPATH=SRC)
+
+        load_then_run = ' '.join(shlex.quote(arg) for arg in CLI + [
+            'load-dotenv', str(env_file), '--state-file', str(state_file)])
+        shell_pattern = time_command(
+            ['sh', '-c', f'{load_then_run} && true'], tmpdir, env, runs)
+        exec_mode = time_command(
+            CLI + ['dotenv-run', '-f', str(env_file), '--', 'true'], tmpdir, env, runs)
+
+    print(f"sh -c 'load-dotenv && cmd' : {shell_pattern:8.2f} ms")
+    print(f"dotenv-run -- cmd          : {exec_mode:8.2f} ms "
+          f"({exec_mode - shell_pattern:+.2f} ms)")
+
+
+if __name__ == '__main__':
+    main()
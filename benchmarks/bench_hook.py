@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark the load-dotenv shell hook.
+
+Measures the wall time of one prompt's worth of hook work:
+- fast path: nothing changed, answered with stat calls only
+- slow path: the .env file changed and is parsed and resolved again
+
+Usage: python benchmarks/bench_hook.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parent.parent / 'src')
+sys.path.insert(0, SRC)
+
+from dotenv_tools import hook  # noqa: E402
+
+HOOK_CMD = [sys.executable, '-c', 'from dotenv_tools.hook import main; main()', '--hook', 'bash']
+
+
+def time_command(cmd, cwd, env, runs):
+    """Return the median wall time of a command in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, env=env, stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def time_in_process(env_file, environ, runs):
+    """Return the median time of the freshness check in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        hook.is_fresh(env_file, environ)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / '.env'
+        env_file.write_text(''.join(f'KEY_{i}=value_{i}\n' for i in range(200)))
+
+        env = dict(os.environ, PYTHONPATH=SRC)
+        env.pop(hook.HOOK_FINGERPRINT_VAR, None)
+        slow = time_command(HOOK_CMD, tmpdir, env, runs)
+
+        env[hook.HOOK_FINGERPRINT_VAR] = hook.file_fingerprint(str(env_file))
+        fast = time_command(HOOK_CMD, tmpdir, env, runs)
+        interpreter = time_command([sys.executable, '-c', 'pass'], tmpdir, env, runs)
+        check = time_in_process(str(env_file), env, runs * 50)
+
+    print(f"interpreter startup      : {interpreter:8.2f} ms")
+    print(f"hook fast path (process) : {fast:8.2f} ms "
+          f"({fast - interpreter:+.2f} ms over interpreter)")
+    print(f"hook slow path (process) : {slow:8.2f} ms")
+    print(f"freshness check          : {check:8.4f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark loading a .env file at application startup.
+
+Compares cold interpreter start + import + load of a 200-variable file:
+- dotenv_tools.load(path)
+- LoadDotenv(path).load() followed by Tracker(state).load_variables()
+
+Usage: python benchmarks/bench_load.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parent.parent / 'src')
+
+FAST = "import sys, dotenv_tools; dotenv_tools.load(sys.argv[1])"
+TRACKED = (
+    "import sys; from pathlib import Path\n"
+    "from dotenv_tools import LoadDotenv, Tracker\n"
+    "variables = LoadDotenv(Path(sys.argv[1])).load()\n"
+    "Tracker(Path(sys.argv[2])).load_variables(variables)\n"
+)
+
+
+def time_command(cmd, env, runs):
+    """Return the median wall time of a command in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / 'app.env'
+        env_file.write_text(''.join(f'KEY_{i}=value_{i}\n' for i in range(200)))
+        state_file = Path(tmpdir) / 'state.json'
+        env = dict(os.environ, PYTHONPATH=SRC)
+
+        baseline = time_command([sys.executable, '-c', 'pass'], env, runs)
+        fast = time_command([sys.executable, '-c', FAST, str(env_file)], env, runs)
+        tracked = time_command(
+            [sys.executable, '-c', TRACKED, str(env_file), str(state_file)], env, runs)
+
+    print(f"interpreter startup                 : {baseline:8.2f} ms")
+    print(f"dotenv_tools.load()                 : {fast:8.2f} ms "
+          f"({fast - baseline:+.2f} ms)")
+    print(f"LoadDotenv().load() + Tracker       : {tracked:8.2f} ms "
+          f"({tracked - baseline:+.2f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark how forked workers obtain their environment.
+
+Forks N workers that each get the variables of a 200-variable file:
+- LoadDotenv(path).load() in every worker
+- SharedEnvReader().read() from a segment the parent published once
+
+Usage: python benchmarks/bench_shared.py [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from dotenv_tools.core import LoadDotenv  # noqa: E402
+from dotenv_tools.parser import clear_parse_cache  # noqa: E402
+from dotenv_tools.shared import SharedEnvReader, publish_dotenv  # noqa: E402
+
+
+def fork_workers(count, work):
+    """Fork workers running ``work`` and return the total wall time in ms."""
+    start = time.perf_counter()
+    pids = []
+    for _ in range(count):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                work()
+            finally:
+                os._exit(0)
+        pids.append(pid)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / 'app.env'
+        env_file.write_text(''.join(
+            f'KEY_{i}=value_{i}\nURL_{i}=http://${{KEY_{i}}}/path\n' for i in range(100)
+        ))
+
+        clear_parse_cache()
+        parse = fork_workers(workers, lambda: LoadDotenv(env_file).load(env={}))
+
+        with publish_dotenv(env_file):
+            shared = fork_workers(workers, lambda: SharedEnvReader().read())
+
+    print(f"{workers} workers, LoadDotenv().load() each : {parse:8.2f} ms")
+    print(f"{workers} workers, SharedEnvReader().read()  : {shared:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
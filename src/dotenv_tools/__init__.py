@@ -7,6 +7,8 @@ This package provides:
 - Support for all dotenv syntax: =, :=, +=, ?=
 - Variable expansion: ${VAR}, ${VAR:-default}, ${VAR:=default}, ${VAR:+alt}
 - Export prefix support
+- dotenv_tools.load() for minimal-import loading at application startup
+- dotenv_tools.applied() to apply a .env file temporarily
 """
 
 __version__ = "0.0.1"
@@ -14,13 +16,35 @@ __author__ = "LousyBook01"
 __email__ = "lousybook94@gmail.com"
 __description__ = "A comprehensive CLI tool to manage environment variables in .env files"
 
-# Expose main classes
-from .core import LoadDotenv
-from .tracker import Tracker
-from .setter import SetDotenv
+# Main classes are imported on first access, so that importing a submodule
+# (e.g. the load-dotenv shell hook) doesn't pay for all of them
+_LAZY_EXPORTS = {
+    "LoadDotenv": "core",
+    "Tracker": "tracker",
+    "SetDotenv": "setter",
+    "load": "startup",
+    "applied": "context",
+}
 
 __all__ = [
     "LoadDotenv",
     "Tracker",
     "SetDotenv",
+    "load",
+    "applied",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
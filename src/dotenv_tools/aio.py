@@ -0,0 +1,142 @@
+"""Asyncio support for loading .env files.
+
+This module provides:
+- A shared, bounded thread pool for blocking file I/O
+- run_blocking() to offload a call without blocking the event loop
+- aload() and aresolve_many() coroutines mirroring LoadDotenv.load()
+
+File reads and parsing run in worker threads; expansion runs on the event
+loop, so results are identical to the synchronous API.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Maximum number of worker threads used for file I/O by default
+DEFAULT_MAX_WORKERS = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared bounded executor used for file I/O.
+
+    The executor is created on first use.
+
+    Returns:
+        The shared ThreadPoolExecutor
+    """
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_MAX_WORKERS,
+                    thread_name_prefix='dotenv-tools-io',
+                )
+    return _executor
+
+
+async def run_blocking(
+    func: Callable[..., Any], *args: Any, executor: Optional[Executor] = None
+) -> Any:
+    """Run a blocking callable in an executor and await its result.
+
+    Cancelling the awaiting task cancels the wait; a call that is already
+    running in a worker thread finishes in the background and its result
+    is discarded.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for the callable
+        executor: Executor to use (default: the shared bounded pool)
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor or get_executor(), functools.partial(func, *args)
+    )
+
+
+async def aload(
+    env_file: Path,
+    override: bool = False,
+    env: Optional[Dict[str, str]] = None,
+    executor: Optional[Executor] = None,
+) -> Dict[str, str]:
+    """Load variables from a .env file without blocking the event loop.
+
+    Args:
+        env_file: Path to the .env file
+        override: If True, override existing environment variables
+        env: Custom environment dictionary for expansion (default: os.environ)
+        executor: Executor for file I/O (default: the shared bounded pool)
+
+    Returns:
+        Dictionary of loaded variables
+
+    Raises:
+        LoadDotenvFileNotFound: If the .env file doesn't exist
+        LoadDotenvError: If there's an error parsing or loading
+    """
+    from .core import LoadDotenv
+
+    return await LoadDotenv(Path(env_file)).aload(
+        override=override, env=env, executor=executor
+    )
+
+
+async def aresolve_many(
+    env_files: Iterable[Path],
+    override: bool = False,
+    env: Optional[Dict[str, str]] = None,
+    max_concurrency: int = DEFAULT_MAX_WORKERS,
+    executor: Optional[Executor] = None,
+) -> List[Dict[str, str]]:
+    """Load several .env files concurrently.
+
+    Each file is resolved independently, exactly as ``LoadDotenv(f).load()``
+    would. At most ``max_concurrency`` files are read at the same time. If
+    any load fails, the remaining loads are cancelled and the error is
+    raised.
+
+    Args:
+        env_files: Paths to the .env files
+        override: If True, override existing environment variables
+        env: Custom environment dictionary for expansion (default: os.environ)
+        max_concurrency: Maximum number of files read concurrently
+        executor: Executor for file I/O (default: the shared bounded pool)
+
+    Returns:
+        List of loaded variable dictionaries, in the order of ``env_files``
+
+    Raises:
+        ValueError: If max_concurrency is less than 1
+        LoadDotenvFileNotFound: If a .env file doesn't exist
+        LoadDotenvError: If there's an error parsing or loading a file
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def load_one(path: Path) -> Dict[str, str]:
+        async with semaphore:
+            return await aload(path, override=override, env=env, executor=executor)
+
+    tasks = [asyncio.ensure_future(load_one(path)) for path in env_files]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        # On error or cancellation, don't leave sibling loads running
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -5,21 +5,47 @@ Provides load-dotenv, unload-dotenv, and set-dotenv commands.
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
 
-from .core import LoadDotenv, find_dotenv_file, LoadDotenvError, LoadDotenvFileNotFound
-from .tracker import Tracker
-from .setter import SetDotenv, find_or_create_dotenv_file, SetDotenvError, SetDotenvFileNotFound
-from .extras import (
-    export_dotenv, generate_dotenv_template, compare_dotenv_files,
-    install_shell_completion, DotenvTemplate, DotenvDiffer, DotenvExporter, ShellCompleter
-)
+if TYPE_CHECKING:
+    from .core import LoadDotenv
+    from .tracker import Tracker
+
+# Every command is an entry point of its own, so the modules behind each
+# command (and PyYAML in particular) are imported inside the command that
+# needs them rather than here.
+
+
+# Default state file location; '.db' keeps a separate state per session
+DEFAULT_STATE_FILE = Path.home() / '.load_dotenv_state.db'
+
+# Default state file before sessions; imported into DEFAULT_STATE_FILE once
+LEGACY_STATE_FILE = Path.home() / '.load_dotenv_state.json'
+
+_SESSION_HELP = ('Session to track variables in (default: $DOTENV_TOOLS_SESSION or the '
+                 'terminal session; needs a .db state file)')
+
+
+def _open_tracker(state_file: Path, session: Optional[str]) -> 'Tracker':
+    """Create a Tracker, turning a misused --session into a usage error.
+
+    With the default state file, state left in LEGACY_STATE_FILE by an
+    older version is imported into the session first.
+    """
+    from .tracker import Tracker
 
+    try:
+        tracker = Tracker(state_file, session=session)
+    except ValueError as e:
+        raise click.UsageError(str(e))
 
-# Default state file location
-DEFAULT_STATE_FILE = Path.home() / '.load_dotenv_state.json'
+    if state_file == DEFAULT_STATE_FILE and LEGACY_STATE_FILE.exists():
+        from .state import import_json_state
+        if import_json_state(LEGACY_STATE_FILE, tracker.store):
+            click.echo(f"[INFO] Imported state from {LEGACY_STATE_FILE}", err=True)
+    return tracker
 
 
 @click.group(invoke_without_command=True)
@@ -39,7 +65,47 @@ def cli(ctx: click.Context):
         click.echo("Use 'load-dotenv --help' for usage information")
 
 
-@cli.command()
+class _ExecCommand(click.Command):
+    """Command that passes everything after ``--`` to ``--exec``."""
+
+    def parse_args(self, ctx: click.Context, args: list) -> list:
+        if '--' in args and '--exec' in args[:args.index('--')]:
+            index = args.index('--')
+            ctx.meta['exec_command'] = args[index + 1:]
+            args = args[:index]
+        return super().parse_args(ctx, args)
+
+
+def _exec_with_dotenv(files: list, override: bool, command: list) -> None:
+    """Replace this process with a command run under the resolved .env files.
+
+    Args:
+        files: .env files to load (default: search for .env)
+        override: If True, override existing environment variables
+        command: Program and arguments
+    """
+    from .core import find_dotenv_file, LoadDotenvError
+    from .expansion import ExpansionError
+    from .runner import resolve_environment, exec_command
+
+    try:
+        if not files:
+            files = [find_dotenv_file()]
+        env = resolve_environment(files, override=override)
+    except LoadDotenvError as e:
+        raise click.ClickException(f"Error loading .env file: {e}")
+    except ExpansionError as e:
+        raise click.ClickException(f"Error expanding variables: {e}")
+
+    try:
+        exec_command(command, env)
+    except OSError as e:
+        error = click.ClickException(f"Cannot run {command[0]}: {e.strerror}")
+        error.exit_code = 127 if isinstance(e, FileNotFoundError) else 126
+        raise error
+
+
+@cli.command(cls=_ExecCommand)
 @click.argument('file', type=Path, required=False)
 @click.option(
     '--override', '-o',
@@ -52,16 +118,42 @@ def cli(ctx: click.Context):
     default=DEFAULT_STATE_FILE,
     help=f'Path to state file (default: {DEFAULT_STATE_FILE})'
 )
+@click.option('--session', help=_SESSION_HELP)
 @click.option(
     '--verbose', '-v',
     is_flag=True,
     help='Show detailed output'
 )
+@click.option(
+    '--watch', '-w',
+    is_flag=True,
+    help='Keep running and reload the file whenever it changes'
+)
+@click.option(
+    '--hook',
+    type=click.Choice(['bash', 'zsh', 'fish']),
+    help='Print export/unset statements for a shell prompt hook to eval'
+)
+@click.option(
+    '--exec', 'exec_mode',
+    is_flag=True,
+    help='Run the command after -- with the loaded variables'
+)
+@click.option(
+    '--no-lock',
+    is_flag=True,
+    help='Ignore FILE.lock and always parse the .env file'
+)
 def load_dotenv(
     file: Optional[Path],
     override: bool,
     state_file: Path,
-    verbose: bool
+    session: Optional[str],
+    verbose: bool,
+    watch: bool,
+    hook: Optional[str],
+    exec_mode: bool,
+    no_lock: bool
 ):
     """Load environment variables from a .env file.
 
@@ -75,7 +167,39 @@ def load_dotenv(
         load-dotenv /path/to/custom.env
 
         load-dotenv --override /path/to/.env
+
+        load-dotenv --session build-42
+
+        load-dotenv --watch
+
+        eval "$(load-dotenv --hook bash)"
+
+        load-dotenv --exec -- python app.py
     """
+    from .core import LoadDotenv, find_dotenv_file, LoadDotenvError, LoadDotenvFileNotFound
+
+    if exec_mode:
+        command = click.get_current_context().meta.get('exec_command')
+        if not command:
+            raise click.ClickException("Please specify a command after --")
+        _exec_with_dotenv([file] if file else [], override, command)
+        return
+
+    if hook:
+        from .expansion import ExpansionError
+        from .hook import build_script
+        try:
+            script = build_script(hook, str(file) if file else None, override)
+        except LoadDotenvError as e:
+            raise click.ClickException(f"Error loading .env file: {e}")
+        except ExpansionError as e:
+            raise click.ClickException(f"Error expanding variables: {e}")
+        if script:
+            click.echo(script)
+        return
+
+    tracker = _open_tracker(state_file, session)
+
     try:
         # Find the .env file
         if file is None:
@@ -87,6 +211,10 @@ def load_dotenv(
             if not env_file.exists():
                 raise click.ClickException(f"File not found: {env_file}")
 
+        # Fingerprint before reading, so an edit during the load shows as drift
+        from .fingerprint import file_fingerprint
+        fingerprint = file_fingerprint(env_file)
+
         # Initialize loader
         loader = LoadDotenv(env_file)
 
@@ -94,18 +222,27 @@ def load_dotenv(
         if verbose:
             click.echo(f"Loading environment variables from {env_file}...")
 
-        variables_to_set = loader.load(override=override)
+        base_env = dict(os.environ)
+        variables_to_set = None
+        if not no_lock:
+            from .lockfile import load_locked
+            variables_to_set = load_locked(env_file, override=override)
+            if variables_to_set is not None and verbose:
+                click.echo(f"Using lockfile for {env_file}")
+        if variables_to_set is None:
+            variables_to_set = loader.load(override=override)
 
         if not variables_to_set:
             if verbose:
                 click.echo("No variables to load.")
+            if watch:
+                _watch_dotenv(loader, tracker, override, base_env)
             return
 
         # Track and set variables
-        tracker = Tracker(state_file)
-        tracker.snapshot_environment()
-
-        loaded_count = tracker.load_variables(variables_to_set)
+        source = str(env_file.resolve())
+        tracker.record_source(source, fingerprint, variables_to_set, override)
+        loaded_count = tracker.load_variables(variables_to_set, source=source)
 
         if verbose:
             for key, value in variables_to_set.items():
@@ -121,6 +258,9 @@ def load_dotenv(
         else:
             click.echo(f"\n[INFO] No new variables loaded")
 
+        if watch:
+            _watch_dotenv(loader, tracker, override, base_env)
+
     except LoadDotenvFileNotFound as e:
         raise click.ClickException(str(e))
     except LoadDotenvError as e:
@@ -129,6 +269,236 @@ def load_dotenv(
         raise click.ClickException(f"Unexpected error: {e}")
 
 
+def _is_sensitive(key: str) -> bool:
+    """Check whether a variable's value should be hidden in output."""
+    return any(sensitive in key.lower() for sensitive in
+               ['password', 'secret', 'key', 'token', 'auth'])
+
+
+def _watch_dotenv(
+    loader: 'LoadDotenv',
+    tracker: 'Tracker',
+    override: bool,
+    base_env: dict
+) -> None:
+    """Reload a .env file on every change until interrupted.
+
+    Args:
+        loader: Loader for the watched file
+        tracker: Tracker used to apply and record changes
+        override: If True, override existing environment variables
+        base_env: Environment the file is resolved against
+    """
+    import time
+
+    def on_change(delta):
+        tracker.apply_variables(handle.values, prune=True)
+
+        for key, value in sorted(delta.added.items()):
+            click.echo(f"  + {key} = {'*****' if _is_sensitive(key) else value}")
+        for key, value in sorted(delta.changed.items()):
+            click.echo(f"  ~ {key} = {'*****' if _is_sensitive(key) else value}")
+        for key in delta.removed:
+            click.echo(f"  - {key}")
+
+    handle = loader.watch(on_change, override=override, env=base_env)
+    click.echo(f"[WATCH] Watching {loader.env_file} for changes (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        handle.stop()
+
+
+@cli.command(context_settings={
+    'allow_interspersed_args': False,
+    'ignore_unknown_options': True,
+})
+@click.option(
+    '--file', '-f', 'files',
+    type=Path,
+    multiple=True,
+    help='Path to .env file (can be repeated; default: finds .env)'
+)
+@click.option(
+    '--override', '-o',
+    is_flag=True,
+    help='Override existing environment variables'
+)
+@click.option(
+    '--watch', '-w',
+    is_flag=True,
+    help='Keep running and reload COMMAND when the .env files change'
+)
+@click.option(
+    '--signal', 'reload_signal',
+    default='restart',
+    show_default=True,
+    help="With --watch: 'restart', or a signal to send instead (e.g. HUP)"
+)
+@click.option(
+    '--debounce',
+    type=float,
+    default=0.5,
+    show_default=True,
+    help='With --watch: seconds the files must be quiet before a reload'
+)
+@click.option(
+    '--matrix', '-m', 'matrix',
+    multiple=True,
+    help='Run COMMAND once per .env file matching this glob (can be repeated)'
+)
+@click.option(
+    '--jobs', '-j',
+    type=click.IntRange(min=1),
+    default=None,
+    help='With --matrix: number of runs at the same time (default: CPU count)'
+)
+@click.argument('command', nargs=-1, required=True, type=click.UNPROCESSED)
+def dotenv_run(
+    files: tuple,
+    override: bool,
+    watch: bool,
+    reload_signal: str,
+    debounce: float,
+    matrix: tuple,
+    jobs: Optional[int],
+    command: tuple
+):
+    """Run a command with variables from .env files.
+
+    The current process is replaced by COMMAND, so no state file is
+    written and nothing is printed.
+
+    With --watch, a supervisor stays in front of COMMAND and reloads it
+    when the resolved variables change: it restarts COMMAND, or with
+    --signal it writes the changed keys as JSON to the file named by
+    $DOTENV_DELTA_FILE and sends COMMAND that signal.
+
+    With --matrix, COMMAND runs once per matching .env file, on top of the
+    files given with --file. Output lines are prefixed with the file name,
+    and a summary of exit codes and timings is printed at the end.
+
+    Examples:
+
+        dotenv-run -- python app.py
+
+        dotenv-run -f .env -f .env.local -- gunicorn app:app
+
+        dotenv-run --watch --signal HUP -- gunicorn app:app
+
+        dotenv-run --matrix 'envs/*.env' -j 8 -- pytest tests/integration
+    """
+    if matrix:
+        if watch:
+            raise click.UsageError("--matrix can't be combined with --watch")
+        _run_matrix(list(files), list(matrix), override, jobs, list(command))
+        return
+    if jobs is not None:
+        raise click.UsageError("--jobs requires --matrix")
+
+    if not watch:
+        if reload_signal != 'restart':
+            raise click.UsageError("--signal requires --watch")
+        _exec_with_dotenv(list(files), override, list(command))
+        return
+
+    from .core import find_dotenv_file, LoadDotenvError
+    from .expansion import ExpansionError
+    from .supervisor import Supervisor
+
+    try:
+        env_files = list(files) or [find_dotenv_file()]
+    except LoadDotenvError as e:
+        raise click.ClickException(str(e))
+
+    try:
+        supervisor = Supervisor(
+            env_files,
+            list(command),
+            override=override,
+            reload_signal=reload_signal,
+            debounce=debounce,
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--signal')
+
+    try:
+        code = supervisor.run()
+    except LoadDotenvError as e:
+        raise click.ClickException(f"Error loading .env file: {e}")
+    except ExpansionError as e:
+        raise click.ClickException(f"Error expanding variables: {e}")
+    except OSError as e:
+        error = click.ClickException(f"Cannot run {command[0]}: {e.strerror}")
+        error.exit_code = 127 if isinstance(e, FileNotFoundError) else 126
+        raise error
+    # Negative codes mean the command was killed by a signal
+    raise SystemExit(code if code >= 0 else 128 - code)
+
+
+def _run_matrix(
+    files: list,
+    patterns: list,
+    override: bool,
+    jobs: Optional[int],
+    command: list
+) -> None:
+    """Run a command once per matrix .env file and exit with the overall status."""
+    from .core import LoadDotenvError
+    from .expansion import ExpansionError
+    from .matrix import expand_matrix, format_summary, resolve_matrix, run_matrix
+
+    matrix_files = expand_matrix(patterns)
+    if not matrix_files:
+        raise click.ClickException(f"No .env files match: {' '.join(patterns)}")
+
+    jobs = jobs or os.cpu_count() or 1
+    try:
+        envs = resolve_matrix(matrix_files, files, override=override, max_concurrency=jobs)
+    except LoadDotenvError as e:
+        raise click.ClickException(f"Error loading .env file: {e}")
+    except ExpansionError as e:
+        raise click.ClickException(f"Error expanding variables: {e}")
+
+    results = run_matrix(list(zip(matrix_files, envs)), command, jobs=jobs)
+    click.echo(format_summary(results), err=True)
+    raise SystemExit(0 if all(r.ok for r in results) else 1)
+
+
+@cli.command()
+@click.option(
+    '--socket', 'socket_path',
+    type=str,
+    help='Unix socket path (default: $XDG_RUNTIME_DIR/dotenv-tools.sock)'
+)
+def serve(socket_path: Optional[str]):
+    """Run the resolution daemon.
+
+    The daemon keeps parsed .env files in memory, re-parses them when they
+    change, and resolves them for load-dotenv --hook, load-dotenv --exec and
+    dotenv-run. Those commands fall back to resolving in-process when the
+    daemon isn't running.
+
+    Examples:
+
+        dotenv-tools serve
+
+        dotenv-tools serve --socket /run/user/1000/dotenv.sock
+    """
+    from .daemon import DaemonError, serve as run_daemon
+    from .client import default_socket_path
+
+    socket_path = socket_path or default_socket_path()
+    try:
+        click.echo(f"Serving on {socket_path}")
+        run_daemon(socket_path)
+    except DaemonError as e:
+        raise click.ClickException(str(e))
+
+
 @cli.command()
 @click.option(
     '--state-file',
@@ -136,6 +506,7 @@ def load_dotenv(
     default=DEFAULT_STATE_FILE,
     help=f'Path to state file (default: {DEFAULT_STATE_FILE})'
 )
+@click.option('--session', help=_SESSION_HELP)
 @click.option(
     '--verbose', '-v',
     is_flag=True,
@@ -146,15 +517,24 @@ def load_dotenv(
     is_flag=True,
     help='Unload without confirmation'
 )
+@click.option(
+    '--last',
+    is_flag=True,
+    help='Undo only the most recent load'
+)
 def unload_dotenv(
     state_file: Path,
+    session: Optional[str],
     verbose: bool,
-    force: bool
+    force: bool,
+    last: bool
 ):
     """Remove all environment variables loaded by this tool.
 
     This command will remove all variables that were loaded by load-dotenv
-    and are currently tracked in the state file.
+    and are currently tracked in the state file. With --last, only the most
+    recent load is undone: the variables it changed get their previous
+    values back.
 
     Examples:
 
@@ -163,15 +543,23 @@ def unload_dotenv(
         unload-dotenv --verbose
 
         unload-dotenv --force
+
+        unload-dotenv --last
+
+        unload-dotenv --session build-42 --force
     """
     # Load tracking state
-    tracker = Tracker(state_file)
+    tracker = _open_tracker(state_file, session)
     loaded = tracker.load_state()
 
     if not loaded:
         click.echo("No environment variables to unload.")
         return
 
+    if last:
+        _unload_last(tracker, verbose, force)
+        return
+
     count, variables = tracker.get_status()
 
     if verbose:
@@ -196,6 +584,205 @@ def unload_dotenv(
     click.echo(f"\n[OK] Successfully unloaded {unloaded} environment variables")
 
 
+def _unload_last(tracker: 'Tracker', verbose: bool, force: bool) -> None:
+    """Undo the most recent load recorded by a tracker."""
+    if not tracker.journal:
+        click.echo("No loads to undo.")
+        return
+
+    entry = tracker.journal[-1]
+    source = entry['source'] or 'unknown source'
+    keys = sorted(entry['prior'])
+
+    if verbose:
+        click.echo(f"The last load ({source}) changed:")
+        for key in keys:
+            action = 'remove' if entry['prior'][key] is None else 'restore'
+            click.echo(f"  - {key} ({action})")
+
+    if not force:
+        if not click.confirm(f'\nUndo the last load of {len(keys)} environment variables?'):
+            click.echo("Cancelled.")
+            return
+
+    tracker.pop()
+    click.echo(f"\n[OK] Undid the last load ({source}) of {len(keys)} environment variables")
+
+
+@cli.command()
+@click.argument('file', type=Path, required=False)
+@click.option(
+    '--override/--no-override', '-o',
+    default=None,
+    help='Override existing environment variables (default: as the file was last loaded)'
+)
+@click.option(
+    '--state-file',
+    type=Path,
+    default=DEFAULT_STATE_FILE,
+    help=f'Path to state file (default: {DEFAULT_STATE_FILE})'
+)
+@click.option('--session', help=_SESSION_HELP)
+@click.option(
+    '--hook',
+    type=click.Choice(['bash', 'zsh', 'fish']),
+    help='Print only the export/unset statements for the changes, to eval'
+)
+@click.option(
+    '--verbose', '-v',
+    is_flag=True,
+    help='Show detailed output'
+)
+def reload_dotenv(
+    file: Optional[Path],
+    override: Optional[bool],
+    state_file: Path,
+    session: Optional[str],
+    hook: Optional[str],
+    verbose: bool
+):
+    """Apply only what changed in a .env file since it was loaded.
+
+    FILE is resolved again and compared with what its last load set: new
+    and changed variables are set, and variables the file no longer sets get
+    their previous values back. Nothing else is touched. The file is
+    resolved with the --override setting of its last load unless
+    --override or --no-override is given.
+
+    FILE: Path to .env file (optional). If not provided, searches for .env
+    starting from the current directory.
+
+    Examples:
+
+        reload-dotenv
+
+        reload-dotenv --no-override /path/to/.env
+
+        eval "$(reload-dotenv --hook bash)"
+    """
+    from .core import LoadDotenv, LoadDotenvError, find_dotenv_file
+    from .expansion import ExpansionError
+    from .fingerprint import file_fingerprint
+
+    tracker = _open_tracker(state_file, session)
+    tracker.load_state()
+
+    try:
+        env_file = file if file is not None else find_dotenv_file()
+        if not env_file.exists():
+            raise click.ClickException(f"File not found: {env_file}")
+        source = str(env_file.resolve())
+        if override is None:
+            override = bool(tracker.sources.get(source, {}).get('override'))
+        # Fingerprint before reading, so an edit during the reload shows as drift
+        fingerprint = file_fingerprint(env_file)
+        variables = LoadDotenv(env_file).load(
+            override=override, env=tracker.base_environment(source)
+        )
+    except OSError as e:
+        raise click.ClickException(f"Cannot read {file or '.env'}: {e.strerror}")
+    except LoadDotenvError as e:
+        raise click.ClickException(f"Error loading .env file: {e}")
+    except ExpansionError as e:
+        raise click.ClickException(f"Error expanding variables: {e}")
+
+    delta = tracker.reload(source, variables, fingerprint, override)
+
+    if hook:
+        from .hook import render_script
+        script = render_script(hook, dict(delta.updated, **delta.restored), delta.unset)
+        if script:
+            click.echo(script)
+        return
+
+    if verbose:
+        for label, keys in (('+', delta.added), ('~', delta.changed), ('-', delta.removed)):
+            for key in sorted(keys):
+                click.echo(f"  {label} {key}")
+    if delta:
+        click.echo(f"[OK] Reloaded {env_file}: {len(delta.added)} added, "
+                   f"{len(delta.changed)} changed, {len(delta.removed)} removed")
+    else:
+        click.echo(f"[INFO] {env_file} is unchanged")
+
+
+@cli.command()
+@click.option(
+    '--state-file',
+    type=Path,
+    default=DEFAULT_STATE_FILE,
+    help=f'Path to state file (default: {DEFAULT_STATE_FILE})'
+)
+@click.option('--session', help=_SESSION_HELP)
+@click.option(
+    '--env', 'check_env',
+    is_flag=True,
+    help='Also report loaded variables modified or unset in this environment'
+)
+@click.option(
+    '--quiet', '-q',
+    is_flag=True,
+    help='Print nothing; only set the exit code'
+)
+def dotenv_status(
+    state_file: Path,
+    session: Optional[str],
+    check_env: bool,
+    quiet: bool
+):
+    """Check whether loaded variables still match their .env files.
+
+    Reports source files that changed since they were loaded. With --env,
+    also reports loaded variables that were modified or unset in the
+    environment dotenv-status runs in; use it in a shell that applied the
+    variables, e.g. with eval "$(load-dotenv --hook bash)". Exits with 1 if
+    anything drifted.
+
+    Examples:
+
+        dotenv-status
+
+        dotenv-status --quiet || reload-dotenv
+
+        dotenv-status --env
+    """
+    from .status import check_status
+
+    tracker = _open_tracker(state_file, session)
+    if not tracker.load_state():
+        if not quiet:
+            click.echo("No environment variables loaded.")
+        return
+
+    report = check_status(tracker, check_env=check_env)
+    if quiet:
+        if not report.clean:
+            raise SystemExit(1)
+        return
+
+    if report.clean:
+        click.echo(f"[OK] {report.tracked} loaded variables match "
+                   f"{report.files} source file(s)")
+        return
+
+    for drift in report.changed_files:
+        if drift.missing:
+            click.echo(f"Missing: {drift.path}")
+            continue
+        click.echo(f"Changed: {drift.path}")
+        if drift.error:
+            click.echo(f"  cannot resolve: {drift.error}")
+        for label, keys in (('stale', drift.stale), ('new', drift.new),
+                            ('removed', drift.removed)):
+            if keys:
+                click.echo(f"  {label}: {', '.join(keys)}")
+    if report.modified_keys:
+        click.echo(f"Modified in the environment: {', '.join(report.modified_keys)}")
+    if report.unset_keys:
+        click.echo(f"Unset in the environment: {', '.join(report.unset_keys)}")
+    raise SystemExit(1)
+
+
 @cli.command()
 @click.argument('key_value', nargs=-1, required=False)
 @click.option(
@@ -206,7 +793,7 @@ def unload_dotenv(
 @click.option(
     '--remove', '-r',
     is_flag=True,
-    help='Remove the specified variable'
+    help='Remove the specified variables'
 )
 @click.option(
     '--operator', '-o',
@@ -248,13 +835,17 @@ def set_dotenv(
 
     This command supports multiple modes:
 
-    1. Set a variable:
+    1. Set variables:
        set-dotenv KEY VALUE        # Sets KEY=value
        set-dotenv KEY=VALUE        # Sets KEY=VALUE
        set-dotenv KEY:=VALUE       # Sets KEY:=VALUE
+       set-dotenv A=1 B=2 C=3      # Sets several at once
 
-    2. Remove a variable:
+    2. Remove variables:
        set-dotenv --remove KEY
+       set-dotenv --remove A B C
+
+    Several variables are changed with a single write of the file.
 
     3. Edit the file:
        set-dotenv --edit
@@ -272,6 +863,10 @@ def set_dotenv(
         set-dotenv --list
         set-dotenv --file /path/to/.env PORT 8080
     """
+    from .setter import (
+        SetDotenv, find_or_create_dotenv_file, SetDotenvError, SetDotenvFileNotFound
+    )
+
     try:
         # Find the .env file
         if file is None:
@@ -319,16 +914,14 @@ def set_dotenv(
         if remove:
             if not key_value:
                 raise click.ClickException("Please specify a variable name to remove")
-            if len(key_value) > 1:
-                raise click.ClickException("Only one variable can be removed at a time")
 
-            key = key_value[0]
-            removed = setter.remove_variable(key)
+            results = setter.apply([('remove', key) for key in key_value])
 
-            if removed:
-                click.echo(f"[OK] Removed variable '{key}' from {env_file}")
-            else:
-                click.echo(f"Variable '{key}' not found in {env_file}")
+            for key, removed in zip(key_value, results):
+                if removed:
+                    click.echo(f"[OK] Removed variable '{key}' from {env_file}")
+                else:
+                    click.echo(f"Variable '{key}' not found in {env_file}")
             return
 
         # Handle setting variables
@@ -337,37 +930,30 @@ def set_dotenv(
                 "Please specify a variable to set. Use --help for usage information."
             )
 
-        # Parse arguments
-        if len(key_value) == 1:
-            # Check if it contains '=' (KEY=VALUE format)
-            if '=' in key_value[0]:
-                parts = key_value[0].split('=', 1)
-                key = parts[0].strip()
-                value = parts[1].strip()
-                # Infer operator from the assignment
-                if key_value[0].startswith(key + ':='):
-                    operator = ':='
-                elif key_value[0].startswith(key + '+='):
-                    operator = '+='
-                elif key_value[0].startswith(key + '?='):
-                    operator = '?='
-            else:
-                raise click.ClickException(
-                    f"Invalid format. Use 'set-dotenv KEY VALUE' or 'set-dotenv KEY=VALUE'"
-                )
-        elif len(key_value) == 2:
-            key = key_value[0]
-            value = key_value[1]
+        # Parse arguments: KEY VALUE, or one or more KEY=VALUE
+        if len(key_value) == 2 and _parse_assignment(key_value[0]) is None:
+            assignments = [(key_value[0], operator, key_value[1])]
         else:
-            raise click.ClickException("Too many arguments")
-
-        # Set the variable
-        setter.set_variable(key, value, operator)
-
-        if verbose:
-            click.echo(f"[OK] Set {key} {operator} {value} in {env_file}")
-        else:
-            click.echo(f"[OK] Updated {key}")
+            assignments = []
+            for arg in key_value:
+                assignment = _parse_assignment(arg)
+                if assignment is None:
+                    raise click.ClickException(
+                        f"Invalid format: {arg}. Use 'set-dotenv KEY VALUE' or "
+                        f"'set-dotenv KEY=VALUE [KEY=VALUE ...]'"
+                    )
+                key, op, value = assignment
+                # A plain '=' leaves the choice to --operator
+                assignments.append((key, operator if op == '=' else op, value))
+
+        # Set the variables
+        setter.apply([('set', key, value, op) for key, op, value in assignments])
+
+        for key, op, value in assignments:
+            if verbose:
+                click.echo(f"[OK] Set {key} {op} {value} in {env_file}")
+            else:
+                click.echo(f"[OK] Updated {key}")
 
     except (SetDotenvError, SetDotenvFileNotFound) as e:
         raise click.ClickException(str(e))
@@ -375,6 +961,19 @@ def set_dotenv(
         raise click.ClickException(f"Unexpected error: {e}")
 
 
+def _parse_assignment(arg: str) -> Optional[tuple]:
+    """Split a KEY=VALUE argument (or :=, +=, ?=) into (key, operator, value).
+
+    Returns None if the argument isn't an assignment.
+    """
+    import re
+
+    match = re.match(r'^([^\s=+?:]+)\s*([+?:]?=)(.*)$', arg, re.DOTALL)
+    if match is None:
+        return None
+    return match.group(1), match.group(2), match.group(3).strip()
+
+
 if __name__ == '__main__':
     cli()
 
@@ -416,6 +1015,9 @@ def export_dotenv_cmd(
         export-dotenv --output config.json
         export-dotenv --format yaml --output config.yaml
     """
+    from .core import find_dotenv_file
+    from .extras import export_dotenv
+
     try:
         # Find the .env file
         if file is None:
@@ -434,6 +1036,121 @@ def export_dotenv_cmd(
         raise click.ClickException(f"Error exporting: {e}")
 
 
+@cli.command()
+@click.argument('file', type=Path, required=False)
+@click.option(
+    '--output', '-o',
+    type=Path,
+    help='Lockfile path (default: FILE.lock)'
+)
+@click.option(
+    '--override',
+    is_flag=True,
+    help='Lock the values load-dotenv --override would set'
+)
+@click.option(
+    '--check',
+    is_flag=True,
+    help='Only verify the lockfile; exit with an error if it is out of date'
+)
+def lock_dotenv(
+    file: Optional[Path],
+    output: Optional[Path],
+    override: bool,
+    check: bool
+):
+    """Write a lockfile with the fully resolved values of a .env file.
+
+    FILE: Path to .env file (optional, auto-discovers if not provided)
+
+    load-dotenv uses FILE.lock instead of parsing FILE as long as FILE and
+    the environment variables it depends on are unchanged.
+
+    Examples:
+
+        lock-dotenv
+
+        lock-dotenv .env.production
+
+        lock-dotenv --check
+    """
+    from .core import find_dotenv_file, LoadDotenvFileNotFound
+    from .lockfile import default_lock_path, load_locked, write_lock
+
+    try:
+        if file is None:
+            file = find_dotenv_file()
+        elif not file.exists():
+            raise click.ClickException(f"File not found: {file}")
+
+        lock_path = output or default_lock_path(file)
+        if check:
+            if load_locked(file, lock_path, override=override) is None:
+                raise click.ClickException(f"{lock_path} is out of date")
+            click.echo(f"[OK] {lock_path} is up to date")
+            return
+
+        write_lock(file, lock_path, override=override)
+        click.echo(f"[OK] Wrote {lock_path}")
+
+    except click.ClickException:
+        raise
+    except LoadDotenvFileNotFound as e:
+        raise click.ClickException(str(e))
+    except Exception as e:
+        raise click.ClickException(f"Error writing lockfile: {e}")
+
+
+@cli.command()
+@click.argument('file', type=Path, required=False)
+@click.option(
+    '--output', '-o',
+    type=Path,
+    help='Output module (default: dotenv_<name>.py next to FILE)'
+)
+@click.option(
+    '--verbose', '-v',
+    is_flag=True,
+    help='Show detailed output'
+)
+def compile_dotenv_cmd(
+    file: Optional[Path],
+    output: Optional[Path],
+    verbose: bool
+):
+    """Compile a .env file into an importable, byte-compiled Python module.
+
+    FILE: Path to .env file (optional, auto-discovers if not provided)
+
+    Load it with dotenv_tools.compiled.load_compiled(), which falls back to
+    parsing FILE if it changed after compiling.
+
+    Examples:
+
+        compile-dotenv
+
+        compile-dotenv .env.production --output app/settings_env.py
+    """
+    from .compiled import compile_dotenv
+    from .core import find_dotenv_file
+
+    try:
+        if file is None:
+            file = find_dotenv_file()
+        elif not file.exists():
+            raise click.ClickException(f"File not found: {file}")
+
+        module = compile_dotenv(file, output)
+        if verbose:
+            click.echo(f"Compiled {file} -> {module}")
+        click.echo(f"[OK] Wrote {module}")
+
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(f"Error compiling: {e}")
+
+
 @cli.command()
 @click.option(
     '--output', '-o',
@@ -476,6 +1193,8 @@ def generate_template_cmd(
         generate-template --variables APP_NAME PORT DATABASE_URL
         generate-template --no-comments --no-examples
     """
+    from .extras import generate_dotenv_template
+
     try:
         var_list = list(variables) if variables else None
         generate_dotenv_template(output, var_list, no_comments, no_examples, verbose)
@@ -528,6 +1247,8 @@ def compare_env_cmd(
         compare-env .env.staging --output diff.txt
         compare-env .env --format json --output diff.json
     """
+    from .extras import compare_dotenv_files
+
     try:
         if env and file2:
             raise click.ClickException("Cannot specify both --env and FILE2")
@@ -577,6 +1298,8 @@ def shell_completion_cmd(
         shell-completion fish --output completion.fish
         shell-completion powershell --install
     """
+    from .extras import install_shell_completion, ShellCompleter
+
     try:
         shell = shell.lower()
         if shell not in ['bash', 'zsh', 'fish', 'powershell', 'pwsh']:
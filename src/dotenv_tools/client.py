@@ -0,0 +1,271 @@
+"""Client for the dotenv-tools resolution daemon.
+
+``dotenv-tools serve`` keeps parsed .env files in memory and resolves them
+over a Unix domain socket (see daemon.py). The load-dotenv hook and exec
+modes and dotenv-run ask the daemon first and resolve in-process when it
+isn't running, so the daemon is never required.
+
+The socket path is taken from DOTENV_TOOLS_SOCKET, then
+$XDG_RUNTIME_DIR/dotenv-tools.sock, then daemon.sock in a private (0700)
+``/tmp/dotenv-tools-<uid>`` directory. Setting
+DOTENV_TOOLS_SOCKET to an empty string disables the daemon.
+
+The client only talks to a socket the current user owns, with no group or
+other permissions, in a directory nobody else can write to, and (where the
+platform reports it) served by a process of the same user. Anything else is
+treated as no daemon, since the request carries environment values and the
+response is applied to the environment.
+
+Protocol: one JSON object per line in each direction, over one connection:
+1. ``{"op": "keys", "path": ...}`` -> ``{"keys": [...]}``, the environment
+   variables the file depends on
+2. ``{"op": "resolve", "path": ..., "override": ..., "env": {...}, "keys": [...]}``
+   -> ``{"values": {...}}``, where ``env`` holds only those variables (and
+   any they reference in turn)
+
+Errors are returned as ``{"error": ..., "kind": ...}``.
+"""
+
+import json
+import os
+import re
+import socket
+import stat
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Set
+
+# Environment variable overriding the socket path (empty disables the daemon)
+SOCKET_ENV_VAR = 'DOTENV_TOOLS_SOCKET'
+
+# Seconds to wait for the daemon before resolving in-process
+DEFAULT_TIMEOUT = 1.0
+
+# Error kinds sent by the daemon
+ERROR_NOT_FOUND = 'not_found'
+ERROR_LOAD = 'load'
+
+# Names referenced inside values, as in expansion.py (not imported from
+# there, so the shell hook doesn't load the expansion engine; for the same
+# reason _needed_environment mirrors expansion.environment_closure)
+_REFERENCE = re.compile(r'\$\{\s*([a-zA-Z_][a-zA-Z0-9_]*)')
+
+
+def default_socket_path() -> Optional[str]:
+    """Get the daemon socket path.
+
+    Returns:
+        Socket path, or None if the daemon is disabled
+    """
+    path = os.environ.get(SOCKET_ENV_VAR)
+    if path is not None:
+        return path or None
+
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'dotenv-tools.sock')
+    if not hasattr(os, 'getuid'):
+        return None
+    return os.path.join('/tmp', f'dotenv-tools-{os.getuid()}', 'daemon.sock')
+
+
+def trusted_directory(directory: str) -> bool:
+    """Check that nobody but the current user can replace files in a directory.
+
+    Args:
+        directory: Directory holding the socket
+
+    Returns:
+        True if the directory is owned by the current user or root and is
+        not writable by others (unless it is sticky, like /tmp)
+    """
+    if not hasattr(os, 'getuid'):
+        return False
+    try:
+        st = os.lstat(directory)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid not in (os.getuid(), 0):
+        return False
+    return not st.st_mode & 0o022 or bool(st.st_mode & stat.S_ISVTX)
+
+
+def trusted_socket(socket_path: str) -> bool:
+    """Check that a socket belongs to the current user and only to them.
+
+    Args:
+        socket_path: Daemon socket
+
+    Returns:
+        True if the path is a socket owned by the current user, with no
+        group or other permissions, in a trusted_directory()
+    """
+    if not hasattr(os, 'getuid'):
+        return False
+    try:
+        st = os.lstat(socket_path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        return False
+    return trusted_directory(os.path.dirname(os.path.abspath(socket_path)))
+
+
+def request(
+    message: Mapping,
+    socket_path: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT
+) -> Optional[Dict]:
+    """Send one request to the daemon.
+
+    Args:
+        message: JSON-serializable request
+        socket_path: Daemon socket (default: default_socket_path())
+        timeout: Seconds to wait for the daemon
+
+    Returns:
+        The decoded response, or None if the daemon is not reachable or
+        not trusted
+    """
+    sock = _connect(socket_path, timeout)
+    if sock is None:
+        return None
+    with sock, sock.makefile('rb') as reader:
+        return _exchange(sock, reader, message)
+
+
+def _connect(socket_path: Optional[str], timeout: float) -> Optional[socket.socket]:
+    """Connect to a trusted daemon; None if there is none."""
+    if socket_path is None:
+        socket_path = default_socket_path()
+    if not socket_path or not hasattr(socket, 'AF_UNIX') or not trusted_socket(socket_path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        if hasattr(socket, 'SO_PEERCRED'):
+            creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+            _pid, uid, _gid = struct.unpack('3i', creds)
+            if uid != os.getuid():
+                sock.close()
+                return None
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _exchange(sock: socket.socket, reader, message: Mapping) -> Optional[Dict]:
+    """Send a request line and read the response line; None on failure."""
+    try:
+        sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        response = json.loads(reader.readline())
+    except (OSError, ValueError):
+        return None
+    return response if isinstance(response, dict) else None
+
+
+def _raise_error(response: Mapping) -> None:
+    """Raise the in-process exception for a daemon error response."""
+    if 'error' not in response:
+        return
+    from .core import LoadDotenvError, LoadDotenvFileNotFound
+
+    if response.get('kind') == ERROR_NOT_FOUND:
+        raise LoadDotenvFileNotFound(response['error'])
+    raise LoadDotenvError(response['error'])
+
+
+def _needed_environment(keys: Iterable[str], env: Mapping[str, str]) -> Dict[str, str]:
+    """Select the variables in keys, and those their values reference, from env."""
+    needed: Dict[str, str] = {}
+    pending: Set[str] = set(keys)
+    while pending:
+        key = pending.pop()
+        if key in needed or key not in env:
+            continue
+        needed[key] = env[key]
+        # Expansion re-expands substituted values, so follow their references
+        pending.update(_REFERENCE.findall(env[key]))
+    return needed
+
+
+def resolve(
+    env_file: Path,
+    override: bool = False,
+    env: Optional[Mapping[str, str]] = None,
+    keys: Optional[Iterable[str]] = None,
+    socket_path: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT
+) -> Optional[Dict[str, str]]:
+    """Resolve a .env file through the daemon.
+
+    Args:
+        env_file: Path to the .env file
+        override: If True, override existing environment variables
+        env: Environment used for expansion (default: os.environ)
+        keys: Only return these variables (default: all)
+        socket_path: Daemon socket (default: default_socket_path())
+        timeout: Seconds to wait for the daemon
+
+    Returns:
+        Dictionary of variables to set, or None if the daemon is not reachable
+
+    Raises:
+        LoadDotenvFileNotFound: If the .env file doesn't exist
+        LoadDotenvError: If there's an error parsing or loading
+    """
+    sock = _connect(socket_path, timeout)
+    if sock is None:
+        return None
+
+    path = os.path.abspath(env_file)
+    with sock, sock.makefile('rb') as reader:
+        response = _exchange(sock, reader, {'op': 'keys', 'path': path})
+        if response is None:
+            return None
+        _raise_error(response)
+
+        env = os.environ if env is None else env
+        response = _exchange(sock, reader, {
+            'op': 'resolve',
+            'path': path,
+            'override': override,
+            'env': _needed_environment(response.get('keys') or [], env),
+            'keys': None if keys is None else list(keys),
+        })
+    if response is None:
+        return None
+
+    _raise_error(response)
+    return response.get('values')
+
+
+def resolve_file(
+    env_file: Path,
+    override: bool = False,
+    env: Optional[Mapping[str, str]] = None
+) -> Dict[str, str]:
+    """Resolve a .env file, through the daemon if it is running.
+
+    Args:
+        env_file: Path to the .env file
+        override: If True, override existing environment variables
+        env: Environment used for expansion (default: os.environ)
+
+    Returns:
+        Dictionary of variables to set
+
+    Raises:
+        LoadDotenvFileNotFound: If the .env file doesn't exist
+        LoadDotenvError: If there's an error parsing or loading
+    """
+    values = resolve(env_file, override=override, env=env)
+    if values is not None:
+        return values
+
+    from .core import LoadDotenv
+
+    return LoadDotenv(Path(env_file)).load(override=override, env=env)
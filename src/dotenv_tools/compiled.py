@@ -0,0 +1,162 @@
+"""Compile .env files into importable Python modules.
+
+``compile-dotenv`` turns a .env file into a generated module holding its
+parsed assignments in a read-only mapping, and byte-compiles it. Loading
+then costs a ``.pyc`` import instead of reading and parsing text.
+
+The module embeds a fingerprint of its source file. load_compiled() checks
+it and transparently falls back to parsing the .env file if it changed.
+Expansion still runs at load time, because its result depends on the
+environment of the process being started.
+"""
+
+import importlib.util
+import py_compile
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .expansion import resolve_variables
+from .fingerprint import file_fingerprint, matches_fingerprint
+from .parser import parse_file_to_dict, parse_path
+
+# Bump when the layout of generated modules changes
+FORMAT_VERSION = 1
+
+
+def default_output(env_file: Path) -> Path:
+    """Get the default module path for a .env file.
+
+    ``.env`` becomes ``dotenv_env.py`` and ``.env.production`` becomes
+    ``dotenv_env_production.py``, next to the source file.
+
+    Args:
+        env_file: Path to the .env file
+
+    Returns:
+        Path of the generated module
+    """
+    name = re.sub(r'[^0-9a-zA-Z_]', '_', env_file.name.lstrip('.')) or 'env'
+    return env_file.parent / f"dotenv_{name}.py"
+
+
+def compile_dotenv(env_file: Path, output: Optional[Path] = None) -> Path:
+    """Compile a .env file into a byte-compiled Python module.
+
+    Args:
+        env_file: Path to the .env file
+        output: Path of the generated module (default: default_output())
+
+    Returns:
+        Path of the generated module
+
+    Raises:
+        OSError: If the .env file cannot be read or the module written
+        ParseError: If the .env file has invalid syntax
+    """
+    env_file = Path(env_file)
+    output = Path(output) if output is not None else default_output(env_file)
+
+    # Fingerprint first: if the file changes while we read it, the module
+    # will look stale rather than silently wrong
+    fingerprint = file_fingerprint(env_file)
+    variables = parse_file_to_dict(env_file.read_text(encoding='utf-8'))
+
+    lines = [
+        f'"""Generated by compile-dotenv from {env_file.name}. Do not edit."""',
+        '',
+        'from types import MappingProxyType',
+        '',
+        f'FORMAT_VERSION = {FORMAT_VERSION}',
+        f'SOURCE = {str(env_file.resolve())!r}',
+        f"SOURCE_SIZE = {fingerprint['size']!r}",
+        f"SOURCE_MTIME_NS = {fingerprint['mtime_ns']!r}",
+        f"SOURCE_SHA256 = {fingerprint['sha256']!r}",
+        '',
+        'VARIABLES = MappingProxyType({',
+    ]
+    for key, (op, value) in variables.items():
+        lines.append(f'    {key!r}: ({op!r}, {value!r}),')
+    lines.append('})')
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    py_compile.compile(str(output), doraise=True)
+    return output
+
+
+def read_compiled(module_path: Path, env_file: Optional[Path] = None) -> Optional[Dict[str, Tuple[str, str]]]:
+    """Read parsed variables from a compiled module if it is still valid.
+
+    Args:
+        module_path: Path of the generated module
+        env_file: Source .env file to validate against (default: the path
+            recorded in the module). If it doesn't exist, the module is
+            trusted as is.
+
+    Returns:
+        Dictionary mapping key to (operator, value), or None if the module
+        is missing, from another format version, or out of date
+    """
+    module_path = Path(module_path)
+    if not module_path.exists():
+        return None
+
+    spec = importlib.util.spec_from_file_location(
+        f"_dotenv_compiled_{abs(hash(str(module_path)))}", str(module_path)
+    )
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        return None
+
+    if getattr(module, 'FORMAT_VERSION', None) != FORMAT_VERSION:
+        return None
+
+    source = Path(env_file) if env_file is not None else Path(module.SOURCE)
+    if source.exists():
+        fingerprint = {
+            'size': module.SOURCE_SIZE,
+            'mtime_ns': module.SOURCE_MTIME_NS,
+            'sha256': module.SOURCE_SHA256,
+        }
+        if not matches_fingerprint(source, fingerprint):
+            return None
+
+    return dict(module.VARIABLES)
+
+
+def load_compiled(
+    env_file: Path,
+    module_path: Optional[Path] = None,
+    override: bool = False,
+    env: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """Resolve a .env file through its compiled module.
+
+    Falls back to parsing ``env_file`` when the module is missing or the
+    source changed since it was compiled. Either way the result is the same
+    as ``LoadDotenv(env_file).load()``.
+
+    Args:
+        env_file: Path to the .env file
+        module_path: Path of the generated module (default: default_output())
+        override: If True, override existing environment variables
+        env: Custom environment dictionary for expansion (default: os.environ)
+
+    Returns:
+        Dictionary of variables to set
+
+    Raises:
+        OSError: If neither a valid module nor the .env file can be read
+        ParseError: If the .env file has invalid syntax
+    """
+    env_file = Path(env_file)
+    if module_path is None:
+        module_path = default_output(env_file)
+
+    variables = read_compiled(module_path, env_file)
+    if variables is None:
+        variables = parse_path(env_file)
+    return resolve_variables(variables, override=override, env=env)
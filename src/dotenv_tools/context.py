@@ -0,0 +1,97 @@
+"""Temporarily apply a .env file to os.environ.
+
+``dotenv_tools.applied()`` works as a context manager and as a decorator.
+It records the previous values of only the keys it changes and restores
+exactly those on exit, so entering and leaving costs time proportional to
+the file rather than to the whole environment. Blocks nest: each level
+restores what it changed, in reverse order.
+"""
+
+import os
+from contextlib import ContextDecorator
+from typing import Dict, List, Mapping, Optional
+
+from .startup import resolve
+
+
+class applied(ContextDecorator):
+    """Apply a .env file for the duration of a block or function call.
+
+    Examples:
+
+        with applied('.env.test'):
+            run_tests()
+
+        @applied('.env.test', override=True)
+        def test_client():
+            ...
+    """
+
+    def __init__(self, path: Optional[str] = None, override: bool = False):
+        """Configure the file to apply.
+
+        The file is read on every entry, so edits between uses are picked up
+        (unchanged files come from the parser's cache).
+
+        Args:
+            path: Path to the .env file (default: the closest .env, searching
+                from the current directory upwards)
+            override: If True, override existing environment variables
+        """
+        self.path = path
+        self.override = override
+        # One entry per active use, so the same instance can be re-entered
+        self._saved: List[Dict[str, Optional[str]]] = []
+
+    def __enter__(self) -> Mapping[str, str]:
+        """Apply the file.
+
+        Returns:
+            The variables that were applied
+
+        Raises:
+            FileNotFoundError: If an explicit path doesn't exist
+            ParseError: If the file has invalid syntax
+            ExpansionError: If variable expansion fails
+        """
+        variables = resolve(self.path, override=self.override)
+        self._saved.append(apply_delta(variables))
+        return variables
+
+    def __exit__(self, *exc_info) -> None:
+        restore(self._saved.pop())
+
+
+def apply_delta(variables: Mapping[str, str]) -> Dict[str, Optional[str]]:
+    """Set variables in os.environ and record what they replaced.
+
+    Keys that already have the desired value are not touched or recorded.
+
+    Args:
+        variables: Variables to set
+
+    Returns:
+        Previous value of each changed key (None if it was unset), for restore()
+    """
+    environ = os.environ
+    saved: Dict[str, Optional[str]] = {}
+    for key, value in variables.items():
+        previous = environ.get(key)
+        if previous != value:
+            saved[key] = previous
+            environ[key] = value
+    return saved
+
+
+def restore(saved: Mapping[str, Optional[str]]) -> None:
+    """Undo apply_delta().
+
+    Args:
+        saved: The mapping returned by apply_delta()
+    """
+    environ = os.environ
+    for key, previous in saved.items():
+        if previous is None:
+            environ.pop(key, None)
+        else:
+            environ[key] = previous
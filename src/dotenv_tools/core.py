@@ -5,14 +5,23 @@ This module provides the main logic for:
 - Applying different assignment operators
 - Expanding variables
 - Loading variables into the environment
+
+LoadDotenv is safe to share between threads. Loads are serialized per
+loader, and each load publishes its result as an immutable ``snapshot``
+that other threads can read without copying or locking; a reload swaps in
+a new snapshot instead of modifying the old one.
 """
 
 import os
+import threading
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Tuple
 
-from .parser import parse_file_to_dict, ParseError
-from .expansion import expand_variables, expand_immediate, ExpansionError
+from .parser import parse_file_to_dict, parse_path, ParseError
+from .expansion import resolve_variables, ExpansionError
+from .delta import EnvDelta, compute_delta
 
 
 class LoadDotenvError(Exception):
@@ -36,6 +45,26 @@ class LoadDotenv:
         """
         self.env_file = env_file
         self.variables: Dict[str, Tuple[str, str]] = {}
+        self._snapshot: Mapping[str, str] = MappingProxyType({})
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> Mapping[str, str]:
+        """Read-only view of the variables resolved by the latest load.
+
+        The view never changes; every load replaces it with a new one, so
+        it can be read from any thread without locking.
+        """
+        return self._snapshot
+
+    def _publish(
+        self,
+        variables: Dict[str, Tuple[str, str]],
+        values: Dict[str, str]
+    ) -> None:
+        """Store the parsed variables and swap in a new snapshot."""
+        self.variables = variables
+        self._snapshot = MappingProxyType(dict(values))
 
     def load(self, override: bool = False, env: Dict[str, str] = None) -> Dict[str, str]:
         """Load variables from the .env file.
@@ -44,6 +73,38 @@ class LoadDotenv:
             override: If True, override existing environment variables
             env: Custom environment dictionary for expansion (default: os.environ)
 
+        Returns:
+            Dictionary of loaded variables, owned by the caller (the same
+            values are published read-only as ``snapshot``)
+
+        Raises:
+            LoadDotenvFileNotFound: If the .env file doesn't exist
+            LoadDotenvError: If there's an error parsing or loading
+        """
+        with self._lock:
+            variables = self._read_variables()
+            values = resolve_variables(variables, override=override, env=env)
+            self._publish(variables, values)
+
+        # Return the variables that should be set
+        return values
+
+    async def aload(
+        self,
+        override: bool = False,
+        env: Dict[str, str] = None,
+        executor: Optional[Executor] = None,
+    ) -> Dict[str, str]:
+        """Load variables from the .env file without blocking the event loop.
+
+        Reading and parsing run in a worker thread; the result is identical
+        to :meth:`load`.
+
+        Args:
+            override: If True, override existing environment variables
+            env: Custom environment dictionary for expansion (default: os.environ)
+            executor: Executor for file I/O (default: the shared bounded pool)
+
         Returns:
             Dictionary of loaded variables
 
@@ -51,74 +112,69 @@ class LoadDotenv:
             LoadDotenvFileNotFound: If the .env file doesn't exist
             LoadDotenvError: If there's an error parsing or loading
         """
+        from .aio import run_blocking
+
+        variables = await run_blocking(self._read_variables, executor=executor)
+        values = resolve_variables(variables, override=override, env=env)
+        with self._lock:
+            self._publish(variables, values)
+        return values
+
+    def _read_variables(self) -> Dict[str, Tuple[str, str]]:
+        """Read and parse the .env file.
+
+        Returns:
+            Dictionary of (operator, value) for each key
+
+        Raises:
+            LoadDotenvFileNotFound: If the .env file doesn't exist
+            LoadDotenvError: If there's an error parsing or reading
+        """
         if not self.env_file.exists():
             raise LoadDotenvFileNotFound(f"File not found: {self.env_file}")
 
         try:
-            # Read and parse the file
-            content = self.env_file.read_text(encoding='utf-8')
-            self.variables = parse_file_to_dict(content)
+            # Read and parse the file (unchanged files come from the cache)
+            return parse_path(self.env_file)
         except ParseError as e:
             raise LoadDotenvError(f"Parse error: {e}")
         except Exception as e:
             raise LoadDotenvError(f"Error reading file: {e}")
 
-        # Environment to use for expansion
-        env_dict = dict(env) if env is not None else dict(os.environ)
-
-        # First pass: handle := (immediate expansion) and ?= (conditional)
-        to_set: Dict[str, str] = {}
-        to_append: Dict[str, List[str]] = {}
-        deferred: Dict[str, Tuple[str, str]] = {}  # For :+= and other deferred
-
-        for key, (op, value) in self.variables.items():
-            # Skip export prefix in key
-            actual_key = key[7:] if key.startswith('export ') else key
-
-            # Get current value if exists
-            current_value = env_dict.get(actual_key)
-
-            if op == ':=':
-                # Immediate expansion - expand at assignment time
-                expanded = expand_immediate(value, env_dict)
-                to_set[actual_key] = expanded
-                env_dict[actual_key] = expanded
-
-            elif op == '?=':
-                # Conditional assignment - only if not set
-                if actual_key not in env_dict or env_dict[actual_key] is None:
-                    expanded = expand_variables(value, env_dict)
-                    to_set[actual_key] = expanded
-                    env_dict[actual_key] = expanded
-
-            elif op == '+=':
-                # Append - will handle in second pass
-                to_append[actual_key] = [value]
-
-            elif op == '=':
-                # Standard assignment - deferred
-                deferred[actual_key] = (op, value)
-
-        # Second pass: handle standard = assignments with expansion
-        for key, (op, value) in deferred.items():
-            # Don't override unless override is True
-            if not override and key in env_dict:
-                continue
-
-            expanded = expand_variables(value, env_dict)
-            to_set[key] = expanded
-            env_dict[key] = expanded
-
-        # Third pass: handle += (append)
-        for key, values in to_append.items():
-            current = env_dict.get(key, '')
-            for value in values:
-                expanded = expand_immediate(value, env_dict)
-                to_set[key] = current + expanded
-                env_dict[key] = to_set[key]
+    def watch(
+        self,
+        callback: Callable[[EnvDelta], None],
+        override: bool = False,
+        env: Dict[str, str] = None,
+        watcher=None,
+    ) -> 'DotenvWatch':
+        """Watch the .env file and report changes as per-key deltas.
 
-        # Return the variables that should be set
-        return to_set
+        The file is loaded once immediately. Every later change is resolved
+        against the same base environment and ``callback`` receives only the
+        keys that were added, changed, or removed. Edits that leave the file
+        unparsable are ignored until the file is valid again.
+
+        Args:
+            callback: Called from the watcher thread with an EnvDelta
+            override: If True, override existing environment variables
+            env: Base environment for expansion (default: a copy of os.environ
+                taken now)
+            watcher: Watcher to use (default: the shared process-wide watcher)
+
+        Returns:
+            DotenvWatch handle; call stop() to unsubscribe
+
+        Raises:
+            LoadDotenvFileNotFound: If the .env file doesn't exist
+            LoadDotenvError: If there's an error parsing or loading
+        """
+        if watcher is None:
+            from .watcher import get_default_watcher
+            watcher = get_default_watcher()
+
+        base_env = dict(env) if env is not None else dict(os.environ)
+        return DotenvWatch(self, callback, watcher, override, base_env)
 
     def get_variables(self) -> Dict[str, Tuple[str, str]]:
         """Get parsed variables without loading them.
@@ -126,16 +182,60 @@ class LoadDotenv:
         Returns:
             Dictionary of (operator, value) for each key
         """
-        # Parse the file if not already parsed
-        if not self.variables and self.env_file.exists():
-            try:
-                content = self.env_file.read_text(encoding='utf-8')
-                self.variables = parse_file_to_dict(content)
-            except Exception:
-                # If parsing fails, return empty dict
-                pass
+        with self._lock:
+            # Parse the file if not already parsed
+            if not self.variables and self.env_file.exists():
+                try:
+                    content = self.env_file.read_text(encoding='utf-8')
+                    self.variables = parse_file_to_dict(content)
+                except Exception:
+                    # If parsing fails, return empty dict
+                    pass
+
+            return self.variables
+
+
+class DotenvWatch:
+    """An active LoadDotenv.watch() subscription."""
+
+    def __init__(self, loader: LoadDotenv, callback, watcher, override: bool,
+                 env: Dict[str, str]):
+        """Load the file and start watching it.
+
+        Args:
+            loader: Loader for the watched file
+            callback: Called with an EnvDelta when the file changes
+            watcher: Watcher delivering change notifications
+            override: If True, override existing environment variables
+            env: Base environment for expansion
+        """
+        self.loader = loader
+        self.callback = callback
+        self.watcher = watcher
+        self.override = override
+        self.env = env
+        self.values: Mapping[str, str] = MappingProxyType(
+            loader.load(override=override, env=env)
+        )
+        watcher.add(loader.env_file, self._on_change)
+
+    def _on_change(self, path: Path) -> None:
+        try:
+            values = self.loader.load(override=self.override, env=self.env)
+        except LoadDotenvFileNotFound:
+            values = {}
+        except (LoadDotenvError, ExpansionError):
+            # Likely a half-written file; wait for the next change
+            return
+
+        delta = compute_delta(self.values, values)
+        self.values = MappingProxyType(values)
+        if delta:
+            self.callback(delta)
 
-        return self.variables
+    def stop(self) -> None:
+        """Stop receiving change notifications."""
+        self.watcher.remove(self.loader.env_file, self._on_change)
 
 
 def find_dotenv_file(start_path: Path = None) -> Path:
@@ -170,3 +270,26 @@ def find_dotenv_file(start_path: Path = None) -> Path:
     raise LoadDotenvFileNotFound(
         f"No .env file found starting from {start_path}"
     )
+
+
+async def afind_dotenv_file(
+    start_path: Path = None, executor: Optional[Executor] = None
+) -> Path:
+    """Find a .env file without blocking the event loop.
+
+    Same search order as :func:`find_dotenv_file`; the ``stat`` calls run in
+    a worker thread.
+
+    Args:
+        start_path: Starting path for search (default: current directory)
+        executor: Executor for file I/O (default: the shared bounded pool)
+
+    Returns:
+        Path to the .env file
+
+    Raises:
+        LoadDotenvFileNotFound: If no .env file is found
+    """
+    from .aio import run_blocking
+
+    return await run_blocking(find_dotenv_file, start_path, executor=executor)
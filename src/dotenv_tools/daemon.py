@@ -0,0 +1,304 @@
+"""Resolution daemon for ``dotenv-tools serve``.
+
+The daemon keeps parsed .env files and their resolved results in memory
+and answers resolve requests from client.py over a Unix domain socket.
+Watched files are re-parsed as soon as they change, so clients on busy
+build hosts never pay for parsing.
+
+Results are cached per file, override mode, and the values of the
+environment variables the file actually depends on, so two clients with
+different unrelated variables share one cache entry. Every request still
+checks the file's stat signature, so a change the watcher hasn't reported
+yet is never served stale.
+
+The socket is created with mode 0600, in a directory only the daemon's user
+can write to: it serves only that user, and clients check both before they
+connect (see client.py).
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .client import (
+    ERROR_LOAD, ERROR_NOT_FOUND, default_socket_path, trusted_directory
+)
+from .core import LoadDotenv, LoadDotenvError, LoadDotenvFileNotFound
+from .expansion import dependent_keys, environment_closure, resolve_variables
+from .parser import RACY_WINDOW_NS
+from .watcher import Watcher, stat_signature
+
+# Resolved results kept per file before the oldest are dropped
+MAX_RESULTS_PER_FILE = 64
+
+
+class DaemonError(Exception):
+    """Raised when the daemon can't start."""
+
+
+class _FileEntry:
+    """Parsed state of one .env file."""
+
+    def __init__(self, signature, variables):
+        self.signature = signature
+        self.variables = variables
+        self.keys = sorted(dependent_keys(variables))
+        # (override, values of dependent keys and the variables they
+        # reference) -> resolved variables
+        self.results: Dict[Tuple, Dict[str, str]] = {}
+
+
+class Resolver:
+    """Parse-and-resolve cache shared by all daemon connections."""
+
+    def __init__(self, watcher: Optional[Watcher] = None):
+        """Initialize the cache.
+
+        Args:
+            watcher: Watcher used to re-parse files on change (default: a new one)
+        """
+        self.watcher = watcher if watcher is not None else Watcher()
+        self._entries: Dict[str, _FileEntry] = {}
+        self._lock = threading.Lock()
+
+    def resolve(
+        self,
+        path: str,
+        override: bool = False,
+        env: Optional[Mapping[str, str]] = None,
+        keys: Optional[Iterable[str]] = None
+    ) -> Dict[str, str]:
+        """Resolve a .env file against a client's environment.
+
+        Args:
+            path: Absolute path to the .env file
+            override: If True, override existing environment variables
+            env: The client's environment
+            keys: Only return these variables (default: all)
+
+        Returns:
+            Dictionary of variables to set
+
+        Raises:
+            LoadDotenvFileNotFound: If the .env file doesn't exist
+            LoadDotenvError: If there's an error parsing or loading
+        """
+        env = {} if env is None else env
+        entry = self._entry(path)
+
+        closure = sorted(environment_closure(entry.keys, env))
+        cache_key = (override, tuple((key, env.get(key)) for key in closure))
+        values = entry.results.get(cache_key)
+        if values is None:
+            try:
+                values = resolve_variables(entry.variables, override=override, env=env)
+            except Exception as e:
+                raise LoadDotenvError(f"Error expanding variables: {e}")
+            if entry.signature is not None:
+                with self._lock:
+                    if len(entry.results) >= MAX_RESULTS_PER_FILE:
+                        entry.results.pop(next(iter(entry.results)))
+                    entry.results[cache_key] = values
+
+        if keys is not None:
+            return {key: values[key] for key in keys if key in values}
+        return dict(values)
+
+    def keys(self, path: str) -> List[str]:
+        """Get the environment variables resolving a .env file depends on.
+
+        Args:
+            path: Absolute path to the .env file
+
+        Returns:
+            Sorted variable names
+
+        Raises:
+            LoadDotenvFileNotFound: If the .env file doesn't exist
+            LoadDotenvError: If there's an error parsing
+        """
+        return list(self._entry(path).keys)
+
+    def _entry(self, path: str) -> _FileEntry:
+        signature = stat_signature(Path(path))
+        if signature is None:
+            raise LoadDotenvFileNotFound(f"File not found: {path}")
+
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry.signature == signature:
+            return entry
+
+        return self._load(path, signature)
+
+    def _load(self, path: str, signature) -> _FileEntry:
+        variables = LoadDotenv(Path(path))._read_variables()
+
+        # Recently modified files may change again without a new signature
+        if time.time_ns() - signature[2] <= RACY_WINDOW_NS:
+            return _FileEntry(None, variables)
+
+        entry = _FileEntry(signature, variables)
+        with self._lock:
+            is_new = path not in self._entries
+            self._entries[path] = entry
+        if is_new:
+            self.watcher.add(Path(path), self._on_change)
+        return entry
+
+    def _on_change(self, path: Path) -> None:
+        """Drop a changed file and parse it again before the next request."""
+        key = str(path)
+        with self._lock:
+            self._entries.pop(key, None)
+        signature = stat_signature(path)
+        if signature is None:
+            return
+        try:
+            self._load(key, signature)
+        except LoadDotenvError:
+            pass
+
+    def close(self) -> None:
+        """Stop watching files."""
+        self.watcher.stop()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer JSON-line requests until the client disconnects."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = self.server.dispatch(json.loads(line))
+            except ValueError:
+                response = {'error': 'Invalid request', 'kind': ERROR_LOAD}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server answering resolve requests."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Optional[str] = None, resolver: Optional[Resolver] = None):
+        """Bind the socket.
+
+        Args:
+            socket_path: Socket path (default: default_socket_path())
+            resolver: Cache to serve from (default: a new Resolver)
+
+        Raises:
+            DaemonError: If the daemon is disabled or already running, or the
+                socket's directory or an existing socket isn't private
+        """
+        if socket_path is None:
+            socket_path = default_socket_path()
+        if not socket_path:
+            raise DaemonError("The daemon is disabled (DOTENV_TOOLS_SOCKET is empty)")
+        _prepare_socket_dir(socket_path)
+        _remove_stale_socket(socket_path)
+
+        self.resolver = resolver if resolver is not None else Resolver()
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def dispatch(self, message: Mapping) -> Dict:
+        """Handle one decoded request.
+
+        Args:
+            message: The request
+
+        Returns:
+            The response
+        """
+        op = message.get('op')
+        if op == 'ping':
+            return {'pid': os.getpid()}
+        if op not in ('keys', 'resolve'):
+            return {'error': f"Unknown operation: {op}", 'kind': ERROR_LOAD}
+
+        try:
+            if op == 'keys':
+                return {'keys': self.resolver.keys(message['path'])}
+            values = self.resolver.resolve(
+                message['path'],
+                override=bool(message.get('override')),
+                env=message.get('env') or {},
+                keys=message.get('keys'),
+            )
+        except LoadDotenvFileNotFound as e:
+            return {'error': str(e), 'kind': ERROR_NOT_FOUND}
+        except (LoadDotenvError, KeyError, TypeError) as e:
+            return {'error': str(e), 'kind': ERROR_LOAD}
+        return {'values': values}
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.resolver.close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def _prepare_socket_dir(socket_path: str) -> None:
+    """Create the socket's directory owner-only, or check an existing one."""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    except OSError as e:
+        raise DaemonError(f"Can't create socket directory {directory}: {e}")
+    if not trusted_directory(directory):
+        raise DaemonError(f"Socket directory {directory} is writable by other users")
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Remove a socket left behind by a daemon that is no longer running."""
+    try:
+        st = os.lstat(socket_path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        raise DaemonError(f"{socket_path} exists and is not a socket of this user")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+    raise DaemonError(f"A daemon is already listening on {socket_path}")
+
+
+def serve(socket_path: Optional[str] = None) -> None:
+    """Run the daemon until interrupted.
+
+    Args:
+        socket_path: Socket path (default: default_socket_path())
+
+    Raises:
+        DaemonError: If the daemon is disabled or already running
+    """
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, stop)
+
+    with DaemonServer(socket_path) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,110 @@
+"""Per-key differences between two sets of environment variables.
+
+This module provides:
+- EnvDelta, the added/changed/removed keys between two variable sets
+- compute_delta() to build an EnvDelta from old and new values
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional
+
+
+class EnvDelta:
+    """Keys added, changed, or removed between two variable sets."""
+
+    def __init__(
+        self,
+        added: Optional[Dict[str, str]] = None,
+        changed: Optional[Dict[str, str]] = None,
+        removed: Optional[Iterable[str]] = None,
+        restored: Optional[Dict[str, str]] = None,
+    ):
+        """Initialize the delta.
+
+        Args:
+            added: New keys and their values
+            changed: Existing keys and their new values
+            removed: Keys that no longer exist
+            restored: Removed keys that get back the value they had before
+                they were set, rather than being unset
+        """
+        self.added: Dict[str, str] = dict(added or {})
+        self.changed: Dict[str, str] = dict(changed or {})
+        self.removed: List[str] = sorted(removed or [])
+        self.restored: Dict[str, str] = dict(restored or {})
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EnvDelta):
+            return NotImplemented
+        return (
+            self.added == other.added
+            and self.changed == other.changed
+            and self.removed == other.removed
+            and self.restored == other.restored
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"EnvDelta(added={sorted(self.added)}, "
+            f"changed={sorted(self.changed)}, removed={self.removed})"
+        )
+
+    @property
+    def updated(self) -> Dict[str, str]:
+        """Get all keys that need to be set (added and changed).
+
+        Returns:
+            Dictionary of keys and their new values
+        """
+        result = dict(self.added)
+        result.update(self.changed)
+        return result
+
+    @property
+    def unset(self) -> List[str]:
+        """Get the removed keys that must be unset (not restored).
+
+        Returns:
+            Sorted list of keys
+        """
+        return [key for key in self.removed if key not in self.restored]
+
+    def to_dict(self) -> Dict[str, object]:
+        """Convert the delta to a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with 'added', 'changed' and 'removed' entries
+        """
+        return {
+            'added': dict(self.added),
+            'changed': dict(self.changed),
+            'removed': list(self.removed),
+        }
+
+
+def compute_delta(old: Mapping[str, str], new: Mapping[str, str]) -> EnvDelta:
+    """Compute the per-key difference between two variable sets.
+
+    Args:
+        old: Previous variables
+        new: Current variables
+
+    Returns:
+        EnvDelta describing how to get from ``old`` to ``new``
+    """
+    added = {}
+    changed = {}
+
+    for key, value in new.items():
+        if key not in old:
+            added[key] = value
+        elif old[key] != value:
+            changed[key] = value
+
+    removed = [key for key in old if key not in new]
+    return EnvDelta(added, changed, removed)
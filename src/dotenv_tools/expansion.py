@@ -9,7 +9,10 @@ Supports:
 
 import os
 import re
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# Names referenced inside values: ${NAME}, ${NAME:-...}, ...
+_REFERENCE = re.compile(r'\$\{\s*([a-zA-Z_][a-zA-Z0-9_]*)')
 
 
 class ExpansionError(Exception):
@@ -135,3 +138,137 @@ def expand_immediate(value: str, env: Dict[str, str]) -> str:
         Expanded value
     """
     return expand_variables(value, env)
+
+
+def copy_environ() -> Dict[str, str]:
+    """Copy os.environ, tolerating concurrent changes from other threads.
+
+    ``dict(os.environ)`` lists the keys first and then reads each value, so
+    a key removed by another thread in between raises KeyError.
+
+    Returns:
+        Copy of the process environment
+    """
+    while True:
+        try:
+            return dict(os.environ)
+        except (KeyError, RuntimeError):
+            continue
+
+
+def dependent_keys(variables: Dict[str, Tuple[str, str]]) -> Set[str]:
+    """Get the environment variables a resolution of ``variables`` reads.
+
+    These are all referenced variables plus all assigned keys, since
+    whether a key is already set decides the outcome of =, ?= and +=.
+
+    Args:
+        variables: Parsed variables mapping key to (operator, value)
+
+    Returns:
+        Set of variable names
+    """
+    keys = set()
+    for key, (_op, value) in variables.items():
+        keys.add(key[7:] if key.startswith('export ') else key)
+        keys.update(_REFERENCE.findall(value))
+    return keys
+
+
+def environment_closure(keys: Iterable[str], env: Mapping[str, str]) -> Set[str]:
+    """Get keys plus every variable their values in env reference, transitively.
+
+    Expansion re-expands substituted values, so with ``X=${A}`` and
+    ``A=${B}`` in the environment, the value of X depends on B as well.
+    Keys missing from env are included but not followed.
+
+    Args:
+        keys: Variable names, e.g. from dependent_keys()
+        env: Environment the values are taken from
+
+    Returns:
+        Set of variable names
+    """
+    closure: Set[str] = set()
+    pending = set(keys)
+    while pending:
+        key = pending.pop()
+        if key in closure:
+            continue
+        closure.add(key)
+        if key in env:
+            pending.update(_REFERENCE.findall(env[key]))
+    return closure
+
+
+def resolve_variables(
+    variables: Dict[str, Tuple[str, str]],
+    override: bool = False,
+    env: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """Resolve parsed assignments into the variables that should be set.
+
+    This applies the assignment operators in the same order load-dotenv
+    always has: ``:=`` and ``?=`` first, then ``=``, then ``+=``. The
+    ``env`` mapping is copied, so it is never modified.
+
+    Args:
+        variables: Parsed variables mapping key to (operator, value)
+        override: If True, ``=`` assignments override existing variables
+        env: Environment used for expansion (default: os.environ)
+
+    Returns:
+        Dictionary of variables to set
+    """
+    # Environment to use for expansion
+    env_dict = dict(env) if env is not None else copy_environ()
+
+    # First pass: handle := (immediate expansion) and ?= (conditional)
+    to_set: Dict[str, str] = {}
+    to_append: Dict[str, List[str]] = {}
+    deferred: Dict[str, Tuple[str, str]] = {}  # For :+= and other deferred
+
+    for key, (op, value) in variables.items():
+        # Skip export prefix in key
+        actual_key = key[7:] if key.startswith('export ') else key
+
+        if op == ':=':
+            # Immediate expansion - expand at assignment time
+            expanded = expand_immediate(value, env_dict)
+            to_set[actual_key] = expanded
+            env_dict[actual_key] = expanded
+
+        elif op == '?=':
+            # Conditional assignment - only if not set
+            if actual_key not in env_dict or env_dict[actual_key] is None:
+                expanded = expand_variables(value, env_dict)
+                to_set[actual_key] = expanded
+                env_dict[actual_key] = expanded
+
+        elif op == '+=':
+            # Append - will handle in second pass
+            to_append[actual_key] = [value]
+
+        elif op == '=':
+            # Standard assignment - deferred
+            deferred[actual_key] = (op, value)
+
+    # Second pass: handle standard = assignments with expansion
+    for key, (op, value) in deferred.items():
+        # Don't override unless override is True
+        if not override and key in env_dict:
+            continue
+
+        expanded = expand_variables(value, env_dict)
+        to_set[key] = expanded
+        env_dict[key] = expanded
+
+    # Third pass: handle += (append)
+    for key, values in to_append.items():
+        current = env_dict.get(key, '')
+        for value in values:
+            expanded = expand_immediate(value, env_dict)
+            to_set[key] = current + expanded
+            env_dict[key] = to_set[key]
+
+    return to_set
@@ -14,9 +14,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
 import click
-import yaml
 
-from .core import LoadDotenv, find_dotenv_file
 from .parser import parse_file_to_dict
 
 
@@ -40,6 +38,9 @@ class DotenvExporter:
 
     def export_to_yaml(self) -> str:
         """Export .env file to YAML format."""
+        # PyYAML is slow to import and only needed here
+        import yaml
+
         content = self.env_file.read_text(encoding='utf-8')
         variables = parse_file_to_dict(content)
 
@@ -0,0 +1,86 @@
+"""Content fingerprints for .env files.
+
+A fingerprint records a file's size, modification time and SHA-256 hash.
+Checking a file against its fingerprint costs one ``stat`` call when size
+and mtime are unchanged; the file is only hashed when the mtime differs
+(for example after a copy that didn't preserve it).
+"""
+
+import hashlib
+import os
+from typing import Dict, Optional, Union
+
+
+def sha256_file(path) -> str:
+    """Hash a file's contents.
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_text(value: str) -> str:
+    """Hash a string.
+
+    Args:
+        value: Text to hash
+
+    Returns:
+        Hex-encoded SHA-256 digest of the UTF-8 encoded text
+    """
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(path) -> Dict[str, Union[int, str]]:
+    """Fingerprint a file.
+
+    Args:
+        path: File path
+
+    Returns:
+        Dictionary with 'size', 'mtime_ns' and 'sha256'
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    st = os.stat(path)
+    return {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha256': sha256_file(path),
+    }
+
+
+def matches_fingerprint(path, fingerprint: Optional[Dict[str, Union[int, str]]]) -> bool:
+    """Check whether a file still matches a fingerprint.
+
+    Args:
+        path: File path
+        fingerprint: Fingerprint from file_fingerprint()
+
+    Returns:
+        True if the file's contents are unchanged
+    """
+    if not fingerprint:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+
+    if st.st_size != fingerprint.get('size'):
+        return False
+    if st.st_mtime_ns == fingerprint.get('mtime_ns'):
+        return True
+    try:
+        return sha256_file(path) == fingerprint.get('sha256')
+    except OSError:
+        return False
@@ -0,0 +1,259 @@
+"""Shell hook support for load-dotenv.
+
+``load-dotenv --hook bash|zsh|fish`` prints export/unset statements for the
+calling shell to ``eval``, typically from PROMPT_COMMAND or chpwd. It runs
+on every prompt, so this module is the ``load-dotenv`` entry point and
+answers the common "nothing changed" case with a few ``stat`` calls, before
+click, the parser, or the expansion engine are imported.
+
+The shell keeps the hook state in two variables:
+- __DOTENV_TOOLS_HOOK: fingerprint of the .env file applied last
+- __DOTENV_TOOLS_HOOK_STATE: keys applied last and the values they replaced
+
+This module must only import ``os`` and ``sys`` at module level; even
+``typing`` costs more than the whole fast path, so annotations are
+postponed and typing is imported for type checkers only.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Optional
+
+# Shell variable holding the fingerprint of the last applied .env file
+HOOK_FINGERPRINT_VAR = '__DOTENV_TOOLS_HOOK'
+
+# Shell variable holding the keys applied last and the values they replaced
+HOOK_STATE_VAR = '__DOTENV_TOOLS_HOOK_STATE'
+
+SUPPORTED_SHELLS = ('bash', 'zsh', 'fish')
+
+
+def find_env_file(start: Optional[str] = None, name: str = '.env') -> Optional[str]:
+    """Find the closest .env file using only stat calls.
+
+    Args:
+        start: Starting directory (default: current directory)
+        name: File name to look for
+
+    Returns:
+        Path to the file, or None if there is none
+    """
+    current = os.path.abspath(start or os.getcwd())
+    while True:
+        candidate = os.path.join(current, name)
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def file_fingerprint(path: Optional[str]) -> str:
+    """Fingerprint a file by path, inode, size and mtime.
+
+    Args:
+        path: File path, or None for "no file"
+
+    Returns:
+        Fingerprint string ('' when there is no file)
+    """
+    if path is None:
+        return ''
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ''
+    return f"{path}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def is_fresh(env_file: Optional[str] = None, environ: Optional[Dict[str, str]] = None) -> bool:
+    """Check whether the shell already has the current .env file applied.
+
+    Args:
+        env_file: Explicit .env file (default: search from the current directory)
+        environ: Environment holding the hook variables (default: os.environ)
+
+    Returns:
+        True if nothing needs to be emitted
+    """
+    if environ is None:
+        environ = os.environ
+    path = os.path.abspath(env_file) if env_file else find_env_file()
+    return file_fingerprint(path) == environ.get(HOOK_FINGERPRINT_VAR, '')
+
+
+def quote(shell: str, value: str) -> str:
+    """Quote a value for the given shell.
+
+    Args:
+        shell: Shell name (bash, zsh, or fish)
+        value: Value to quote
+
+    Returns:
+        Single-quoted value safe to eval
+    """
+    if shell == 'fish':
+        return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+    return "'" + value.replace("'", "'\\''") + "'"
+
+
+def render_script(shell: str, exports: Dict[str, str], unsets: Iterable[str]) -> str:
+    """Render export/unset statements for a shell.
+
+    Args:
+        shell: Shell name (bash, zsh, or fish)
+        exports: Variables to export
+        unsets: Variables to unset
+
+    Returns:
+        Script for the shell to eval
+    """
+    lines: List[str] = []
+    for key in sorted(unsets):
+        lines.append(f"set -e {key};" if shell == 'fish' else f"unset {key};")
+    for key in sorted(exports):
+        value = quote(shell, exports[key])
+        lines.append(f"set -gx {key} {value};" if shell == 'fish' else f"export {key}={value};")
+    return '\n'.join(lines)
+
+
+def build_script(
+    shell: str,
+    env_file: Optional[str] = None,
+    override: bool = False,
+    environ: Optional[Dict[str, str]] = None,
+) -> str:
+    """Build the script that brings a shell up to date with its .env file.
+
+    Values applied by the previous hook run are rolled back in memory first,
+    so the file is resolved against the shell's own environment. Only keys
+    whose value differs from the shell's current value are emitted. The
+    file is resolved by the dotenv-tools daemon when it is running.
+
+    Args:
+        shell: Shell name (bash, zsh, or fish)
+        env_file: Explicit .env file (default: search from the current directory)
+        override: If True, override existing environment variables
+        environ: The shell's environment (default: os.environ)
+
+    Returns:
+        Script for the shell to eval
+
+    Raises:
+        LoadDotenvError: If there's an error parsing or loading
+    """
+    import json
+    from pathlib import Path
+
+    from .client import resolve_file
+
+    if environ is None:
+        environ = os.environ
+
+    try:
+        state = json.loads(environ.get(HOOK_STATE_VAR) or '{}')
+    except ValueError:
+        state = {}
+    previous_keys = state.get('keys', [])
+    restore = state.get('restore', {})
+
+    # Environment as it was before the hook applied anything
+    base_env = dict(environ)
+    base_env.pop(HOOK_FINGERPRINT_VAR, None)
+    base_env.pop(HOOK_STATE_VAR, None)
+    for key in previous_keys:
+        if key in restore:
+            base_env[key] = restore[key]
+        else:
+            base_env.pop(key, None)
+
+    path = os.path.abspath(env_file) if env_file else find_env_file()
+    values = {}
+    if path is not None:
+        values = resolve_file(Path(path), override=override, env=base_env)
+
+    exports = {}
+    unsets = []
+    for key in set(previous_keys) | set(values):
+        desired = values[key] if key in values else base_env.get(key)
+        current = environ.get(key)
+        if desired is None:
+            if current is not None:
+                unsets.append(key)
+        elif desired != current:
+            exports[key] = desired
+
+    fingerprint = file_fingerprint(path)
+    if values or fingerprint:
+        hook_vars = {
+            HOOK_FINGERPRINT_VAR: fingerprint,
+            HOOK_STATE_VAR: json.dumps({
+                'keys': sorted(values),
+                'restore': {key: base_env[key] for key in values if key in base_env},
+            }, separators=(',', ':'), sort_keys=True),
+        }
+        for key, value in hook_vars.items():
+            if environ.get(key) != value:
+                exports[key] = value
+    else:
+        unsets.extend(k for k in (HOOK_FINGERPRINT_VAR, HOOK_STATE_VAR) if k in environ)
+
+    return render_script(shell, exports, unsets)
+
+
+def _parse_hook_args(argv: List[str]) -> Optional[Dict[str, Optional[str]]]:
+    """Parse a ``load-dotenv --hook`` command line for the fast path.
+
+    Only the options the fast path understands are accepted; anything else
+    returns None so click handles it.
+
+    Args:
+        argv: Command-line arguments without the program name
+
+    Returns:
+        Dictionary with 'shell' and 'file', or None
+    """
+    shell = None
+    env_file = None
+    args = iter(argv)
+    for arg in args:
+        if arg == '--hook':
+            shell = next(args, None)
+        elif arg.startswith('--hook='):
+            shell = arg.split('=', 1)[1]
+        elif arg in ('--override', '-o'):
+            continue
+        elif arg.startswith('-') or env_file is not None:
+            return None
+        else:
+            env_file = arg
+
+    if shell not in SUPPORTED_SHELLS:
+        return None
+    return {'shell': shell, 'file': env_file}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for the load-dotenv command.
+
+    Exits immediately when running as a hook and nothing changed;
+    otherwise hands over to the full click command.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    hook_args = _parse_hook_args(argv)
+    if hook_args is not None and is_fresh(hook_args['file']):
+        return
+
+    from .cli import load_dotenv
+    load_dotenv.main(args=argv, prog_name='load-dotenv')
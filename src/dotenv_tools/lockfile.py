@@ -0,0 +1,222 @@
+"""Resolved lockfiles for .env files.
+
+A lockfile (``.env.lock`` next to ``.env``) records:
+- the fully resolved values
+- the size and SHA-256 hash of every contributing source file
+- a hash of every outer environment variable the resolution depended on,
+  including variables only referenced from the values of other variables
+
+If all of these still match, load-dotenv uses the locked values directly
+and skips parsing and expansion. Lockfiles are sorted, indented JSON
+without timestamps, so they produce reviewable diffs of the effective
+configuration.
+
+Verifying a source needs only a ``stat`` call when it is older than the
+lockfile and its size is unchanged; otherwise the file is hashed.
+
+The values are stored in plain text, including any expanded from the outer
+environment (e.g. ``${DB_PASSWORD}``), so the lockfile gets the .env file's
+permissions (0600 if it has none to copy) and must not be committed when
+values come from secrets.
+"""
+
+import json
+import os
+import stat
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from .expansion import dependent_keys, environment_closure, resolve_variables
+from .fingerprint import sha256_file, sha256_text
+from .locking import atomic_write
+from .parser import parse_path
+
+# Bump when the lockfile layout changes
+LOCK_VERSION = 1
+
+
+def default_lock_path(env_file: Path) -> Path:
+    """Get the default lockfile path for a .env file.
+
+    Args:
+        env_file: Path to the .env file
+
+    Returns:
+        Path with '.lock' appended to the file name
+    """
+    env_file = Path(env_file)
+    return env_file.with_name(env_file.name + '.lock')
+
+
+def _hash_env(keys, env: Mapping[str, str]) -> Dict[str, Optional[str]]:
+    return {key: sha256_text(env[key]) if key in env else None for key in sorted(keys)}
+
+
+def create_lock(
+    env_file: Path,
+    lock_path: Optional[Path] = None,
+    override: bool = False,
+    env: Optional[Mapping[str, str]] = None,
+) -> Dict[str, Any]:
+    """Resolve a .env file and build its lock data.
+
+    Args:
+        env_file: Path to the .env file
+        lock_path: Where the lockfile will be written (default: default_lock_path())
+        override: If True, override existing environment variables
+        env: Environment used for expansion (default: os.environ)
+
+    Returns:
+        Lock data ready to be written as JSON
+
+    Raises:
+        OSError: If the .env file cannot be read
+        ParseError: If the .env file has invalid syntax
+    """
+    env_file = Path(env_file)
+    lock_path = Path(lock_path) if lock_path is not None else default_lock_path(env_file)
+    env = dict(os.environ if env is None else env)
+
+    variables = parse_path(env_file)
+    values = resolve_variables(variables, override=override, env=env)
+    keys = environment_closure(dependent_keys(variables), env)
+    source = Path(os.path.relpath(env_file.resolve(), lock_path.resolve().parent))
+
+    return {
+        'version': LOCK_VERSION,
+        'override': override,
+        'sources': {
+            source.as_posix(): {
+                'size': env_file.stat().st_size,
+                'sha256': sha256_file(env_file),
+            },
+        },
+        'environment': _hash_env(keys, env),
+        'values': dict(sorted(values.items())),
+    }
+
+
+def write_lock(
+    env_file: Path,
+    lock_path: Optional[Path] = None,
+    override: bool = False,
+    env: Optional[Mapping[str, str]] = None,
+) -> Path:
+    """Resolve a .env file and write its lockfile.
+
+    Args:
+        env_file: Path to the .env file
+        lock_path: Lockfile path (default: default_lock_path())
+        override: If True, override existing environment variables
+        env: Environment used for expansion (default: os.environ)
+
+    Returns:
+        Path of the written lockfile, with the .env file's permissions
+
+    Raises:
+        OSError: If a file cannot be read or written
+        ParseError: If the .env file has invalid syntax
+    """
+    lock_path = Path(lock_path) if lock_path is not None else default_lock_path(env_file)
+    lock = create_lock(env_file, lock_path, override=override, env=env)
+    try:
+        mode = stat.S_IMODE(os.stat(env_file).st_mode)
+    except OSError:
+        mode = 0o600
+    atomic_write(lock_path, json.dumps(lock, indent=2, sort_keys=True) + '\n', mode=mode)
+    return lock_path
+
+
+def read_lock(lock_path: Path) -> Optional[Dict[str, Any]]:
+    """Read a lockfile.
+
+    Args:
+        lock_path: Lockfile path
+
+    Returns:
+        Lock data, or None if the file is missing, invalid, or from another
+        format version
+    """
+    try:
+        with open(lock_path, encoding='utf-8') as f:
+            lock = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(lock, dict) or lock.get('version') != LOCK_VERSION:
+        return None
+    return lock
+
+
+def _source_matches(path: Path, record: Mapping[str, Any], lock_mtime_ns: int) -> bool:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+
+    if st.st_size != record.get('size'):
+        return False
+    # Modified before the lockfile was written: no need to hash. Equal
+    # timestamps are ambiguous at coarse filesystem granularity, so hash.
+    if st.st_mtime_ns < lock_mtime_ns:
+        return True
+    return sha256_file(path) == record.get('sha256')
+
+
+def verify_lock(
+    lock: Mapping[str, Any],
+    lock_path: Path,
+    override: bool = False,
+    env: Optional[Mapping[str, str]] = None,
+) -> bool:
+    """Check whether a lockfile still describes the current resolution.
+
+    Args:
+        lock: Lock data from read_lock()
+        lock_path: Lockfile path (sources are relative to its directory)
+        override: The override mode the caller is loading with
+        env: Current environment (default: os.environ)
+
+    Returns:
+        True if the locked values can be used as is
+    """
+    if lock.get('override') != override:
+        return False
+
+    lock_path = Path(lock_path)
+    try:
+        lock_mtime_ns = os.stat(lock_path).st_mtime_ns
+    except OSError:
+        return False
+
+    for source, record in lock.get('sources', {}).items():
+        if not _source_matches(lock_path.parent / source, record, lock_mtime_ns):
+            return False
+
+    env = os.environ if env is None else env
+    expected = lock.get('environment', {})
+    return _hash_env(expected, env) == expected
+
+
+def load_locked(
+    env_file: Path,
+    lock_path: Optional[Path] = None,
+    override: bool = False,
+    env: Optional[Mapping[str, str]] = None,
+) -> Optional[Dict[str, str]]:
+    """Get the locked values for a .env file if its lockfile is current.
+
+    Args:
+        env_file: Path to the .env file
+        lock_path: Lockfile path (default: default_lock_path())
+        override: If True, override existing environment variables
+        env: Current environment (default: os.environ)
+
+    Returns:
+        Dictionary of variables to set, or None if there is no current lockfile
+    """
+    lock_path = Path(lock_path) if lock_path is not None else default_lock_path(env_file)
+    lock = read_lock(lock_path)
+    if lock is None or not verify_lock(lock, lock_path, override=override, env=env):
+        return None
+    return dict(lock['values'])
@@ -0,0 +1,191 @@
+"""File locking and atomic writes for files shared between processes.
+
+Several CLI invocations (parallel CI jobs, multiple shells) may update the
+same file at once. This module provides:
+- file_lock() to hold an advisory lock on a sidecar ``.lck`` file
+- replace_lock() to hold an advisory lock on a file itself, for files such
+  as .env files where a sidecar would clutter the directory
+- atomic_write() to replace a file's contents with a temp file and rename,
+  so readers see either the old or the new contents, never a partial write
+
+Locks use ``fcntl.flock`` and are advisory: they only exclude other callers
+of the same function. On platforms without ``fcntl`` they are no-ops, and atomic
+writes still protect readers from torn files.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Suffix of the sidecar lock file. Not '.lock', which is taken by lockfiles.
+LOCK_SUFFIX = '.lck'
+
+
+def lock_path_for(path: Path) -> Path:
+    """Get the sidecar lock file for a file.
+
+    Args:
+        path: The file being protected
+
+    Returns:
+        Path with '.lck' appended to the file name
+    """
+    path = Path(path)
+    return path.with_name(path.name + LOCK_SUFFIX)
+
+
+@contextmanager
+def file_lock(path: Path, shared: bool = False) -> Iterator[None]:
+    """Hold an advisory lock for a file.
+
+    The lock is taken on a sidecar file rather than the file itself, since
+    atomic_write() replaces the file and a lock on the old inode would no
+    longer exclude anyone. The sidecar is left in place: removing it would
+    let two processes lock different inodes.
+
+    Args:
+        path: The file being protected; its directory must exist
+        shared: If True, take a shared (read) lock instead of an exclusive one
+
+    Yields:
+        None, while the lock is held
+    """
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(str(lock_path_for(path)), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+@contextmanager
+def replace_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a file that atomic_write() replaces.
+
+    The lock is taken on the file itself. If another process replaced the
+    file while this one waited, the lock is on the old inode, so it is
+    taken again on the new one. A missing file is created empty, with the
+    permissions the umask allows.
+
+    Args:
+        path: The file being protected; its directory must exist
+
+    Yields:
+        None, while the lock is held
+    """
+    if fcntl is None:
+        yield
+        return
+
+    while True:
+        fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(str(path))
+            except FileNotFoundError:
+                current = None
+            if current is not None and os.path.samestat(current, os.fstat(fd)):
+                break
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)
+
+    try:
+        yield
+    finally:
+        os.close(fd)
+
+
+def atomic_write(
+    path: Path,
+    data: Union[str, bytes],
+    mode: int = 0o600,
+    fsync: bool = False,
+    owner: Optional[Tuple[int, int]] = None,
+) -> None:
+    """Replace a file's contents atomically.
+
+    The data is written to a temp file in the same directory, given its
+    permissions, and renamed over ``path``. Permissions are set before the
+    rename, so the file is never visible with looser ones.
+
+    Args:
+        path: File to write
+        data: New contents; str is encoded as UTF-8
+        mode: Permission bits for the file
+        fsync: If True, flush the file and its directory to disk, so the new
+            contents survive a crash (slower)
+        owner: (uid, gid) to give the file, if permitted; otherwise it
+            belongs to the current user
+
+    Raises:
+        OSError: If the file can't be written
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            if owner is not None:
+                _chown(f.fileno(), owner)
+            os.chmod(tmp_path, mode)
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, str(path))
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync:
+        _fsync_dir(path.parent)
+
+
+def _chown(fd: int, owner: Tuple[int, int]) -> None:
+    """Give a file an owner and group, where this process may."""
+    st = os.fstat(fd)
+    if (st.st_uid, st.st_gid) == owner or not hasattr(os, 'fchown'):
+        return
+    try:
+        os.fchown(fd, *owner)
+    except OSError:
+        # Only root may give files away; keep at least the group if allowed
+        try:
+            os.fchown(fd, -1, owner[1])
+        except OSError:
+            pass
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Flush a directory entry so a rename into it is durable."""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Not supported for directories on every platform/filesystem
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,190 @@
+"""Run one command under many .env files concurrently.
+
+``dotenv-run --matrix 'envs/*.env' -j 8 -- cmd`` runs ``cmd`` once per
+matching file. This module provides:
+- expand_matrix() to turn glob patterns into a sorted list of files
+- resolve_matrix() to resolve all files in one batch
+- run_matrix() to run the command under each environment with bounded
+  parallelism, prefixing every output line with the file it belongs to
+
+Files given with ``-f`` are common to every run: they are resolved once,
+and each matrix file is then resolved on top of the result.
+"""
+
+import asyncio
+import glob
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from .aio import aresolve_many
+from .runner import resolve_environment
+
+
+class MatrixResult:
+    """Outcome of one run of a matrix."""
+
+    def __init__(self, label: str, returncode: int, duration: float):
+        """Initialize the result.
+
+        Args:
+            label: The .env file the command ran under
+            returncode: The command's exit code (127/126 if it couldn't start)
+            duration: Wall time in seconds
+        """
+        self.label = label
+        self.returncode = returncode
+        self.duration = duration
+
+    @property
+    def ok(self) -> bool:
+        """Whether the command succeeded."""
+        return self.returncode == 0
+
+    def __repr__(self) -> str:
+        return (f"MatrixResult({self.label!r}, returncode={self.returncode}, "
+                f"duration={self.duration:.3f})")
+
+
+def expand_matrix(patterns: Sequence[str]) -> List[str]:
+    """Expand glob patterns into .env files.
+
+    Args:
+        patterns: Glob patterns (``**`` matches subdirectories)
+
+    Returns:
+        Sorted, de-duplicated list of matching files
+    """
+    files = set()
+    for pattern in patterns:
+        files.update(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+    return sorted(files)
+
+
+def resolve_matrix(
+    matrix_files: Sequence[str],
+    common_files: Sequence[Path] = (),
+    override: bool = False,
+    environ: Optional[Dict[str, str]] = None,
+    max_concurrency: int = 8,
+) -> List[Dict[str, str]]:
+    """Resolve every matrix file on top of the common files.
+
+    Args:
+        matrix_files: One .env file per run
+        common_files: .env files shared by all runs, resolved once
+        override: If True, override existing environment variables
+        environ: Starting environment (default: os.environ)
+        max_concurrency: Maximum number of files read concurrently
+
+    Returns:
+        The complete environment of each run, in the order of matrix_files
+
+    Raises:
+        LoadDotenvFileNotFound: If a .env file doesn't exist
+        LoadDotenvError: If there's an error parsing or loading
+    """
+    base = resolve_environment(common_files, override=override, environ=environ)
+    values = asyncio.run(aresolve_many(
+        [Path(f) for f in matrix_files], override=override, env=base,
+        max_concurrency=max_concurrency,
+    ))
+    return [dict(base, **v) for v in values]
+
+
+def _copy_prefixed(stream: BinaryIO, prefix: bytes, out: BinaryIO, lock: threading.Lock) -> None:
+    """Copy a child's output line by line, prefixing each line."""
+    for line in iter(stream.readline, b''):
+        if not line.endswith(b'\n'):
+            line += b'\n'
+        with lock:
+            out.write(prefix + line)
+            out.flush()
+    stream.close()
+
+
+def _run_one(
+    label: str,
+    env: Dict[str, str],
+    command: List[str],
+    out: BinaryIO,
+    lock: threading.Lock,
+) -> MatrixResult:
+    prefix = f'[{label}] '.encode('utf-8', 'surrogateescape')
+    start = time.monotonic()
+    try:
+        child = subprocess.Popen(command, env=env, stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    except OSError as e:
+        with lock:
+            out.write(prefix + f"Cannot run {command[0]}: {e.strerror}\n".encode())
+            out.flush()
+        code = 127 if isinstance(e, FileNotFoundError) else 126
+        return MatrixResult(label, code, time.monotonic() - start)
+
+    _copy_prefixed(child.stdout, prefix, out, lock)
+    returncode = child.wait()
+    return MatrixResult(label, returncode, time.monotonic() - start)
+
+
+def run_matrix(
+    runs: Sequence[Tuple[str, Dict[str, str]]],
+    command: List[str],
+    jobs: int = 1,
+    out: Optional[BinaryIO] = None,
+) -> List[MatrixResult]:
+    """Run a command once per environment.
+
+    Standard output and standard error of each run are merged and streamed
+    to ``out`` as they arrive, each line prefixed with ``[label]``.
+
+    Args:
+        runs: (label, environment) pairs
+        command: Program and arguments
+        jobs: Maximum number of runs at the same time
+        out: Binary stream for the output (default: sys.stdout)
+
+    Returns:
+        One MatrixResult per run, in the order of ``runs``
+
+    Raises:
+        ValueError: If command is empty or jobs is less than 1
+    """
+    if not command:
+        raise ValueError("No command given")
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+
+    lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_run_one, label, env, list(command), out, lock)
+                   for label, env in runs]
+        return [future.result() for future in futures]
+
+
+def format_summary(results: Sequence[MatrixResult]) -> str:
+    """Format per-file exit codes and timings as a table.
+
+    Args:
+        results: Results from run_matrix()
+
+    Returns:
+        Multi-line summary
+    """
+    width = max([len(r.label) for r in results] + [len('env file')])
+    lines = [f"{'env file':<{width}}  {'exit':>4}  {'time':>8}"]
+    for result in results:
+        lines.append(
+            f"{result.label:<{width}}  {result.returncode:>4}  {result.duration:>7.2f}s"
+        )
+    failed = sum(1 for r in results if not r.ok)
+    lines.append(f"{len(results) - failed} passed, {failed} failed")
+    return '\n'.join(lines)
@@ -8,7 +8,12 @@ Supports:
 - export KEY=value - Export prefix
 """
 
+import os
 import re
+import time
+# threading itself costs several ms to import; the parser is on the
+# dotenv_tools.load() startup path and only needs a plain lock
+from _thread import allocate_lock
 from typing import List, Optional, Tuple, Dict
 
 
@@ -17,6 +22,16 @@ class ParseError(Exception):
     pass
 
 
+# Files modified this recently (in nanoseconds) are not cached: a second write
+# within the filesystem's timestamp granularity could keep the same signature
+RACY_WINDOW_NS = 2_000_000_000
+
+# Parsed files by absolute path: (inode, size, mtime_ns) signature and result
+_parse_cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Tuple[str, str]]]] = {}
+
+# Serializes cache writes; lookups are a single dict read and need no lock
+_parse_cache_lock = allocate_lock()
+
 # Regex patterns for different operators
 PATTERNS = {
     '?=': re.compile(r'^([a-zA-Z_][a-zA-Z0-9_]*)\?\=(.*)$'),
@@ -220,3 +235,44 @@ def parse_file_to_dict(content: str) -> Dict[str, Tuple[str, str]]:
         result[key] = (op, value)
 
     return result
+
+
+def parse_path(path) -> Dict[str, Tuple[str, str]]:
+    """Parse a .env file from disk, reusing the result while it is unchanged.
+
+    Results are cached per file and keyed by inode, size and modification
+    time, so repeated loads of an unchanged file cost one ``stat`` call.
+
+    Args:
+        path: Path to the .env file
+
+    Returns:
+        Dictionary mapping key to (operator, value)
+
+    Raises:
+        OSError: If the file cannot be read
+        ParseError: If any line has invalid syntax
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    cached = _parse_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return dict(cached[1])
+
+    with open(key, encoding='utf-8') as f:
+        result = parse_file_to_dict(f.read())
+
+    with _parse_cache_lock:
+        if time.time_ns() - st.st_mtime_ns > RACY_WINDOW_NS:
+            _parse_cache[key] = (signature, result)
+        else:
+            _parse_cache.pop(key, None)
+    return dict(result)
+
+
+def clear_parse_cache() -> None:
+    """Forget all cached parse results."""
+    with _parse_cache_lock:
+        _parse_cache.clear()
@@ -0,0 +1,163 @@
+"""pytest plugin: apply .env files to tests.
+
+Installed as the ``dotenv_tools`` pytest11 entry point. It provides:
+- the ``@pytest.mark.dotenv(*paths, override=False)`` marker, on tests,
+  classes or modules
+- the ``dotenv`` fixture, whose ``apply(path, override=False)`` applies a
+  file for the rest of the test
+- the session-scoped ``dotenv_cache`` fixture
+
+Files are parsed and resolved once per session and reused while the file
+and the variables it depends on are unchanged. Each test applies them with
+context.apply_delta() and restores only the keys that were touched, so
+nothing leaks between tests. All state is per process, so every
+pytest-xdist worker keeps its own cache.
+
+Relative paths are resolved against the pytest rootdir.
+"""
+
+import os
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import pytest
+
+from .context import apply_delta, restore
+from .expansion import dependent_keys, environment_closure, resolve_variables
+from .parser import RACY_WINDOW_NS, parse_path
+
+MARKER = 'dotenv'
+
+
+class DotenvCache:
+    """Parsed and resolved .env files, shared by all tests of a session."""
+
+    def __init__(self, rootdir: Optional[str] = None):
+        """Initialize an empty cache.
+
+        Args:
+            rootdir: Directory relative paths are resolved against
+                (default: the current directory)
+        """
+        self.rootdir = rootdir or os.getcwd()
+        # path -> (stat signature, parsed variables, dependent keys)
+        self._files: Dict[str, Tuple[Tuple[int, int, int], Dict, List[str]]] = {}
+        # (path, override, values of dependent keys and the variables they
+        # reference) -> resolved variables
+        self._results: Dict[Tuple, Dict[str, str]] = {}
+
+    def resolve(self, path: str, override: bool = False) -> Dict[str, str]:
+        """Resolve a .env file against the current os.environ.
+
+        Args:
+            path: Path to the .env file
+            override: If True, override existing environment variables
+
+        Returns:
+            Dictionary of variables to set (shared; don't modify it)
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ParseError: If the file has invalid syntax
+            ExpansionError: If variable expansion fails
+        """
+        path = os.path.join(self.rootdir, os.fspath(path))
+        st = os.stat(path)
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+
+        # Recently modified files may change again without a new signature
+        if time.time_ns() - st.st_mtime_ns <= RACY_WINDOW_NS:
+            self._forget(path)
+            return resolve_variables(parse_path(path), override=override)
+
+        cached = self._files.get(path)
+        if cached is None or cached[0] != signature:
+            variables = parse_path(path)
+            cached = (signature, variables, sorted(dependent_keys(variables)))
+            self._forget(path)
+            self._files[path] = cached
+
+        _signature, variables, keys = cached
+        environ = os.environ
+        closure = sorted(environment_closure(keys, environ))
+        result_key = (path, override, tuple((key, environ.get(key)) for key in closure))
+        result = self._results.get(result_key)
+        if result is None:
+            result = resolve_variables(variables, override=override)
+            self._results[result_key] = result
+        return result
+
+    def _forget(self, path: str) -> None:
+        self._files.pop(path, None)
+        self._results = {
+            key: value for key, value in self._results.items() if key[0] != path
+        }
+
+
+class DotenvFixture:
+    """Per-test handle returned by the ``dotenv`` fixture."""
+
+    def __init__(self, cache: DotenvCache):
+        self._cache = cache
+        self._saved: List[Mapping[str, Optional[str]]] = []
+
+    def apply(self, path: str, override: bool = False) -> Dict[str, str]:
+        """Apply a .env file until the end of the test.
+
+        Args:
+            path: Path to the .env file (relative to the pytest rootdir)
+            override: If True, override existing environment variables
+
+        Returns:
+            The variables that were applied
+        """
+        variables = self._cache.resolve(path, override=override)
+        self._saved.append(apply_delta(variables))
+        return dict(variables)
+
+    def undo(self) -> None:
+        """Restore everything applied so far, newest first."""
+        while self._saved:
+            restore(self._saved.pop())
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        'markers',
+        f'{MARKER}(*paths, override=False): apply .env files to os.environ '
+        'for the duration of the test',
+    )
+
+
+@pytest.fixture(scope='session')
+def dotenv_cache(pytestconfig: pytest.Config) -> DotenvCache:
+    """Session-wide cache of parsed and resolved .env files."""
+    return DotenvCache(str(pytestconfig.rootpath))
+
+
+@pytest.fixture
+def dotenv(dotenv_cache: DotenvCache):
+    """Apply .env files inside a test; everything is restored afterwards."""
+    handle = DotenvFixture(dotenv_cache)
+    yield handle
+    handle.undo()
+
+
+@pytest.fixture(autouse=True)
+def _dotenv_marker(request: pytest.FixtureRequest):
+    """Apply the files named by ``dotenv`` markers."""
+    # Outermost (module, then class, then function) markers apply first
+    markers = list(request.node.iter_markers(MARKER))
+    if not markers:
+        yield
+        return
+
+    handle = DotenvFixture(request.getfixturevalue('dotenv_cache'))
+    try:
+        for marker in reversed(markers):
+            override = marker.kwargs.get('override', False)
+            for path in marker.args:
+                handle.apply(path, override=override)
+        yield
+    finally:
+        handle.undo()
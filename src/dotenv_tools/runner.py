@@ -0,0 +1,63 @@
+"""Run commands with variables from .env files.
+
+This module provides:
+- resolve_environment() to merge one or more .env files into an environment
+- exec_command() to replace the current process with a command
+
+Nothing here writes tracker state or prints, so ``dotenv-run`` can be used
+as a container entrypoint without extra process hops.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .client import resolve_file
+
+
+def resolve_environment(
+    env_files: Sequence[Path],
+    override: bool = False,
+    environ: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """Resolve .env files into a complete environment.
+
+    Files are applied in order; each file is resolved against the
+    environment produced by the files before it. Files are resolved by the
+    dotenv-tools daemon when it is running.
+
+    Args:
+        env_files: Paths to the .env files
+        override: If True, override existing environment variables
+        environ: Starting environment (default: os.environ)
+
+    Returns:
+        The merged environment
+
+    Raises:
+        LoadDotenvFileNotFound: If a .env file doesn't exist
+        LoadDotenvError: If there's an error parsing or loading
+    """
+    merged = dict(os.environ if environ is None else environ)
+    for env_file in env_files:
+        merged.update(resolve_file(Path(env_file), override=override, env=merged))
+    return merged
+
+
+def exec_command(command: List[str], env: Dict[str, str]) -> None:
+    """Replace the current process with a command.
+
+    The command is looked up on the PATH of ``env``. On success this
+    function does not return.
+
+    Args:
+        command: Program and arguments
+        env: Environment for the command
+
+    Raises:
+        ValueError: If command is empty
+        OSError: If the command cannot be executed
+    """
+    if not command:
+        raise ValueError("No command given")
+    os.execvpe(command[0], list(command), env)
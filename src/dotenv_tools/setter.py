@@ -5,12 +5,30 @@ This module provides functionality to:
 - Remove variables from .env files
 - Edit .env files with custom editor
 - Update existing variables
+- Apply many sets and removals with a single read and write (batch())
+
+Changes go through an in-memory copy of the file with an index from key to
+line numbers, so each operation costs a dictionary lookup rather than a
+scan of the whole file.
+
+A single set_variable() avoids rewriting the file where it can: a new key is
+appended with an O_APPEND write, and an update that keeps the line's length
+overwrites just that line. Other changes rewrite the file atomically.
 """
 
 import os
 import re
+import stat
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Dict, Iterable, Iterator, Optional, List, Sequence, Tuple
+
+from .locking import atomic_write, replace_lock
+
+# Assignment at the start of a line: optional export, key, operator
+_ASSIGNMENT = re.compile(r'^\s*(?:export\s+)?([^\s=]+?)\s*([+?:]?=)')
+
+_VALID_KEY = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
 
 
 class SetDotenvError(Exception):
@@ -45,28 +63,14 @@ class SetDotenv:
         Raises:
             SetDotenvError: If there's an error writing to file
         """
-        # Validate key
-        if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', key):
+        if not _VALID_KEY.match(key):
             raise SetDotenvError(f"Invalid environment variable name: {key}")
 
-        # Read existing file or create new
-        lines = self._read_lines()
-
-        # Find if key already exists
-        key_pattern = re.compile(rf'^\s*(?:export\s+)?{re.escape(key)}\s*([+?:]?=)')
-
-        for i, line in enumerate(lines):
-            if key_pattern.match(line):
-                # Update existing line
-                new_line = self._format_line(key, value, operator, line)
-                lines[i] = new_line
-                self._write_lines(lines)
+        with self._locked() as target:
+            if self._set_in_place(target, key, value, operator):
                 return
-
-        # Key doesn't exist, append new line
-        new_line = self._format_line(key, value, operator)
-        lines.append(new_line)
-        self._write_lines(lines)
+            with self._edit() as batch:
+                batch.set(key, value, operator)
 
     def remove_variable(self, key: str) -> bool:
         """Remove a variable from the .env file.
@@ -80,20 +84,62 @@ class SetDotenv:
         Raises:
             SetDotenvError: If there's an error writing to file
         """
-        # Read existing file
-        lines = self._read_lines()
+        with self.batch() as batch:
+            return batch.remove(key)
+
+    @contextmanager
+    def batch(self) -> Iterator['SetDotenvBatch']:
+        """Apply several changes with one read and one write.
+
+        The file is read once; the changes are made in memory and written
+        together when the block exits. If the block raises, nothing is
+        written.
+
+        The whole read-modify-write holds an advisory lock on the file, so
+        concurrent batches (e.g. two set-dotenv runs) apply one after the
+        other instead of losing each other's changes. A missing file is
+        created.
+
+        Example:
+            with SetDotenv(path).batch() as batch:
+                batch.set('HOST', 'localhost')
+                batch.remove('OLD_KEY')
+
+        Yields:
+            SetDotenvBatch to make changes on
+
+        Raises:
+            SetDotenvError: If there's an error reading or writing the file
+        """
+        with self._locked(), self._edit() as batch:
+            yield batch
 
-        # Find and remove key
-        key_pattern = re.compile(rf'^\s*(?:export\s+)?{re.escape(key)}\s*[+?:]?=.*$')
+    def apply(self, ops: Iterable[Sequence[str]]) -> List[bool]:
+        """Apply a list of operations with one read and one write.
 
-        # Check if any line matches before removing
-        removed = any(key_pattern.match(line) for line in lines)
+        Args:
+            ops: Operations, each ('set', key, value), ('set', key, value,
+                operator) or ('remove', key)
 
-        # Remove matching lines
-        lines = [line for line in lines if not key_pattern.match(line)]
-        self._write_lines(lines)
+        Returns:
+            One result per operation: True for sets, and for removals whether
+            the key existed
 
-        return removed
+        Raises:
+            SetDotenvError: If an operation is invalid (nothing is written)
+                or the file can't be read or written
+        """
+        results = []
+        with self.batch() as batch:
+            for op in ops:
+                if op[0] == 'set' and len(op) in (3, 4):
+                    batch.set(*op[1:])
+                    results.append(True)
+                elif op[0] == 'remove' and len(op) == 2:
+                    results.append(batch.remove(op[1]))
+                else:
+                    raise SetDotenvError(f"Invalid operation: {op!r}")
+        return results
 
     def get_variable(self, key: str) -> Optional[Tuple[str, str]]:
         """Get a variable from the .env file.
@@ -159,6 +205,82 @@ class SetDotenv:
         except Exception as e:
             raise SetDotenvError(f"Error reading file: {e}")
 
+    @contextmanager
+    def _locked(self) -> Iterator[Path]:
+        """Hold the file's advisory lock, creating the file if missing.
+
+        Yields:
+            The file to write (see _target())
+        """
+        with ExitStack() as stack:
+            target = self._target()
+            try:
+                self.env_file.parent.mkdir(parents=True, exist_ok=True)
+                stack.enter_context(replace_lock(target))
+            except OSError as e:
+                raise SetDotenvError(f"Error locking file: {e}")
+            yield target
+
+    @contextmanager
+    def _edit(self) -> Iterator['SetDotenvBatch']:
+        """Read-modify-write the file; the caller holds the lock."""
+        batch = SetDotenvBatch(self, self._read_lines())
+        yield batch
+        if batch.changed:
+            self._write_lines(batch.lines())
+
+    def _set_in_place(self, target: Path, key: str, value: str, operator: str) -> bool:
+        """Set a variable without rewriting the file, if possible.
+
+        A missing key is appended with an O_APPEND write. An existing key
+        whose new line has the same length in bytes is overwritten in place.
+        Both leave the other lines as they are, and cost one read of the
+        file but no rewrite. The caller holds the lock.
+
+        Args:
+            target: The file to write
+            key: Environment variable name
+            value: Value to set
+            operator: Assignment operator
+
+        Returns:
+            True if the variable was set, False if the file must be rewritten
+        """
+        if not hasattr(os, 'pwrite'):  # Windows
+            return False
+        try:
+            data = target.read_bytes()
+            span = _find_assignment(data, key)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            if span is None:
+                line = self._format_line(key, value, operator).encode('utf-8') + b'\n'
+                if data and not data.endswith(b'\n'):
+                    line = b'\n' + line
+                fd = os.open(str(target), os.O_WRONLY | os.O_APPEND)
+                try:
+                    _write_all(fd, line, None)
+                finally:
+                    os.close(fd)
+                return True
+
+            old = data[span[0]:span[1]]
+            new = self._format_line(key, value, operator, old.decode('utf-8')).encode('utf-8')
+            if new == old:
+                return True
+            if len(new) != len(old):
+                return False
+            fd = os.open(str(target), os.O_WRONLY)
+            try:
+                _write_all(fd, new, span[0])
+            finally:
+                os.close(fd)
+            return True
+        except OSError as e:
+            raise SetDotenvError(f"Error writing file: {e}")
+
     def _read_lines(self) -> List[str]:
         """Read lines from the .env file.
 
@@ -180,6 +302,11 @@ class SetDotenv:
     def _write_lines(self, lines: List[str]) -> None:
         """Write lines to the .env file.
 
+        The file is replaced atomically, so readers such as load-dotenv see
+        either the old or the new contents, never a truncated file. Its
+        permissions and (where allowed) ownership are kept, and a symlinked
+        .env file is written through the link.
+
         Args:
             lines: List of lines to write
 
@@ -195,10 +322,20 @@ class SetDotenv:
             if content and not content.endswith('\n'):
                 content += '\n'
 
-            self.env_file.write_text(content, encoding='utf-8')
+            target = self._target()
+            try:
+                st = os.stat(target)
+                mode, owner = stat.S_IMODE(st.st_mode), (st.st_uid, st.st_gid)
+            except FileNotFoundError:
+                mode, owner = 0o644, None
+            atomic_write(target, content, mode=mode, owner=owner)
         except Exception as e:
             raise SetDotenvError(f"Error writing file: {e}")
 
+    def _target(self) -> Path:
+        """Get the file to write: the .env file, or what it links to."""
+        return Path(os.path.realpath(self.env_file))
+
     def _format_line(self, key: str, value: str, operator: str, original_line: str = None) -> str:
         """Format a line for the .env file.
 
@@ -254,6 +391,124 @@ class SetDotenv:
             raise SetDotenvError(f"Error launching editor: {e}")
 
 
+class SetDotenvBatch:
+    """Changes to an in-memory copy of a .env file, from SetDotenv.batch()."""
+
+    def __init__(self, setter: SetDotenv, lines: List[str]):
+        """Initialize the batch.
+
+        Args:
+            setter: The SetDotenv whose file the lines came from
+            lines: The file's lines
+        """
+        self._setter = setter
+        # A trailing '' is the file's final newline, not a blank line
+        self._trailing_newline = bool(lines) and lines[-1] == ''
+        self._lines: List[Optional[str]] = lines[:-1] if self._trailing_newline else list(lines)
+        self._index: Dict[str, List[int]] = {}
+        for i, line in enumerate(self._lines):
+            match = _ASSIGNMENT.match(line)
+            if match:
+                self._index.setdefault(match.group(1), []).append(i)
+        self.changed = False
+
+    def set(self, key: str, value: str, operator: str = '=') -> None:
+        """Set a variable, updating its first line or appending a new one.
+
+        Args:
+            key: Environment variable name
+            value: Value to set
+            operator: Assignment operator (=, :=, +=, ?=)
+
+        Raises:
+            SetDotenvError: If the key is not a valid variable name
+        """
+        if not _VALID_KEY.match(key):
+            raise SetDotenvError(f"Invalid environment variable name: {key}")
+
+        indices = self._index.get(key)
+        if indices:
+            line = self._lines[indices[0]]
+            new_line = self._setter._format_line(key, value, operator, line)
+            if new_line != line:
+                self._lines[indices[0]] = new_line
+                self.changed = True
+        else:
+            self._index[key] = [len(self._lines)]
+            self._lines.append(self._setter._format_line(key, value, operator))
+            self.changed = True
+
+    def remove(self, key: str) -> bool:
+        """Remove every line that assigns a variable.
+
+        Args:
+            key: Environment variable name
+
+        Returns:
+            True if the variable existed
+        """
+        indices = self._index.pop(key, None)
+        if not indices:
+            return False
+        for i in indices:
+            self._lines[i] = None
+        self.changed = True
+        return True
+
+    def lines(self) -> List[str]:
+        """Get the file's lines with all changes applied.
+
+        Returns:
+            List of lines, without the trailing '' of a final newline
+        """
+        return [line for line in self._lines if line is not None]
+
+
+def _find_assignment(data: bytes, key: str) -> Optional[Tuple[int, int]]:
+    """Find the first line that assigns a key, as SetDotenvBatch would.
+
+    Args:
+        data: The file's contents
+        key: A valid environment variable name
+
+    Returns:
+        (start, end) byte offsets of the line, without its newline, or None
+
+    Raises:
+        ValueError: If the contents aren't UTF-8 or contain a carriage
+            return, which reading as text turns into a line break
+    """
+    if b'\r' in data:
+        raise ValueError("carriage return in file")
+    text = data.decode('utf-8')
+    # _ASSIGNMENT's key is the shortest match, so with a plain variable
+    # name a line assigns the key exactly when this matches it
+    match = re.search(
+        rf'^[^\S\n]*(?:export[^\S\n]+)?{key}[^\S\n]*[+?:]?=', text, re.M
+    )
+    if match is None:
+        return None
+    start = match.start()
+    end = text.find('\n', start)
+    if end == -1:
+        end = len(text)
+    if data.isascii():
+        return start, end
+    start_b = len(text[:start].encode('utf-8'))
+    return start_b, start_b + len(text[start:end].encode('utf-8'))
+
+
+def _write_all(fd: int, data: bytes, offset: Optional[int]) -> None:
+    """Write all of data, at offset or (if None) at the file position."""
+    while data:
+        if offset is None:
+            written = os.write(fd, data)
+        else:
+            written = os.pwrite(fd, data, offset)
+            offset += written
+        data = data[written:]
+
+
 def find_or_create_dotenv_file(start_path: Path = None) -> Path:
     """Find or create a .env file.
 
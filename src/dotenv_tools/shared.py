@@ -0,0 +1,315 @@
+"""Share resolved .env variables with worker processes via shared memory.
+
+A pre-fork server resolves its .env file once in the parent and publishes
+the result in a ``multiprocessing.shared_memory`` segment. Workers attach
+to the segment by name and read the variables without parsing anything.
+
+This module provides:
+- SharedEnvPublisher to create the segment and publish (or re-publish) values
+- SharedEnvReader to attach to the segment from a worker
+- publish_dotenv() to resolve a .env file and publish it in one step
+
+Segment layout (little-endian):
+- header: magic ``DENV``, layout version (u32), sequence (u64), payload length (u64)
+- payload: entry count (u32), then per entry key length (u32),
+  value length (u32), key bytes, value bytes
+
+The sequence number works as a seqlock: it is odd while the publisher is
+writing and is bumped to the next even number when done. ``version`` is
+half the sequence, so readers can detect reloads by reading 8 bytes.
+"""
+
+import os
+import struct
+import threading
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+# Name of the environment variable the publisher stores the segment name in,
+# so workers started with exec() can find it
+SHARED_ENV_VAR = 'DOTENV_TOOLS_SHM'
+
+# Minimum segment size; the segment can't grow after workers attach
+DEFAULT_SIZE = 64 * 1024
+
+_MAGIC = b'DENV'
+_LAYOUT_VERSION = 1
+_HEADER = struct.Struct('<4sIQQ')
+_SEQUENCE_OFFSET = 8
+_LENGTH_OFFSET = 16
+_U64 = struct.Struct('<Q')
+_COUNT = struct.Struct('<I')
+_LENGTHS = struct.Struct('<II')
+
+# Give up on a consistent read after this many attempts
+_MAX_READ_ATTEMPTS = 1000
+
+_attach_lock = threading.Lock()
+
+
+class SharedEnvError(Exception):
+    """Raised when a shared environment segment can't be used."""
+
+
+def _encode(values: Mapping[str, str]) -> bytes:
+    """Serialize variables into the compact payload format."""
+    parts = [_COUNT.pack(len(values))]
+    for key, value in values.items():
+        key_bytes = os.fsencode(key)
+        value_bytes = os.fsencode(value)
+        parts.append(_LENGTHS.pack(len(key_bytes), len(value_bytes)))
+        parts.append(key_bytes)
+        parts.append(value_bytes)
+    return b''.join(parts)
+
+
+def _decode(payload) -> Dict[str, str]:
+    """Deserialize a payload produced by _encode()."""
+    (count,) = _COUNT.unpack_from(payload, 0)
+    offset = _COUNT.size
+    values = {}
+    for _ in range(count):
+        key_len, value_len = _LENGTHS.unpack_from(payload, offset)
+        offset += _LENGTHS.size
+        key = os.fsdecode(bytes(payload[offset:offset + key_len]))
+        offset += key_len
+        values[key] = os.fsdecode(bytes(payload[offset:offset + value_len]))
+        offset += value_len
+    return values
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without taking ownership of it.
+
+    By default Python registers attached segments with the resource tracker,
+    which unlinks them when the attaching process exits. Readers must not
+    do that, since the publisher owns the segment.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Python < 3.13 has no track argument. Unregistering after the fact
+    # would also drop the publisher's registration when both share a
+    # tracker (same process or forked workers), so skip registering instead.
+    from multiprocessing import resource_tracker
+
+    with _attach_lock:
+        register = resource_tracker.register
+
+        def register_others(resource, rtype):
+            if rtype != 'shared_memory':
+                register(resource, rtype)
+
+        resource_tracker.register = register_others
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedEnvPublisher:
+    """Publish resolved variables in a shared memory segment."""
+
+    def __init__(
+        self,
+        values: Optional[Mapping[str, str]] = None,
+        name: Optional[str] = None,
+        size: Optional[int] = None,
+        export_name: bool = True
+    ):
+        """Create the segment.
+
+        Args:
+            values: Variables to publish right away
+            name: Segment name (default: generated)
+            size: Segment size in bytes (default: DEFAULT_SIZE, or twice the
+                initial payload if that is larger, to leave room for reloads)
+            export_name: If True, store the segment name in
+                os.environ[SHARED_ENV_VAR] so child processes inherit it
+        """
+        payload = _encode(values or {})
+        if size is None:
+            size = max(DEFAULT_SIZE, _HEADER.size + 2 * len(payload))
+
+        self._segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._sequence = 0
+        _HEADER.pack_into(self._segment.buf, 0, _MAGIC, _LAYOUT_VERSION, 0, 0)
+        self._write(payload)
+
+        if export_name:
+            os.environ[SHARED_ENV_VAR] = self.name
+
+    @property
+    def name(self) -> str:
+        """Name workers use to attach to the segment."""
+        return self._segment.name
+
+    @property
+    def version(self) -> int:
+        """Number of times values have been published."""
+        return self._sequence // 2
+
+    @property
+    def capacity(self) -> int:
+        """Largest payload the segment can hold, in bytes."""
+        return self._segment.size - _HEADER.size
+
+    def publish(self, values: Mapping[str, str]) -> int:
+        """Replace the published variables.
+
+        Args:
+            values: Variables to publish
+
+        Returns:
+            The new version
+
+        Raises:
+            SharedEnvError: If the serialized variables don't fit the segment
+        """
+        self._write(_encode(values))
+        return self.version
+
+    def _write(self, payload: bytes) -> None:
+        if len(payload) > self.capacity:
+            raise SharedEnvError(
+                f"Variables need {len(payload)} bytes but the segment holds "
+                f"{self.capacity}; create the publisher with a larger size"
+            )
+
+        buf = self._segment.buf
+        # Odd sequence: readers retry until the write is finished
+        self._sequence += 1
+        _U64.pack_into(buf, _SEQUENCE_OFFSET, self._sequence)
+        buf[_HEADER.size:_HEADER.size + len(payload)] = payload
+        _U64.pack_into(buf, _LENGTH_OFFSET, len(payload))
+        self._sequence += 1
+        _U64.pack_into(buf, _SEQUENCE_OFFSET, self._sequence)
+
+    def close(self, unlink: bool = True) -> None:
+        """Release the segment.
+
+        Args:
+            unlink: If True, also remove the segment from the system
+        """
+        self._segment.close()
+        if unlink:
+            self._segment.unlink()
+            if os.environ.get(SHARED_ENV_VAR) == self.name:
+                del os.environ[SHARED_ENV_VAR]
+
+    def __enter__(self) -> 'SharedEnvPublisher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SharedEnvReader:
+    """Read variables published by a SharedEnvPublisher."""
+
+    def __init__(self, name: Optional[str] = None):
+        """Attach to a segment.
+
+        Args:
+            name: Segment name (default: os.environ[SHARED_ENV_VAR])
+
+        Raises:
+            SharedEnvError: If no name is known, the segment doesn't exist,
+                or it isn't a dotenv-tools segment
+        """
+        if name is None:
+            name = os.environ.get(SHARED_ENV_VAR)
+            if not name:
+                raise SharedEnvError(f"{SHARED_ENV_VAR} is not set")
+
+        try:
+            self._segment = _attach(name)
+        except FileNotFoundError:
+            raise SharedEnvError(f"Shared environment not found: {name}")
+
+        magic, layout, _sequence, _length = _HEADER.unpack_from(self._segment.buf, 0)
+        if magic != _MAGIC or layout != _LAYOUT_VERSION:
+            self._segment.close()
+            raise SharedEnvError(f"Not a dotenv-tools shared environment: {name}")
+
+        self._seen = None
+
+    @property
+    def version(self) -> int:
+        """Current published version (a single 8-byte read)."""
+        return _U64.unpack_from(self._segment.buf, _SEQUENCE_OFFSET)[0] // 2
+
+    def read(self) -> Dict[str, str]:
+        """Read the published variables.
+
+        Returns:
+            Dictionary of variables
+
+        Raises:
+            SharedEnvError: If no consistent snapshot could be read
+        """
+        buf = self._segment.buf
+        for _ in range(_MAX_READ_ATTEMPTS):
+            before = _U64.unpack_from(buf, _SEQUENCE_OFFSET)[0]
+            if before % 2:
+                continue
+            length = _U64.unpack_from(buf, _LENGTH_OFFSET)[0]
+            payload = bytes(buf[_HEADER.size:_HEADER.size + length])
+            if _U64.unpack_from(buf, _SEQUENCE_OFFSET)[0] != before:
+                continue
+            self._seen = before // 2
+            return _decode(payload)
+
+        raise SharedEnvError("Shared environment is being rewritten too often to read")
+
+    def refresh(self) -> Optional[Dict[str, str]]:
+        """Read the variables if they changed since the last read.
+
+        Returns:
+            Dictionary of variables, or None if the version is unchanged
+        """
+        if self._seen is not None and self.version == self._seen:
+            return None
+        return self.read()
+
+    def close(self) -> None:
+        """Detach from the segment (the publisher keeps it alive)."""
+        self._segment.close()
+
+    def __enter__(self) -> 'SharedEnvReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def publish_dotenv(
+    env_file: Optional[Path] = None,
+    override: bool = False,
+    name: Optional[str] = None,
+    size: Optional[int] = None
+) -> SharedEnvPublisher:
+    """Resolve a .env file and publish the result.
+
+    Args:
+        env_file: Path to the .env file (default: discover .env)
+        override: If True, override existing environment variables
+        name: Segment name (default: generated)
+        size: Segment size in bytes (default: see SharedEnvPublisher)
+
+    Returns:
+        The publisher; call publish() on it to push a reload
+
+    Raises:
+        LoadDotenvFileNotFound: If the .env file doesn't exist
+        LoadDotenvError: If there's an error parsing or loading
+    """
+    from .core import LoadDotenv, find_dotenv_file
+
+    if env_file is None:
+        env_file = find_dotenv_file()
+    values = LoadDotenv(env_file).load(override=override)
+    return SharedEnvPublisher(values, name=name, size=size)
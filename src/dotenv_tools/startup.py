@@ -0,0 +1,63 @@
+"""Minimal-import loading of .env files at application startup.
+
+``dotenv_tools.load()`` imports only the parser and the expansion engine:
+no click, no tracker state file, and no PyYAML. Unchanged files are served
+from the parser's cache.
+"""
+
+import os
+from typing import Dict, Optional
+
+from .expansion import resolve_variables
+from .hook import find_env_file
+from .parser import parse_path
+
+
+def resolve(path: Optional[str] = None, override: bool = False) -> Dict[str, str]:
+    """Resolve a .env file against os.environ without applying it.
+
+    Args:
+        path: Path to the .env file (default: the closest .env, searching from
+            the current directory upwards)
+        override: If True, override existing environment variables
+
+    Returns:
+        Dictionary of variables to set (empty if no .env file was found)
+
+    Raises:
+        FileNotFoundError: If an explicit path doesn't exist
+        ParseError: If the file has invalid syntax
+        ExpansionError: If variable expansion fails
+    """
+    if path is None:
+        path = find_env_file()
+        if path is None:
+            return {}
+
+    return resolve_variables(parse_path(path), override=override)
+
+
+def load(path: Optional[str] = None, override: bool = False) -> Dict[str, str]:
+    """Load a .env file into os.environ.
+
+    Args:
+        path: Path to the .env file (default: the closest .env, searching from
+            the current directory upwards)
+        override: If True, override existing environment variables
+
+    Returns:
+        Dictionary of loaded variables (empty if no .env file was found)
+
+    Raises:
+        FileNotFoundError: If an explicit path doesn't exist
+        ParseError: If the file has invalid syntax
+        ExpansionError: If variable expansion fails
+    """
+    variables = resolve(path, override=override)
+
+    environ = os.environ
+    for key, value in variables.items():
+        if environ.get(key) != value:
+            environ[key] = value
+
+    return variables
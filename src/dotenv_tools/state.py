@@ -0,0 +1,343 @@
+"""Storage for tracker state.
+
+The tracker's state is kept in one of two stores, chosen by the state
+file's suffix:
+- JsonStateStore: one JSON file shared by everything that uses it
+- SessionStore (``.db``): an sqlite database with one row per session, so
+  shells and jobs on a shared host don't see or unload each other's
+  variables
+
+A session is named with ``--session``, by DOTENV_TOOLS_SESSION, or else by
+the terminal session (``getsid``) the command runs in. Sessions are the
+table's primary key, so each command reads and writes only its own row.
+Rows left behind by sessions whose process has exited are removed
+automatically during writes, at most once every GC_INTERVAL seconds.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .locking import atomic_write, file_lock
+
+# Environment variable naming the session explicitly
+SESSION_ENV_VAR = 'DOTENV_TOOLS_SESSION'
+
+# State files with this suffix use the sqlite session store
+SESSION_STORE_SUFFIX = '.db'
+
+# Seconds between garbage collections of dead sessions
+GC_INTERVAL = 300.0
+
+# Seconds after which a named session that no process owns is removed
+MAX_IDLE = 30 * 24 * 3600.0
+
+State = Dict[str, Any]
+Merge = Callable[[Optional[State]], State]
+
+
+class JsonStateStore:
+    """Tracker state in a single JSON file."""
+
+    def __init__(self, path: Path, fsync: bool = False):
+        """Initialize the store.
+
+        Args:
+            path: The JSON state file
+            fsync: If True, flush the file to disk on every write
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+
+    def read(self) -> Optional[State]:
+        """Read the state.
+
+        Returns:
+            The state, or None if the file doesn't exist or is corrupted
+        """
+        if not self.path.exists():
+            return None
+        with file_lock(self.path, shared=True):
+            return self._read()
+
+    def update(self, merge: Merge) -> State:
+        """Read, merge and write the state under an exclusive lock.
+
+        Args:
+            merge: Called with the current state (or None) and returns the
+                new state
+
+        Returns:
+            The state that was written
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path):
+            state = merge(self._read())
+            atomic_write(self.path, json.dumps(state), fsync=self.fsync)
+        return state
+
+    def clear(self) -> None:
+        """Remove the state."""
+        if not self.path.exists():
+            return
+        with file_lock(self.path):
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _read(self) -> Optional[State]:
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except (ValueError, OSError):
+            # Missing or corrupted; the next write replaces it
+            return None
+        return state if isinstance(state, dict) else None
+
+
+class SessionStore:
+    """Tracker state per session in an sqlite database."""
+
+    def __init__(self, path: Path, session: Optional[str] = None):
+        """Initialize the store.
+
+        Args:
+            path: The sqlite database
+            session: Session name (default: current_session())
+        """
+        self.path = Path(path)
+        if session is None:
+            self.session, self.pid = current_session()
+        else:
+            self.session, self.pid = session, None
+        self._conn = None
+
+    def read(self) -> Optional[State]:
+        """Read this session's state.
+
+        Returns:
+            The state, or None if the session has none
+        """
+        if self._conn is None and not self.path.exists():
+            return None
+        return self._select(self._connect())
+
+    def update(self, merge: Merge) -> State:
+        """Read, merge and write this session's state in one transaction.
+
+        Dead sessions are collected in the same transaction when the last
+        collection is more than GC_INTERVAL seconds old.
+
+        Args:
+            merge: Called with the current state (or None) and returns the
+                new state
+
+        Returns:
+            The state that was written
+        """
+        conn = self._connect()
+        with _transaction(conn):
+            state = merge(self._select(conn))
+            now = time.time()
+            conn.execute(
+                'INSERT OR REPLACE INTO sessions (session, pid, state, updated_at) '
+                'VALUES (?, ?, ?, ?)',
+                (self.session, self.pid, json.dumps(state), now),
+            )
+            self._collect(conn, now, force=False)
+        return state
+
+    def clear(self) -> None:
+        """Remove this session's state."""
+        if self._conn is None and not self.path.exists():
+            return
+        conn = self._connect()
+        with _transaction(conn):
+            conn.execute('DELETE FROM sessions WHERE session = ?', (self.session,))
+
+    def sessions(self) -> List[Tuple[str, Optional[int], float]]:
+        """List the sessions in the database.
+
+        Returns:
+            (session, pid, updated_at) tuples, sorted by session
+        """
+        if self._conn is None and not self.path.exists():
+            return []
+        return list(self._connect().execute(
+            'SELECT session, pid, updated_at FROM sessions ORDER BY session'
+        ))
+
+    def collect_garbage(self) -> int:
+        """Remove the state of dead or long idle sessions now.
+
+        Returns:
+            Number of sessions removed
+        """
+        conn = self._connect()
+        with _transaction(conn):
+            return self._collect(conn, time.time(), force=True)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            import sqlite3
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Create the file owner-only before sqlite opens it
+            os.close(os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o600))
+            conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'session TEXT PRIMARY KEY, pid INTEGER, '
+                'state TEXT NOT NULL, updated_at REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)'
+            )
+            self._conn = conn
+        return self._conn
+
+    def _select(self, conn) -> Optional[State]:
+        row = conn.execute(
+            'SELECT state FROM sessions WHERE session = ?', (self.session,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            state = json.loads(row[0])
+        except ValueError:
+            return None
+        return state if isinstance(state, dict) else None
+
+    def _collect(self, conn, now: float, force: bool) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_gc'").fetchone()
+        if not force and row is not None and now - float(row[0]) < GC_INTERVAL:
+            return 0
+
+        stale = []
+        for session, pid, updated_at in conn.execute(
+            'SELECT session, pid, updated_at FROM sessions WHERE session != ?', (self.session,)
+        ):
+            if pid is not None:
+                if not _pid_alive(pid):
+                    stale.append(session)
+            elif now - updated_at > MAX_IDLE:
+                stale.append(session)
+        conn.executemany('DELETE FROM sessions WHERE session = ?', [(s,) for s in stale])
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_gc', ?)", (str(now),)
+        )
+        return len(stale)
+
+
+@contextmanager
+def _transaction(conn) -> Iterator[None]:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on error."""
+    # Take the write lock up front so read-merge-write can't interleave
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+
+def current_session() -> Tuple[str, Optional[int]]:
+    """Name the session this process belongs to.
+
+    Returns:
+        (session name, pid that owns it). The pid is None for sessions named
+        by DOTENV_TOOLS_SESSION, which no process owns.
+    """
+    explicit = os.environ.get(SESSION_ENV_VAR)
+    if explicit:
+        return explicit, None
+    try:
+        pid = os.getsid(0)
+    except (AttributeError, OSError):  # Windows
+        pid = os.getppid()
+    return f'pid-{pid}', pid
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process exists."""
+    if os.name == 'nt':
+        # os.kill() would terminate it; keep the session until it goes idle
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists, but owned by someone else
+        return True
+    return True
+
+
+def import_json_state(json_path: Path, store) -> bool:
+    """Move the state of a JSON state file into an empty store.
+
+    Used for the JSON state file that was the default before sessions, so
+    loads made before upgrading can still be unloaded. On success the JSON
+    file is renamed with a '.migrated' suffix, so it is imported only once.
+
+    Args:
+        json_path: The JSON state file
+        store: Store to import into; left alone if it already has state
+
+    Returns:
+        True if state was imported
+    """
+    json_path = Path(json_path)
+    if not json_path.exists():
+        return False
+
+    with file_lock(json_path):
+        state = JsonStateStore(json_path)._read()
+        if state is None:
+            return False
+
+        imported = []
+
+        def merge(stored: Optional[State]) -> State:
+            if stored is not None:
+                return stored
+            imported.append(True)
+            return state
+
+        store.update(merge)
+        if imported:
+            os.replace(str(json_path), str(json_path) + '.migrated')
+    return bool(imported)
+
+
+def open_state_store(path: Path, session: Optional[str] = None, fsync: bool = False):
+    """Open the store for a state file.
+
+    Args:
+        path: State file; a '.db' suffix selects the sqlite session store
+        session: Session name for the session store (default: current_session())
+        fsync: If True, flush JSON state to disk on every write
+
+    Returns:
+        A SessionStore or JsonStateStore
+
+    Raises:
+        ValueError: If a session is given for a JSON state file
+    """
+    path = Path(path)
+    if path.suffix == SESSION_STORE_SUFFIX:
+        return SessionStore(path, session)
+    if session is not None:
+        raise ValueError(f"Sessions need a {SESSION_STORE_SUFFIX} state file: {path}")
+    return JsonStateStore(path, fsync)
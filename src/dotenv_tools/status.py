@@ -0,0 +1,167 @@
+"""Detect drift between loaded variables and their sources.
+
+When load-dotenv loads a file, the tracker stores the file's fingerprint
+and a SHA-256 hash of every value it set (never the values themselves).
+check_status() compares those against:
+- the source files, to find files that changed since the load
+- optionally the environment, to find keys that were modified or unset
+  externally. This is only meaningful in a process that has the variables,
+  such as a shell that evaluated the hook script; load-dotenv itself sets
+  them only in its own short-lived process.
+
+An unchanged file costs one ``stat`` call. Only files whose fingerprint no
+longer matches are parsed again, to tell which keys are stale.
+"""
+
+import os
+from typing import Dict, List, Mapping, Optional
+
+from .fingerprint import sha256_file, sha256_text
+from .parser import RACY_WINDOW_NS
+from .tracker import Tracker
+
+
+class FileDrift:
+    """How a changed source file differs from what was loaded."""
+
+    def __init__(
+        self,
+        path: str,
+        missing: bool = False,
+        stale: Optional[List[str]] = None,
+        new: Optional[List[str]] = None,
+        removed: Optional[List[str]] = None,
+        error: Optional[str] = None,
+    ):
+        """Initialize the drift record.
+
+        Args:
+            path: The source file
+            missing: True if the file no longer exists
+            stale: Loaded keys whose value in the file is now different
+            new: Keys the file now sets that weren't loaded
+            removed: Loaded keys the file no longer sets
+            error: Why the file couldn't be resolved, if it couldn't
+        """
+        self.path = path
+        self.missing = missing
+        self.stale = stale or []
+        self.new = new or []
+        self.removed = removed or []
+        self.error = error
+
+
+class StatusReport:
+    """Result of check_status()."""
+
+    def __init__(self, tracked: int, files: int):
+        """Initialize an empty report.
+
+        Args:
+            tracked: Number of tracked variables
+            files: Number of source files with fingerprints
+        """
+        self.tracked = tracked
+        self.files = files
+        self.changed_files: List[FileDrift] = []
+        self.modified_keys: List[str] = []
+        self.unset_keys: List[str] = []
+
+    @property
+    def clean(self) -> bool:
+        """Whether everything still matches."""
+        return not (self.changed_files or self.modified_keys or self.unset_keys)
+
+
+def check_status(
+    tracker: Tracker,
+    environ: Optional[Mapping[str, str]] = None,
+    check_env: bool = False,
+) -> StatusReport:
+    """Compare a tracker's loaded state with its source files and the environment.
+
+    Args:
+        tracker: Tracker with its state loaded
+        environ: Environment the files were resolved against, and the one
+            checked with check_env (default: os.environ)
+        check_env: If True, also report loaded keys modified or unset in
+            ``environ``
+
+    Returns:
+        StatusReport listing changed files and, with check_env, externally
+        modified keys
+    """
+    if environ is None:
+        environ = os.environ
+
+    report = StatusReport(len(tracker.loaded_vars), len(tracker.sources))
+
+    # Later loads win, so apply the records in the order they were made
+    expected: Dict[str, str] = {}
+    for path, record in sorted(tracker.sources.items(), key=lambda item: item[1]['recorded_ns']):
+        expected.update(record['keys'])
+        drift = _file_drift(path, record, tracker, environ)
+        if drift is not None:
+            report.changed_files.append(drift)
+
+    if not check_env:
+        return report
+
+    for key in sorted(expected):
+        if key not in tracker.loaded_vars:
+            continue
+        value = environ.get(key)
+        if value is None:
+            report.unset_keys.append(key)
+        elif sha256_text(value) != expected[key]:
+            report.modified_keys.append(key)
+
+    return report
+
+
+def _unchanged(path: str, record: Mapping) -> bool:
+    """Check a file against its recorded fingerprint, hashing only if needed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size != record['size']:
+        return False
+    # An mtime inside the racy window of the recording could hide a later
+    # write with the same mtime, so only trust it outside that window
+    racy = record['recorded_ns'] - record['mtime_ns'] <= RACY_WINDOW_NS
+    if st.st_mtime_ns == record['mtime_ns'] and not racy:
+        return True
+    try:
+        return sha256_file(path) == record['sha256']
+    except OSError:
+        return False
+
+
+def _file_drift(
+    path: str, record: Mapping, tracker: Tracker, environ: Mapping[str, str]
+) -> Optional[FileDrift]:
+    """Work out which keys of a changed file are stale; None if it's unchanged."""
+    if not os.path.exists(path):
+        return FileDrift(path, missing=True)
+    if _unchanged(path, record):
+        return None
+
+    from .expansion import ExpansionError, resolve_variables
+    from .parser import ParseError, parse_path
+
+    # Resolve as the load did, against the environment it was loaded into
+    base = tracker.base_environment(path, environ)
+    try:
+        values = resolve_variables(parse_path(path), override=record['override'], env=base)
+    except (OSError, ParseError, ExpansionError, ValueError) as e:
+        return FileDrift(path, error=str(e))
+
+    loaded = record['keys']
+    return FileDrift(
+        path,
+        stale=sorted(k for k in loaded if k in values and sha256_text(values[k]) != loaded[k]),
+        new=sorted(k for k in values if k not in loaded),
+        removed=sorted(k for k in loaded if k not in values),
+    )
+
@@ -0,0 +1,219 @@
+"""Run a command and reload it when its .env files change.
+
+``dotenv-run --watch`` keeps a small supervisor process around the command.
+When a watched file changes, the environment is resolved again and compared
+key by key with the one the command is running with. If nothing changed,
+nothing happens. Otherwise the supervisor either:
+- restarts the command with the new environment (``--signal restart``), or
+- writes the change as JSON to the file named by DOTENV_DELTA_FILE in the
+  command's environment and sends it a signal (e.g. ``--signal HUP``)
+
+Bursts of changes, including edits to several files at once, are coalesced
+into one reload.
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .core import LoadDotenvError
+from .delta import EnvDelta, compute_delta
+from .expansion import ExpansionError
+from .runner import resolve_environment
+from .watcher import Watcher
+
+# Environment variable naming the delta file in signal mode
+DELTA_FILE_VAR = 'DOTENV_DELTA_FILE'
+
+# Reload mode that restarts the command instead of signalling it
+RESTART = 'restart'
+
+# Seconds the files must be quiet before a reload
+DEFAULT_DEBOUNCE = 0.5
+
+# Seconds to wait for the command to exit after SIGTERM before SIGKILL
+STOP_TIMEOUT = 10.0
+
+
+class Supervisor:
+    """Run a command under .env files and reload it on change."""
+
+    def __init__(
+        self,
+        env_files: Sequence[Path],
+        command: List[str],
+        override: bool = False,
+        reload_signal: str = RESTART,
+        debounce: float = DEFAULT_DEBOUNCE,
+        watcher: Optional[Watcher] = None,
+        log=None
+    ):
+        """Initialize the supervisor.
+
+        Args:
+            env_files: .env files, applied in order
+            command: Program and arguments
+            override: If True, override existing environment variables
+            reload_signal: RESTART, or a signal name such as 'HUP' or 'SIGUSR1'
+            debounce: Seconds the files must be quiet before a reload
+            watcher: Watcher to use (default: a new one)
+            log: Called with progress messages (default: print to stderr)
+
+        Raises:
+            ValueError: If reload_signal is not RESTART or a known signal
+        """
+        self.env_files = [Path(f).absolute() for f in env_files]
+        self.command = list(command)
+        self.override = override
+        self.signal = None if reload_signal == RESTART else parse_signal(reload_signal)
+        self.debounce = debounce
+        self._owns_watcher = watcher is None
+        self.watcher = watcher if watcher is not None else Watcher()
+        self.log = log or (lambda message: print(message, file=sys.stderr))
+
+        self.base_env = dict(os.environ)
+        self.env: Dict[str, str] = {}
+        self.delta_file: Optional[str] = None
+        self.child: Optional[subprocess.Popen] = None
+        self._changed = threading.Event()
+        self._stopping = False
+
+    def run(self) -> int:
+        """Run the command until it exits on its own or is interrupted.
+
+        Returns:
+            The command's exit code
+
+        Raises:
+            LoadDotenvError: If the .env files can't be loaded at startup
+            OSError: If the command can't be started
+        """
+        self.env = resolve_environment(self.env_files, self.override, self.base_env)
+        if self.signal is not None:
+            fd, self.delta_file = tempfile.mkstemp(prefix='dotenv-delta-', suffix='.json')
+            os.close(fd)
+            self._write_delta(EnvDelta())
+
+        previous_handlers = self._forward_signals()
+        try:
+            self._start()
+            for env_file in self.env_files:
+                self.watcher.add(env_file, self._on_change)
+            return self._loop()
+        finally:
+            for env_file in self.env_files:
+                self.watcher.remove(env_file, self._on_change)
+            if self._owns_watcher:
+                self.watcher.stop()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            if self.delta_file is not None:
+                try:
+                    os.unlink(self.delta_file)
+                except OSError:
+                    pass
+
+    def _on_change(self, path: Path) -> None:
+        self._changed.set()
+
+    def _loop(self) -> int:
+        while True:
+            if self._changed.wait(0.1):
+                # Wait for the burst of changes to settle
+                self._changed.clear()
+                while self._changed.wait(self.debounce):
+                    self._changed.clear()
+                if self.child.poll() is None and not self._stopping:
+                    self._reload()
+
+            code = self.child.poll()
+            if code is not None:
+                return code
+
+    def _reload(self) -> None:
+        try:
+            env = resolve_environment(self.env_files, self.override, self.base_env)
+        except (LoadDotenvError, ExpansionError) as e:
+            self.log(f"dotenv-run: keeping the current environment: {e}")
+            return
+
+        delta = compute_delta(self.env, env)
+        if not delta:
+            return
+        self.env = env
+
+        if self.signal is None:
+            self.log(f"dotenv-run: {len(delta)} variable(s) changed, restarting")
+            self._stop_child()
+            self._start()
+        else:
+            self.log(f"dotenv-run: {len(delta)} variable(s) changed, "
+                     f"sending {signal.Signals(self.signal).name}")
+            self._write_delta(delta)
+            self.child.send_signal(self.signal)
+
+    def _start(self) -> None:
+        env = dict(self.env)
+        if self.delta_file is not None:
+            env[DELTA_FILE_VAR] = self.delta_file
+        self.child = subprocess.Popen(self.command, env=env)
+
+    def _stop_child(self) -> None:
+        if self.child.poll() is not None:
+            return
+        self.child.terminate()
+        try:
+            self.child.wait(STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.child.kill()
+            self.child.wait()
+
+    def _write_delta(self, delta: EnvDelta) -> None:
+        """Replace the delta file atomically, so the command never sees half of it."""
+        directory = os.path.dirname(self.delta_file)
+        fd, tmp_path = tempfile.mkstemp(prefix='.dotenv-delta-', dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(delta.to_dict(), f)
+        os.replace(tmp_path, self.delta_file)
+
+    def _forward_signals(self) -> Dict[int, object]:
+        """Pass SIGINT and SIGTERM on to the command."""
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+
+        def forward(signum, frame):
+            self._stopping = True
+            if self.child is not None and self.child.poll() is None:
+                self.child.send_signal(signum)
+
+        previous = {}
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous[signum] = signal.signal(signum, forward)
+        return previous
+
+
+def parse_signal(name: str) -> int:
+    """Convert a signal name such as 'HUP' or 'SIGUSR1' to its number.
+
+    Args:
+        name: Signal name, with or without the SIG prefix
+
+    Returns:
+        The signal number
+
+    Raises:
+        ValueError: If the signal is unknown on this platform
+    """
+    name = name.upper()
+    if not name.startswith('SIG'):
+        name = 'SIG' + name
+    try:
+        return int(signal.Signals[name])
+    except KeyError:
+        raise ValueError(f"Unknown signal: {name}")
@@ -1,127 +1,510 @@
 """Track environment variables for load/unload operations.
 
 This module provides functionality to:
-- Snapshot the current environment state
+- Record the prior values of the variables it sets
 - Track which variables were loaded by load-dotenv
 - Persist tracking information across CLI invocations
 - Restore environment by unloading tracked variables
+
+The state may be shared by several processes at once. Updates hold a lock,
+merge with what is stored, and write the result in one step, so concurrent
+loaders neither corrupt it nor drop each other's variables. A '.db' state
+file keeps a separate state per session; see the state module.
+
+Every load is also appended to a journal with the prior values of the keys
+it changed, so the most recent load can be undone with pop() while earlier
+ones stay in place. Loading the same source twice in a row folds into one
+entry, and beyond MAX_JOURNAL entries the oldest are folded together, so
+the journal stays small.
 """
 
 import os
-import json
-import stat
+import time
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import Dict, Set, Optional, Tuple
+from typing import Dict, Iterable, List, Set, Optional, Tuple
+
+from .delta import EnvDelta
+from .fingerprint import sha256_text
+from .state import open_state_store
+
+# Journal entries kept before the oldest are folded together
+MAX_JOURNAL = 32
 
 
 class Tracker:
     """Track environment variables loaded by load-dotenv."""
 
-    def __init__(self, state_file: Path):
+    def __init__(self, state_file: Path, fsync: bool = False, session: Optional[str] = None):
         """Initialize the tracker.
 
         Args:
-            state_file: Path to the state file for persistence
+            state_file: Path to the state file for persistence; a '.db' file
+                keeps a separate state per session
+            fsync: If True, flush a JSON state file to disk on every save
+            session: Session name in a '.db' state file (default: the
+                current session)
+
+        Raises:
+            ValueError: If a session is given for a JSON state file
         """
-        self.state_file = state_file
+        self.state_file = Path(state_file)
+        self.store = open_state_store(self.state_file, session=session, fsync=fsync)
         self.loaded_vars: Set[str] = set()
         self.original_values: Dict[str, Optional[str]] = {}
+        # Loads, oldest first: {'id', 'source', 'prior': {key: value or None}}
+        self.journal: List[Dict] = []
+        # Loaded files: fingerprint, override, and a hash per key it set
+        self.sources: Dict[str, Dict] = {}
+        # Keys this tracker stopped tracking, so merging doesn't bring them back
+        self._removed: Set[str] = set()
+        # Journal changes not saved yet
+        self._pending: List[Dict] = []
+        self._popped: Set[int] = set()
+        self._pending_sources: Dict[str, Dict] = {}
+        self._dropped_sources: Set[str] = set()
+
+    def snapshot_environment(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Record the current values of keys that are about to be set.
+
+        Only keys not recorded yet are stored, so the first prior value
+        wins. Unset keys are recorded as None. Loading through the tracker
+        records touched keys automatically; this is for callers that change
+        os.environ themselves.
 
-    def snapshot_environment(self) -> None:
-        """Capture the current environment state.
+        Args:
+            keys: Names of the variables that will be changed (default:
+                every variable currently set, as before keys were accepted;
+                this stores the whole environment in the state file)
+        """
+        environ = os.environ
+        if keys is None:
+            keys = list(environ)
+        for key in keys:
+            if key not in self.original_values:
+                self.original_values[key] = environ.get(key)
+
+    def record_source(
+        self,
+        path: str,
+        fingerprint: Dict,
+        variables: Dict[str, str],
+        override: bool = False,
+    ) -> None:
+        """Remember the file a load comes from, for drift checks.
+
+        Only a hash of each value is stored. The record is saved with the
+        next load; call this just before load_variables().
 
-        This should be called before loading new variables.
+        Args:
+            path: Absolute path of the .env file
+            fingerprint: The file's fingerprint from
+                fingerprint.file_fingerprint(), taken before the file was read
+            variables: The variables loaded from it
+            override: Whether existing variables were overridden
         """
-        self.original_values = dict(os.environ)
+        record = {
+            'size': fingerprint['size'],
+            'mtime_ns': fingerprint['mtime_ns'],
+            'sha256': fingerprint['sha256'],
+            'recorded_ns': time.time_ns(),
+            'override': override,
+            'keys': {key: sha256_text(value) for key, value in variables.items()},
+        }
+        self.sources[path] = record
+        self._pending_sources[path] = record
+        self._dropped_sources.discard(path)
 
-    def load_variables(self, variables: Dict[str, str]) -> int:
-        """Load variables and track them.
+    def load_variables(self, variables: Dict[str, str], source: Optional[str] = None) -> int:
+        """Load variables, track them, and journal the load.
 
         Args:
             variables: Dictionary of variables to load
+            source: Where the variables came from, e.g. the .env file
 
         Returns:
             Number of variables actually loaded (new ones)
         """
+        self._push(variables, source)
+        loaded_count = self._set_variables(variables)
+
+        # Save state
+        self._save_state()
+
+        return loaded_count
+
+    async def aload_variables(
+        self,
+        variables: Dict[str, str],
+        executor: Optional[Executor] = None,
+        source: Optional[str] = None,
+    ) -> int:
+        """Load variables and track them without blocking the event loop.
+
+        The environment is updated on the event loop; the state file is
+        written in a worker thread.
+
+        Args:
+            variables: Dictionary of variables to load
+            executor: Executor for file I/O (default: the shared bounded pool)
+            source: Where the variables came from, e.g. the .env file
+
+        Returns:
+            Number of variables actually loaded (new ones)
+        """
+        from .aio import run_blocking
+
+        self._push(variables, source)
+        loaded_count = self._set_variables(variables)
+        await run_blocking(self._save_state, executor=executor)
+        return loaded_count
+
+    async def aload_state(self, executor: Optional[Executor] = None) -> bool:
+        """Load tracking state from file without blocking the event loop.
+
+        Args:
+            executor: Executor for file I/O (default: the shared bounded pool)
+
+        Returns:
+            True if state was loaded, False if no state file exists
+        """
+        from .aio import run_blocking
+
+        return await run_blocking(self.load_state, executor=executor)
+
+    def apply_variables(self, variables: Dict[str, str], prune: bool = False) -> EnvDelta:
+        """Apply variables to the environment, touching only what changed.
+
+        Keys whose current value already matches are left alone, so reloading
+        a large file where few keys changed costs only those few ``putenv``
+        calls. The state file is written once.
+
+        Args:
+            variables: The complete set of variables that should be loaded
+            prune: If True, also remove tracked variables that are no longer
+                in ``variables``
+
+        Returns:
+            EnvDelta of what was added, changed, and removed in os.environ
+        """
+        added = {}
+        changed = {}
+        removed = []
+
+        # Compare against the current environment first
+        for key, value in variables.items():
+            current = os.environ.get(key)
+            if current is None:
+                added[key] = value
+            elif current != value:
+                changed[key] = value
+
+        if prune:
+            removed = [key for key in self.loaded_vars if key not in variables]
+
+        self._set_variables(variables)
+        unset = []
+        for key in removed:
+            self.loaded_vars.discard(key)
+            self._removed.add(key)
+            original = self.original_values.pop(key, None)
+            if original is not None:
+                # Put back the value the variable had before it was loaded
+                if os.environ.get(key) != original:
+                    os.environ[key] = original
+                    changed[key] = original
+            elif os.environ.pop(key, None) is not None:
+                unset.append(key)
+
+        self._save_state()
+
+        return EnvDelta(added, changed, unset)
+
+    def base_environment(
+        self, source: str, environ: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """Get the environment a source was loaded into.
+
+        The keys loaded from the source are put back to their prior values,
+        so resolving the file again against the result behaves like the
+        original load (``?=`` and non-override assignments aren't blocked
+        by the tool's own earlier values).
+
+        Args:
+            source: Source recorded with record_source()
+            environ: Current environment (default: os.environ)
+
+        Returns:
+            A new dictionary
+        """
+        base = dict(os.environ if environ is None else environ)
+        record = self.sources.get(source)
+        for key in (record['keys'] if record else ()):
+            original = self.original_values.get(key)
+            if original is None:
+                base.pop(key, None)
+            else:
+                base[key] = original
+        return base
+
+    def reload(
+        self,
+        source: str,
+        variables: Dict[str, str],
+        fingerprint: Dict,
+        override: bool = False,
+    ) -> EnvDelta:
+        """Replace what was loaded from a source with its new values.
+
+        The new values are compared with the hashes recorded for the
+        source's last load rather than with os.environ, so only keys whose
+        value actually changed in the file are set, and keys the file no
+        longer sets get their prior values back (or are removed). The
+        tracker state is written once.
+
+        Args:
+            source: Absolute path of the .env file
+            variables: The file's newly resolved variables
+            fingerprint: The file's fingerprint, taken before it was read
+            override: Whether existing variables were overridden
+
+        Returns:
+            EnvDelta of what to add, change, and remove; removed keys with a
+            prior value are also in its ``restored``
+        """
+        record = self.sources.get(source)
+        previous = record['keys'] if record else {}
+
+        added = {key: value for key, value in variables.items() if key not in previous}
+        changed = {
+            key: value for key, value in variables.items()
+            if key in previous and sha256_text(value) != previous[key]
+        }
+        removed = [key for key in previous if key not in variables]
+
+        self._push(dict(added, **changed), source, removed)
+        self._set_variables(dict(added, **changed))
+
+        environ = os.environ
+        restored = {}
+        for key in removed:
+            self.loaded_vars.discard(key)
+            self._removed.add(key)
+            original = self.original_values.pop(key, None)
+            if original is not None:
+                restored[key] = original
+                if environ.get(key) != original:
+                    environ[key] = original
+            else:
+                environ.pop(key, None)
+
+        self.record_source(source, fingerprint, variables, override)
+        self._save_state()
+
+        return EnvDelta(added, changed, removed, restored)
+
+    def _set_variables(self, variables: Dict[str, str]) -> int:
+        """Set variables in the environment and track them.
+
+        The prior value of each newly tracked variable is recorded, so it
+        can be restored on unload. Variables that already have the requested
+        value are not set again.
+
+        Args:
+            variables: Dictionary of variables to set
+
+        Returns:
+            Number of newly tracked variables
+        """
         loaded_count = 0
+        environ = os.environ
 
         for key, value in variables.items():
+            self._removed.discard(key)
             # Store original value if not already tracked
             if key not in self.loaded_vars:
                 self.loaded_vars.add(key)
+                self.original_values.setdefault(key, environ.get(key))
                 loaded_count += 1
 
-            # Set the environment variable
-            os.environ[key] = value
-
-        # Save state
-        self._save_state()
+            # Set the environment variable only if it differs
+            if environ.get(key) != value:
+                environ[key] = value
 
         return loaded_count
 
+    def _push(
+        self, variables: Dict[str, str], source: Optional[str], removed: Iterable[str] = ()
+    ) -> None:
+        """Journal the prior values of the keys a load is about to touch."""
+        environ = os.environ
+        prior = {
+            key: environ.get(key) for key, value in variables.items()
+            if key not in self.loaded_vars or environ.get(key) != value
+        }
+        for key in removed:
+            prior[key] = environ.get(key)
+        if prior:
+            entry = {'id': None, 'source': source, 'prior': prior}
+            self.journal.append(entry)
+            self._pending.append(entry)
+
+    def pop(self) -> Optional[Dict]:
+        """Undo the most recent load.
+
+        Every key the load touched gets its prior value back, or is removed
+        if it had none. Keys no earlier load touched stop being tracked.
+
+        Returns:
+            The journal entry that was undone, or None if there is none
+        """
+        if not self.journal:
+            return None
+
+        entry = self.journal.pop()
+        if entry['id'] is None:
+            # Not saved yet
+            self._pending = [e for e in self._pending if e is not entry]
+        else:
+            self._popped.add(entry['id'])
+
+        environ = os.environ
+        for key, prior in entry['prior'].items():
+            if prior is None:
+                environ.pop(key, None)
+            elif environ.get(key) != prior:
+                environ[key] = prior
+
+        still_loaded = set()
+        for earlier in self.journal:
+            still_loaded.update(earlier['prior'])
+        source = entry['source']
+        if source in self.sources and all(e['source'] != source for e in self.journal):
+            del self.sources[source]
+            self._pending_sources.pop(source, None)
+            self._dropped_sources.add(source)
+        for key in entry['prior']:
+            if key not in still_loaded:
+                self.loaded_vars.discard(key)
+                self.original_values.pop(key, None)
+                self._removed.add(key)
+
+        self._save_state()
+        return entry
+
     def unload_all(self) -> int:
         """Unload all tracked variables.
 
+        Variables that had a value before they were loaded get it back;
+        the others are removed.
+
         Returns:
-            Number of variables unloaded
+            Number of variables unloaded or restored
         """
         unloaded_count = 0
+        environ = os.environ
 
         for key in list(self.loaded_vars):
-            if key in os.environ:
-                del os.environ[key]
+            original = self.original_values.get(key)
+            if original is not None:
+                if environ.get(key) != original:
+                    environ[key] = original
+                    unloaded_count += 1
+            elif key in environ:
+                del environ[key]
                 unloaded_count += 1
 
         # Clear tracking
         self.loaded_vars.clear()
         self.original_values.clear()
+        self.journal.clear()
+        self.sources.clear()
+        self._removed.clear()
+        self._pending.clear()
+        self._popped.clear()
+        self._pending_sources.clear()
+        self._dropped_sources.clear()
 
-        # Clear state file
-        if self.state_file.exists():
-            self.state_file.unlink()
+        # Clear state
+        self.store.clear()
 
         return unloaded_count
 
     def _save_state(self) -> None:
-        """Save tracking state to file.
+        """Save tracking state.
 
-        Creates the directory if needed and sets restrictive permissions.
+        The stored state is read and merged with this tracker's in one
+        locked step: variables tracked by other processes are kept, and
+        original values already stored win, since they were recorded first.
         """
-        # Create directory if it doesn't exist
-        self.state_file.parent.mkdir(parents=True, exist_ok=True)
-
-        state = {
-            'loaded_vars': list(self.loaded_vars),
+        self.store.update(self._merge_state)
+
+    def _merge_state(self, stored: Optional[Dict]) -> Dict:
+        """Merge the stored state into this tracker's and return the result."""
+        unpacked = _unpack_state(stored)
+        journal: List[Dict] = []
+        sources: Dict[str, Dict] = {}
+        seq = 0
+        if unpacked is not None:
+            loaded_vars, original_values, journal, seq, sources = unpacked
+            self.loaded_vars |= loaded_vars - self._removed
+            merged = dict(self.original_values)
+            merged.update(original_values)
+            self.original_values = {
+                key: value for key, value in merged.items()
+                if key not in self._removed
+            }
+
+        # Entries popped here go; entries pushed here are appended
+        journal = [entry for entry in journal if entry['id'] not in self._popped]
+        for entry in self._pending:
+            seq += 1
+            entry['id'] = seq
+            last = journal[-1] if journal else None
+            if last is not None and entry['source'] is not None and last['source'] == entry['source']:
+                journal[-1] = _fold(last, entry)
+            else:
+                journal.append(entry)
+        while len(journal) > MAX_JOURNAL:
+            journal[:2] = [_fold(journal[0], journal[1])]
+
+        # Files recorded here replace the stored records
+        sources.update(self._pending_sources)
+        for path in self._dropped_sources:
+            sources.pop(path, None)
+
+        self.journal = journal
+        self.sources = sources
+        self._pending = []
+        self._popped.clear()
+        self._pending_sources = {}
+        self._dropped_sources.clear()
+
+        return {
+            'loaded_vars': sorted(self.loaded_vars),
             'original_values': self.original_values,
+            'journal': journal,
+            'seq': seq,
+            'sources': sources,
         }
 
-        # Write state file
-        with open(self.state_file, 'w') as f:
-            json.dump(state, f)
-
-        # Set restrictive permissions (owner read/write only)
-        os.chmod(self.state_file, stat.S_IRUSR | stat.S_IWUSR)
-
     def load_state(self) -> bool:
-        """Load tracking state from file.
+        """Load tracking state.
 
         Returns:
-            True if state was loaded, False if no state file exists
+            True if state was loaded, False if there is none
         """
-        if not self.state_file.exists():
+        state = _unpack_state(self.store.read())
+        if state is None:
             return False
 
-        try:
-            with open(self.state_file, 'r') as f:
-                state = json.load(f)
-
-            self.loaded_vars = set(state.get('loaded_vars', []))
-            self.original_values = state.get('original_values', {})
-
-            return True
-        except (json.JSONDecodeError, KeyError, IOError):
-            # If state file is corrupted, ignore it
-            return False
+        self.loaded_vars, self.original_values, self.journal, _seq, self.sources = state
+        self._removed.clear()
+        self._pending.clear()
+        self._popped.clear()
+        self._pending_sources.clear()
+        self._dropped_sources.clear()
+        return True
 
     def get_loaded_variables(self) -> Dict[str, str]:
         """Get currently loaded variables.
@@ -153,3 +536,34 @@ class Tracker:
             Tuple of (count of loaded variables, set of variable names)
         """
         return len(self.loaded_vars), self.loaded_vars.copy()
+
+
+def _unpack_state(
+    state: Optional[Dict]
+) -> Optional[Tuple[Set[str], Dict[str, Optional[str]], List[Dict], int, Dict[str, Dict]]]:
+    """Split stored state into (loaded variables, original values, journal, seq, sources).
+
+    Returns None for missing or malformed state, which the next save replaces.
+    """
+    if state is None:
+        return None
+    try:
+        journal = [
+            {'id': int(entry['id']), 'source': entry.get('source'), 'prior': dict(entry['prior'])}
+            for entry in state.get('journal', [])
+        ]
+        sources = {str(path): dict(record) for path, record in state.get('sources', {}).items()}
+        return (set(state.get('loaded_vars', [])), dict(state.get('original_values', {})),
+                journal, int(state.get('seq', 0)), sources)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _fold(older: Dict, newer: Dict) -> Dict:
+    """Combine two consecutive journal entries into one.
+
+    Popping the result undoes both; the older prior value of a key wins.
+    """
+    prior = dict(newer['prior'])
+    prior.update(older['prior'])
+    return {'id': newer['id'], 'source': newer['source'], 'prior': prior}
@@ -0,0 +1,376 @@
+"""Watch .env files for changes.
+
+This module provides:
+- Watcher, a single background thread serving many watched files
+- An inotify backend on Linux, with a stat-polling fallback elsewhere
+- Debouncing, so a burst of editor writes triggers one callback
+
+Callbacks only fire when a file's stat signature (inode, size, mtime)
+actually changed, so attribute-only events are ignored.
+"""
+
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# Seconds to wait for writes to settle before firing callbacks
+DEFAULT_DEBOUNCE = 0.1
+
+# Seconds between stat calls when inotify isn't available
+DEFAULT_POLL_INTERVAL = 0.5
+
+# inotify event flags (see inotify(7))
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM
+    | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct('iIII')
+
+Signature = Optional[Tuple[int, int, int]]
+
+
+def stat_signature(path: Path) -> Signature:
+    """Get a cheap change signature for a file.
+
+    Args:
+        path: File path
+
+    Returns:
+        Tuple of (inode, size, mtime_ns), or None if the file doesn't exist
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class _PollingBackend:
+    """Detect changes by periodically comparing stat signatures."""
+
+    name = 'polling'
+
+    def __init__(self, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._signatures: Dict[Path, Signature] = {}
+        self._wake_r, self._wake_w = os.pipe()
+
+    def add(self, path: Path) -> None:
+        self._signatures[path] = stat_signature(path)
+
+    def remove(self, path: Path) -> None:
+        self._signatures.pop(path, None)
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        if timeout is None or timeout > self.poll_interval:
+            timeout = self.poll_interval
+        ready, _, _ = select.select([self._wake_r], [], [], timeout)
+        if ready:
+            os.read(self._wake_r, 4096)
+
+        changed = set()
+        for path, signature in list(self._signatures.items()):
+            current = stat_signature(path)
+            if current != signature:
+                self._signatures[path] = current
+                changed.add(path)
+        return changed
+
+    def wakeup(self) -> None:
+        os.write(self._wake_w, b'x')
+
+    def close(self) -> None:
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+
+class _InotifyBackend:
+    """Detect changes with Linux inotify.
+
+    Parent directories are watched rather than the files themselves, so
+    editors that save by writing a new file and renaming it are handled.
+    """
+
+    name = 'inotify'
+
+    def __init__(self, libc):
+        self._libc = libc
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError("inotify_init1 failed")
+        self._wake_r, self._wake_w = os.pipe()
+        self._dirs: Dict[Path, int] = {}
+        self._wds: Dict[int, Path] = {}
+        self._files: Dict[Path, Set[str]] = {}
+
+    def add(self, path: Path) -> None:
+        directory = path.parent
+        if directory not in self._dirs:
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(str(directory)), _WATCH_MASK
+            )
+            if wd < 0:
+                raise OSError(f"Cannot watch directory: {directory}")
+            self._dirs[directory] = wd
+            self._wds[wd] = directory
+        self._files.setdefault(directory, set()).add(path.name)
+
+    def remove(self, path: Path) -> None:
+        directory = path.parent
+        names = self._files.get(directory)
+        if not names:
+            return
+        names.discard(path.name)
+        if not names:
+            del self._files[directory]
+            wd = self._dirs.pop(directory)
+            del self._wds[wd]
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        ready, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready:
+            os.read(self._wake_r, 4096)
+        if self._fd not in ready:
+            return set()
+
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            directory = self._wds.get(wd)
+            if directory is None or not name:
+                continue
+            name = os.fsdecode(name)
+            if name in self._files.get(directory, ()):
+                changed.add(directory / name)
+        return changed
+
+    def wakeup(self) -> None:
+        os.write(self._wake_w, b'x')
+
+    def close(self) -> None:
+        os.close(self._fd)
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+
+def _load_inotify():
+    """Load libc with inotify support.
+
+    Returns:
+        The libc handle, or None if inotify is unavailable
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+def _create_backend(backend: Optional[str], poll_interval: float):
+    """Create a change-detection backend.
+
+    Args:
+        backend: 'inotify', 'polling', or None to pick the best available
+        poll_interval: Seconds between polls for the polling backend
+
+    Returns:
+        Backend instance
+    """
+    if backend not in (None, 'inotify', 'polling'):
+        raise ValueError(f"Unknown watch backend: {backend}")
+
+    if backend != 'polling':
+        libc = _load_inotify()
+        if libc is not None:
+            try:
+                return _InotifyBackend(libc)
+            except OSError:
+                # e.g. inotify instance limit reached
+                pass
+        if backend == 'inotify':
+            raise OSError("inotify is not available on this system")
+
+    return _PollingBackend(poll_interval)
+
+
+class Watcher:
+    """Watch many files from a single background thread."""
+
+    def __init__(
+        self,
+        debounce: float = DEFAULT_DEBOUNCE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        backend: Optional[str] = None,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            debounce: Seconds a file must be quiet before callbacks fire
+            poll_interval: Seconds between polls for the polling backend
+            backend: 'inotify', 'polling', or None to pick the best available
+        """
+        self.debounce = debounce
+        self._backend = _create_backend(backend, poll_interval)
+        self._callbacks: Dict[Path, List[Callable[[Path], None]]] = {}
+        self._signatures: Dict[Path, Signature] = {}
+        self._pending: Dict[Path, float] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    @property
+    def backend(self) -> str:
+        """Name of the change-detection backend in use."""
+        return self._backend.name
+
+    def add(self, path: Path, callback: Callable[[Path], None]) -> None:
+        """Watch a file and call ``callback(path)`` when it changes.
+
+        The watcher thread is started on first use.
+
+        Args:
+            path: File to watch (it doesn't have to exist yet)
+            callback: Called from the watcher thread with the changed path
+        """
+        path = Path(path).absolute()
+        with self._lock:
+            if path not in self._callbacks:
+                self._backend.add(path)
+                self._signatures[path] = stat_signature(path)
+                self._callbacks[path] = []
+            self._callbacks[path].append(callback)
+        self.start()
+
+    def remove(self, path: Path, callback: Optional[Callable[[Path], None]] = None) -> None:
+        """Stop watching a file.
+
+        Args:
+            path: File being watched
+            callback: Callback to remove (default: all callbacks for the file)
+        """
+        path = Path(path).absolute()
+        with self._lock:
+            callbacks = self._callbacks.get(path)
+            if callbacks is None:
+                return
+            if callback is not None and callback in callbacks:
+                callbacks.remove(callback)
+            if callback is None or not callbacks:
+                del self._callbacks[path]
+                self._signatures.pop(path, None)
+                self._pending.pop(path, None)
+                self._backend.remove(path)
+
+    def start(self) -> None:
+        """Start the watcher thread if it isn't running."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name='dotenv-tools-watcher', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watcher thread and release its resources."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._backend.wakeup()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._backend.close()
+
+    def __enter__(self) -> 'Watcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while self._running:
+            timeout = None
+            if self._pending:
+                timeout = max(0.0, min(self._pending.values()) - time.monotonic())
+
+            changed = self._backend.wait(timeout)
+            if not self._running:
+                break
+
+            now = time.monotonic()
+            with self._lock:
+                for path in changed:
+                    if path in self._callbacks:
+                        self._pending[path] = now + self.debounce
+
+                due = [p for p, deadline in self._pending.items() if deadline <= now]
+                fire = []
+                for path in due:
+                    del self._pending[path]
+                    signature = stat_signature(path)
+                    if signature != self._signatures.get(path):
+                        self._signatures[path] = signature
+                        fire.append((path, list(self._callbacks.get(path, []))))
+
+            for path, callbacks in fire:
+                for callback in callbacks:
+                    try:
+                        callback(path)
+                    except Exception:
+                        # A failing callback must not stop the watcher
+                        traceback.print_exc()
+
+
+_default_watcher: Optional[Watcher] = None
+_default_watcher_lock = threading.Lock()
+
+
+def get_default_watcher() -> Watcher:
+    """Get the shared watcher used by LoadDotenv.watch().
+
+    Returns:
+        The process-wide Watcher instance
+    """
+    global _default_watcher
+
+    with _default_watcher_lock:
+        if _default_watcher is None:
+            _default_watcher = Watcher()
+        return _default_watcher
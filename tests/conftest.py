@@ -0,0 +1,47 @@
+"""Shared fixtures for the test suite."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = str(Path(__file__).resolve().parent.parent / 'src')
+CLI = [sys.executable, '-c', 'from dotenv_tools.cli import cli; cli()']
+
+
+@pytest.fixture
+def cli_runner(tmp_path, monkeypatch):
+    """Invoke dotenv-tools commands in-process, from tmp_path.
+
+    Yields a function taking the command line and optional extra environment
+    variables (None removes one) and returning click's Result. Variables the
+    commands set in os.environ are removed again afterwards.
+    """
+    from click.testing import CliRunner
+
+    from dotenv_tools.cli import cli
+
+    monkeypatch.chdir(tmp_path)
+    saved = dict(os.environ)
+    runner = CliRunner()
+    yield lambda args, **env: runner.invoke(cli, args, env=env)
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+@pytest.fixture
+def run_cli():
+    """Run dotenv-tools commands in a subprocess.
+
+    Only for commands that exec, supervise, or signal other processes, where
+    running in the test process is not possible. Returns a function taking
+    the command line, working directory, and extra environment variables,
+    and returning the CompletedProcess.
+    """
+    def run(args, cwd, **extra_env):
+        env = dict(os.environ, PYTHONPATH=SRC, **extra_env)
+        return subprocess.run(CLI + args, cwd=str(cwd), env=env,
+                              capture_output=True, text=True, timeout=60)
+    return run
@@ -0,0 +1,181 @@
+"""Tests for the asyncio API."""
+
+import asyncio
+import time
+
+import pytest
+
+from dotenv_tools import aio, core
+from dotenv_tools.core import (
+    LoadDotenv, LoadDotenvFileNotFound, afind_dotenv_file
+)
+from dotenv_tools.tracker import Tracker
+
+
+def _slow_read(monkeypatch, delay):
+    """Make reading a .env file block for ``delay`` seconds."""
+    original = core.parse_path
+
+    def slow(path):
+        time.sleep(delay)
+        return original(path)
+
+    monkeypatch.setattr(core, 'parse_path', slow)
+
+
+async def _max_loop_stall(coro, interval=0.005):
+    """Run ``coro`` while ticking the loop; return (result, max stall)."""
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            stalls.append(now - last - interval)
+            last = now
+
+    tick = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    try:
+        result = await coro
+    finally:
+        done.set()
+        await tick
+    return result, max(stalls)
+
+
+class TestAload:
+    """Test async loading."""
+
+    def test_aload_matches_sync(self, tmp_path):
+        """Test that aload returns the same result as load."""
+        env_file = tmp_path / '.env'
+        env_file.write_text(
+            'A=one\nB:=${A}-two\nC?=${B}\nD+=x\nexport E="quoted ${A}"\n'
+        )
+        env = {'D': 'pre-'}
+
+        sync = LoadDotenv(env_file).load(env=env)
+        result = asyncio.run(aio.aload(env_file, env=env))
+
+        assert result == sync
+        assert result['D'] == 'pre-x'
+
+    def test_aload_method(self, tmp_path):
+        """Test LoadDotenv.aload populates parsed variables."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('KEY=value\n')
+
+        loader = LoadDotenv(env_file)
+        result = asyncio.run(loader.aload(env={}))
+
+        assert result == {'KEY': 'value'}
+        assert loader.get_variables() == {'KEY': ('=', 'value')}
+
+    def test_aload_file_not_found(self, tmp_path):
+        """Test that a missing file raises the sync exception."""
+        with pytest.raises(LoadDotenvFileNotFound):
+            asyncio.run(aio.aload(tmp_path / 'missing.env'))
+
+    def test_aload_does_not_block_loop(self, tmp_path, monkeypatch):
+        """Test that a slow read does not stall the event loop."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('KEY=value\n')
+        _slow_read(monkeypatch, 0.2)
+
+        result, stall = asyncio.run(
+            _max_loop_stall(aio.aload(env_file, env={}))
+        )
+
+        assert result == {'KEY': 'value'}
+        assert stall < 0.1
+
+
+class TestAresolveMany:
+    """Test concurrent loading of several files."""
+
+    def _write_files(self, tmp_path, count):
+        files = []
+        for i in range(count):
+            env_file = tmp_path / f'{i}.env'
+            env_file.write_text(f'INDEX={i}\nNAME=file-${{INDEX}}\n')
+            files.append(env_file)
+        return files
+
+    def test_results_in_order(self, tmp_path):
+        """Test that results match the sync path, in input order."""
+        files = self._write_files(tmp_path, 5)
+
+        results = asyncio.run(aio.aresolve_many(files, env={}))
+
+        assert results == [LoadDotenv(f).load(env={}) for f in files]
+
+    def test_reads_run_concurrently(self, tmp_path, monkeypatch):
+        """Test that slow reads overlap and don't block the loop."""
+        files = self._write_files(tmp_path, 4)
+        _slow_read(monkeypatch, 0.2)
+
+        start = time.perf_counter()
+        results, stall = asyncio.run(
+            _max_loop_stall(aio.aresolve_many(files, env={}, max_concurrency=4))
+        )
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 4
+        assert elapsed < 0.6
+        assert stall < 0.1
+
+    def test_error_propagates(self, tmp_path):
+        """Test that a missing file fails the whole batch."""
+        files = self._write_files(tmp_path, 2) + [tmp_path / 'missing.env']
+
+        with pytest.raises(LoadDotenvFileNotFound):
+            asyncio.run(aio.aresolve_many(files, env={}))
+
+    def test_cancellation(self, tmp_path, monkeypatch):
+        """Test that cancelling the batch raises CancelledError."""
+        files = self._write_files(tmp_path, 3)
+        _slow_read(monkeypatch, 0.2)
+
+        async def run():
+            task = asyncio.ensure_future(aio.aresolve_many(files, env={}))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+
+    def test_invalid_concurrency(self, tmp_path):
+        """Test that max_concurrency must be positive."""
+        with pytest.raises(ValueError):
+            asyncio.run(aio.aresolve_many([], max_concurrency=0))
+
+
+class TestAsyncDiscoveryAndTracker:
+    """Test async discovery and tracker persistence."""
+
+    def test_afind_dotenv_file(self, tmp_path):
+        """Test async discovery searches parent directories."""
+        (tmp_path / '.env').write_text('KEY=value\n')
+        nested = tmp_path / 'a' / 'b'
+        nested.mkdir(parents=True)
+
+        found = asyncio.run(afind_dotenv_file(nested))
+
+        assert found == (tmp_path / '.env').resolve()
+
+    def test_tracker_async_roundtrip(self, tmp_path):
+        """Test async tracker write and read."""
+        state_file = tmp_path / 'state.json'
+        tracker = Tracker(state_file)
+
+        count = asyncio.run(tracker.aload_variables({'AIO_VAR': 'value'}))
+
+        restored = Tracker(state_file)
+        assert count == 1
+        assert asyncio.run(restored.aload_state())
+        assert restored.is_tracked('AIO_VAR')
+        tracker.unload_all()
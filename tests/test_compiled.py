@@ -0,0 +1,117 @@
+"""Tests for compiling .env files to Python modules."""
+
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from dotenv_tools import compiled
+from dotenv_tools.cli import cli
+from dotenv_tools.compiled import compile_dotenv, default_output, load_compiled, read_compiled
+from dotenv_tools.core import LoadDotenv
+
+
+@pytest.fixture
+def env_file(tmp_path):
+    path = tmp_path / '.env.production'
+    path.write_text(
+        'HOST=localhost\n'
+        'URL=http://${HOST}:${PORT:-80}\n'
+        'QUOTED="it\'s \\"here\\""\n'
+        'export EXPORTED=1\n'
+    )
+    return path
+
+
+class TestCompileDotenv:
+    """Test generating and loading compiled modules."""
+
+    def test_default_output(self):
+        """Test the generated module name."""
+        assert default_output(Path('/app/.env')) == Path('/app/dotenv_env.py')
+        assert default_output(Path('/app/.env.production')) == Path(
+            '/app/dotenv_env_production.py')
+
+    def test_module_is_byte_compiled(self, env_file):
+        """Test that compiling writes a module and its .pyc."""
+        module = compile_dotenv(env_file)
+
+        assert module == default_output(env_file)
+        assert list((module.parent / '__pycache__').glob('dotenv_env_production.*.pyc'))
+
+    def test_variables_are_frozen(self, env_file):
+        """Test that the module's mapping is read-only."""
+        module = compile_dotenv(env_file)
+        namespace = {}
+        exec(module.read_text(), namespace)
+
+        with pytest.raises(TypeError):
+            namespace['VARIABLES']['HOST'] = ('=', 'changed')
+
+    def test_load_matches_parsing(self, env_file):
+        """Test that compiled loads resolve exactly like LoadDotenv."""
+        compile_dotenv(env_file)
+
+        for env in ({}, {'PORT': '8080', 'HOST': 'preset'}):
+            assert load_compiled(env_file, env=env) == LoadDotenv(env_file).load(env=env)
+            assert load_compiled(env_file, override=True, env=env) == \
+                LoadDotenv(env_file).load(override=True, env=env)
+
+    def test_load_skips_parsing(self, env_file, monkeypatch):
+        """Test that a valid module is used without parsing the source."""
+        compile_dotenv(env_file)
+
+        def fail(path):
+            raise AssertionError('source was parsed')
+
+        monkeypatch.setattr(compiled, 'parse_path', fail)
+
+        assert load_compiled(env_file, env={})['HOST'] == 'localhost'
+
+    def test_changed_source_falls_back(self, env_file):
+        """Test that an edited source is parsed instead of the stale module."""
+        compile_dotenv(env_file)
+        env_file.write_text('HOST=changed\n')
+
+        assert read_compiled(default_output(env_file), env_file) is None
+        assert load_compiled(env_file, env={}) == {'HOST': 'changed'}
+
+    def test_touched_source_uses_hash(self, env_file):
+        """Test that an mtime-only change is accepted after hashing."""
+        compile_dotenv(env_file)
+        os.utime(env_file, (1_000_000_000, 1_000_000_000))
+
+        assert read_compiled(default_output(env_file), env_file) is not None
+
+    def test_missing_source_trusts_module(self, env_file, tmp_path):
+        """Test that a module shipped without its source still loads."""
+        module = compile_dotenv(env_file, tmp_path / 'out' / 'settings_env.py')
+        env_file.unlink()
+
+        assert load_compiled(env_file, module, env={})['HOST'] == 'localhost'
+
+    def test_missing_module_falls_back(self, env_file):
+        """Test loading without a compiled module."""
+        assert load_compiled(env_file, env={})['HOST'] == 'localhost'
+
+
+class TestCompileCommand:
+    """Test the compile-dotenv command."""
+
+    def test_compile_command(self, env_file, tmp_path):
+        """Test compiling through the CLI."""
+        output = tmp_path / 'settings_env.py'
+
+        result = CliRunner().invoke(cli, ['compile-dotenv', str(env_file), '-o', str(output)])
+
+        assert result.exit_code == 0
+        assert output.exists()
+        assert read_compiled(output, env_file)['HOST'] == ('=', 'localhost')
+
+    def test_compile_missing_file(self, tmp_path):
+        """Test compiling a file that doesn't exist."""
+        result = CliRunner().invoke(cli, ['compile-dotenv', str(tmp_path / 'missing')])
+
+        assert result.exit_code != 0
+        assert 'File not found' in result.output
@@ -0,0 +1,102 @@
+"""Tests for temporarily applying .env files."""
+
+import os
+
+import pytest
+
+import dotenv_tools
+from dotenv_tools.context import applied, apply_delta, restore
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('CTX_EXISTING', 'original')
+    monkeypatch.delenv('CTX_NEW', raising=False)
+    path = tmp_path / '.env.test'
+    path.write_text('CTX_EXISTING=replaced\nCTX_NEW=added\n')
+    return path
+
+
+class TestApplied:
+    """Test the applied() context manager and decorator."""
+
+    def test_context_manager(self, env_file):
+        """Test that values are applied and restored exactly."""
+        before = dict(os.environ)
+
+        with applied(str(env_file), override=True) as values:
+            assert values == {'CTX_EXISTING': 'replaced', 'CTX_NEW': 'added'}
+            assert os.environ['CTX_EXISTING'] == 'replaced'
+            assert os.environ['CTX_NEW'] == 'added'
+
+        assert dict(os.environ) == before
+
+    def test_without_override(self, env_file):
+        """Test that existing variables are kept by default."""
+        with applied(str(env_file)):
+            assert os.environ['CTX_EXISTING'] == 'original'
+            assert os.environ['CTX_NEW'] == 'added'
+
+        assert 'CTX_NEW' not in os.environ
+
+    def test_restores_on_error(self, env_file):
+        """Test that an exception in the block still restores."""
+        with pytest.raises(RuntimeError):
+            with applied(str(env_file), override=True):
+                raise RuntimeError
+
+        assert os.environ['CTX_EXISTING'] == 'original'
+        assert 'CTX_NEW' not in os.environ
+
+    def test_decorator(self, env_file):
+        """Test use as a decorator, including recursion into the same instance."""
+        @applied(str(env_file), override=True)
+        def check(depth):
+            assert os.environ['CTX_NEW'] == 'added'
+            if depth:
+                check(depth - 1)
+            assert os.environ['CTX_NEW'] == 'added'
+
+        check(2)
+
+        assert 'CTX_NEW' not in os.environ
+
+    def test_nesting(self, env_file, tmp_path):
+        """Test that nested blocks restore level by level."""
+        inner_file = tmp_path / '.env.inner'
+        inner_file.write_text('CTX_NEW=inner\n')
+
+        with applied(str(env_file), override=True):
+            with applied(str(inner_file), override=True):
+                assert os.environ['CTX_NEW'] == 'inner'
+            assert os.environ['CTX_NEW'] == 'added'
+            assert os.environ['CTX_EXISTING'] == 'replaced'
+
+        assert os.environ['CTX_EXISTING'] == 'original'
+        assert 'CTX_NEW' not in os.environ
+
+    def test_missing_file(self, tmp_path):
+        """Test that an explicit missing path raises."""
+        with pytest.raises(FileNotFoundError):
+            with applied(str(tmp_path / 'missing.env')):
+                pass
+
+    def test_package_export(self):
+        """Test that applied is exported from the package."""
+        assert dotenv_tools.applied is applied
+
+
+class TestApplyDelta:
+    """Test recording only touched keys."""
+
+    def test_unchanged_keys_are_not_recorded(self, monkeypatch):
+        """Test that keys that already match are left out."""
+        monkeypatch.setenv('CTX_SAME', 'value')
+        monkeypatch.delenv('CTX_NEW', raising=False)
+
+        saved = apply_delta({'CTX_SAME': 'value', 'CTX_NEW': 'x'})
+
+        assert saved == {'CTX_NEW': None}
+        restore(saved)
+        assert 'CTX_NEW' not in os.environ
+        assert os.environ['CTX_SAME'] == 'value'
@@ -1,7 +1,12 @@
 """Tests for the core module."""
 
+import os
 import tempfile
+import threading
 from pathlib import Path
+from types import MappingProxyType
+
+import pytest
 
 from src.dotenv_tools.core import LoadDotenv, find_dotenv_file, LoadDotenvError
 
@@ -153,3 +158,79 @@ class TestFindDotenvFile:
                 pass  # Expected
             finally:
                 os.chdir(old_cwd)
+
+
+class TestThreadSafety:
+    """Test sharing a loader between threads."""
+
+    def test_snapshot_is_read_only(self, tmp_path):
+        """Test that load() publishes an immutable snapshot."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('KEY1=value1\n')
+        loader = LoadDotenv(env_file)
+
+        assert loader.snapshot == {}
+        result = loader.load(env={})
+
+        assert isinstance(loader.snapshot, MappingProxyType)
+        assert loader.snapshot == result == {'KEY1': 'value1'}
+        with pytest.raises(TypeError):
+            loader.snapshot['KEY1'] = 'changed'
+
+        result['KEY1'] = 'changed'
+        assert loader.snapshot['KEY1'] == 'value1'
+
+    def test_reload_swaps_snapshot(self, tmp_path):
+        """Test that a reload replaces the snapshot instead of mutating it."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('KEY1=old\n')
+        loader = LoadDotenv(env_file)
+        loader.load(env={})
+        old = loader.snapshot
+
+        env_file.write_text('KEY1=new\nKEY2=added\n')
+        loader.load(env={})
+
+        assert old == {'KEY1': 'old'}
+        assert loader.snapshot == {'KEY1': 'new', 'KEY2': 'added'}
+
+    def test_load_does_not_modify_env(self, tmp_path):
+        """Test that := defaults don't leak into the caller's env."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('URL=${HOST:=localhost}\n')
+        env = {}
+
+        assert LoadDotenv(env_file).load(env=env) == {'URL': 'localhost'}
+        assert env == {}
+
+    def test_concurrent_loads(self, tmp_path):
+        """Test loading from many threads while the file is rewritten."""
+        env_file = tmp_path / '.env'
+        versions = [f'VERSION={i}\nCOPY=${{VERSION}}\n' for i in range(20)]
+        env_file.write_text(versions[0])
+        loader = LoadDotenv(env_file)
+        errors = []
+
+        def reader():
+            try:
+                for _ in range(200):
+                    snapshot = loader.snapshot
+                    assert snapshot.get('COPY') == snapshot.get('VERSION')
+                    loader.load(env={})
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for version in versions[1:]:
+            # Replace atomically, like an editor saving the file
+            staging = tmp_path / '.env.tmp'
+            staging.write_text(version)
+            os.replace(staging, env_file)
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        loader.load(env={})
+        assert loader.snapshot == {'VERSION': '19', 'COPY': '19'}
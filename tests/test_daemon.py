@@ -0,0 +1,223 @@
+"""Tests for the resolution daemon and its client."""
+
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+from dotenv_tools import client
+from dotenv_tools.client import SOCKET_ENV_VAR, default_socket_path, resolve, resolve_file
+from dotenv_tools.core import LoadDotenvFileNotFound
+from dotenv_tools.daemon import DaemonError, DaemonServer
+
+PRINT_ENV = [sys.executable, '-c', 'import os, sys; print(os.environ[sys.argv[1]])']
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'),
+                                reason="requires Unix domain sockets")
+
+
+def _age(path, seconds=10):
+    """Move a file's mtime out of the racy window."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = DaemonServer(str(tmp_path / 'd.sock'))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+class TestClient:
+    """Test resolving through the daemon."""
+
+    def test_resolve(self, server, tmp_path):
+        """Test that the daemon resolves against the client's environment."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('HOST=localhost\nURL=http://${HOST}:${PORT}\n')
+
+        values = resolve(env_file, env={'PORT': '80'}, socket_path=server.server_address)
+
+        assert values == {'HOST': 'localhost', 'URL': 'http://localhost:80'}
+
+    def test_keys(self, server, tmp_path):
+        """Test that only the requested keys are returned."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\nB=2\n')
+
+        values = resolve(env_file, env={}, keys=['B', 'C'],
+                         socket_path=server.server_address)
+
+        assert values == {'B': '2'}
+
+    def test_missing_file(self, server, tmp_path):
+        """Test that a missing file raises the in-process exception."""
+        with pytest.raises(LoadDotenvFileNotFound):
+            resolve(tmp_path / 'missing.env', env={}, socket_path=server.server_address)
+
+    def test_results_shared_across_unrelated_environments(self, server, tmp_path):
+        """Test that only variables the file depends on key the cache."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('URL=http://${HOST}\n')
+        _age(env_file)
+
+        for env in ({'HOST': 'a', 'X': '1'}, {'HOST': 'a', 'X': '2'}, {'HOST': 'b'}):
+            resolve(env_file, env=env, socket_path=server.server_address)
+
+        entry = server.resolver._entries[str(env_file)]
+        assert len(entry.results) == 2
+
+    def test_chained_reference_keys_the_cache(self, server, tmp_path):
+        """Test that variables referenced through another variable key the cache."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('X=${A}\n')
+        _age(env_file)
+
+        first = server.resolver.resolve(str(env_file), env={'A': '${B}', 'B': '1'})
+        second = server.resolver.resolve(str(env_file), env={'A': '${B}', 'B': '2'})
+
+        assert first == {'X': '1'}
+        assert second == {'X': '2'}
+
+    def test_change_is_picked_up(self, server, tmp_path):
+        """Test that an edited file is never served stale."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('VALUE=old\n')
+        _age(env_file)
+        assert resolve(env_file, env={}, socket_path=server.server_address) == \
+            {'VALUE': 'old'}
+
+        env_file.write_text('VALUE=new-value\n')
+
+        assert resolve(env_file, env={}, socket_path=server.server_address) == \
+            {'VALUE': 'new-value'}
+
+    def test_no_daemon(self, tmp_path):
+        """Test that the client reports an unreachable daemon as None."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        socket_path = str(tmp_path / 'none.sock')
+
+        assert resolve(env_file, env={}, socket_path=socket_path) is None
+        assert client.request({'op': 'ping'}, socket_path='') is None
+
+    def test_sends_only_needed_environment(self, server, tmp_path, monkeypatch):
+        """Test that only variables the file depends on leave the client."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('URL=http://${HOST}\n')
+        sent = []
+        dispatch = server.dispatch
+        monkeypatch.setattr(server, 'dispatch', lambda m: sent.append(m) or dispatch(m))
+
+        values = resolve(env_file, env={'HOST': '${NAME}.local', 'NAME': 'db', 'SECRET': 's'},
+                         socket_path=server.server_address)
+
+        assert values == {'URL': 'http://db.local'}
+        assert sent[-1]['env'] == {'HOST': '${NAME}.local', 'NAME': 'db'}
+
+    def test_untrusted_socket_is_ignored(self, server, tmp_path):
+        """Test that a socket others can use is treated as no daemon."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        os.chmod(server.server_address, 0o666)
+
+        assert resolve(env_file, env={}, socket_path=server.server_address) is None
+        assert client.request({'op': 'ping'}, socket_path=server.server_address) is None
+
+    def test_socket_in_shared_directory_is_ignored(self, server, tmp_path):
+        """Test that a socket in a directory others can write to is ignored."""
+        tmp_path.chmod(0o777)
+        try:
+            assert client.request({'op': 'ping'}, socket_path=server.server_address) is None
+        finally:
+            tmp_path.chmod(0o700)
+
+    def test_default_socket_is_in_private_directory(self, monkeypatch):
+        """Test the fallback socket path when XDG_RUNTIME_DIR is unset."""
+        monkeypatch.delenv(SOCKET_ENV_VAR, raising=False)
+        monkeypatch.delenv('XDG_RUNTIME_DIR', raising=False)
+
+        assert default_socket_path() == f'/tmp/dotenv-tools-{os.getuid()}/daemon.sock'
+
+    def test_resolve_file_fallback(self, tmp_path, monkeypatch):
+        """Test in-process resolution when the daemon is disabled."""
+        monkeypatch.setenv(SOCKET_ENV_VAR, '')
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+
+        assert default_socket_path() is None
+        assert resolve_file(env_file, env={}) == {'A': '1'}
+
+
+class TestServer:
+    """Test daemon lifecycle."""
+
+    def test_ping(self, server):
+        """Test the ping operation."""
+        assert client.request({'op': 'ping'}, socket_path=server.server_address) == \
+            {'pid': os.getpid()}
+
+    def test_socket_permissions(self, server):
+        """Test that only the owner can connect."""
+        assert os.stat(server.server_address).st_mode & 0o777 == 0o600
+
+    def test_already_running(self, server):
+        """Test that a second daemon on the same socket is refused."""
+        with pytest.raises(DaemonError):
+            DaemonServer(server.server_address)
+
+    def test_stale_socket_is_replaced(self, tmp_path):
+        """Test that a socket left by a dead daemon is removed."""
+        socket_path = str(tmp_path / 'stale.sock')
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        server = DaemonServer(socket_path)
+        server.server_close()
+
+        assert not os.path.exists(socket_path)
+
+    def test_creates_private_directory(self, tmp_path):
+        """Test that the socket directory is created owner-only."""
+        server = DaemonServer(str(tmp_path / 'run' / 'd.sock'))
+        server.server_close()
+
+        assert (tmp_path / 'run').stat().st_mode & 0o777 == 0o700
+
+    def test_refuses_shared_directory(self, tmp_path):
+        """Test that the daemon won't listen in a directory others can write to."""
+        shared = tmp_path / 'shared'
+        shared.mkdir()
+        shared.chmod(0o777)
+
+        with pytest.raises(DaemonError):
+            DaemonServer(str(shared / 'd.sock'))
+
+    def test_refuses_non_socket(self, tmp_path):
+        """Test that a file squatting on the socket path is not removed."""
+        squatter = tmp_path / 'd.sock'
+        squatter.write_text('')
+
+        with pytest.raises(DaemonError):
+            DaemonServer(str(squatter))
+        assert squatter.exists()
+
+    def test_dotenv_run_uses_daemon(self, server, tmp_path, run_cli):
+        """Test that dotenv-run resolves through a running daemon."""
+        env_file = tmp_path / 'app.env'
+        env_file.write_text('GREETING=hello\n')
+        _age(env_file)
+
+        result = run_cli(['dotenv-run', '-f', str(env_file), '--'] + PRINT_ENV + ['GREETING'],
+                         tmp_path, **{SOCKET_ENV_VAR: server.server_address})
+
+        assert result.stdout == 'hello\n'
+        assert str(env_file) in server.resolver._entries
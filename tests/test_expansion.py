@@ -5,6 +5,8 @@ from src.dotenv_tools.expansion import (
     expand_variables,
     expand_immediate,
     ExpansionError,
+    dependent_keys,
+    environment_closure,
 )
 
 
@@ -109,3 +111,22 @@ class TestExpandImmediate:
         # This should not expand because env is empty
         result = expand_immediate("${VAR}", env)
         assert result == "${VAR}"
+
+
+class TestDependentKeys:
+    """Test finding the variables a resolution reads."""
+
+    def test_assigned_and_referenced(self):
+        """Test that assigned keys and references are included."""
+        variables = {
+            'export URL': ('=', 'http://${HOST}:${PORT:-80}'),
+            'PATH': ('+=', ':/opt/bin'),
+        }
+
+        assert dependent_keys(variables) == {'URL', 'HOST', 'PORT', 'PATH'}
+
+    def test_closure_follows_values(self):
+        """Test that references inside environment values are followed."""
+        env = {'A': '${B}', 'B': '${C:-x}', 'C': '${A}', 'D': '1'}
+
+        assert environment_closure({'A', 'MISSING'}, env) == {'A', 'B', 'C', 'MISSING'}
@@ -0,0 +1,185 @@
+"""Tests for the load-dotenv shell hook."""
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from dotenv_tools import hook
+
+SRC = str(Path(__file__).resolve().parent.parent / 'src')
+
+
+def _apply(script, environ):
+    """Apply a bash hook script to a dict, like eval would."""
+    import shlex
+
+    for statement in script.split(';\n'):
+        words = shlex.split(statement.rstrip(';'))
+        if not words:
+            continue
+        if words[0] == 'unset':
+            environ.pop(words[1], None)
+        else:
+            key, value = words[1].split('=', 1)
+            environ[key] = value
+    return environ
+
+
+class TestHookScript:
+    """Test script generation."""
+
+    def test_first_run_exports(self, tmp_path):
+        """Test that the first run exports the file's variables."""
+        env_file = tmp_path / '.env'
+        env_file.write_text("A=1\nB='it''s'\n")
+
+        script = hook.build_script('bash', str(env_file), environ={})
+        environ = _apply(script, {})
+
+        assert environ['A'] == '1'
+        assert environ[hook.HOOK_FINGERPRINT_VAR] == hook.file_fingerprint(str(env_file))
+        assert hook.is_fresh(str(env_file), environ)
+
+    def test_unchanged_file_emits_nothing(self, tmp_path):
+        """Test that a second run without changes is empty."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        environ = _apply(hook.build_script('bash', str(env_file), environ={}), {})
+
+        assert hook.build_script('bash', str(env_file), environ=environ) == ''
+
+    def test_change_emits_only_delta(self, tmp_path):
+        """Test that only changed and removed keys are emitted."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\nB=2\nC=3\n')
+        environ = _apply(hook.build_script('bash', str(env_file), environ={}), {})
+
+        env_file.write_text('A=1\nB=20\n')
+        os.utime(env_file, ns=(0, 10 ** 18))
+        script = hook.build_script('bash', str(env_file), environ=environ)
+
+        assert 'A=' not in script
+        assert "export B='20';" in script
+        assert 'unset C;' in script
+
+    def test_leaving_directory_restores(self, tmp_path, monkeypatch):
+        """Test that leaving the directory unsets and restores variables."""
+        project = tmp_path / 'project'
+        project.mkdir()
+        (project / '.env').write_text('NEW=1\nPATH_LIKE:=${PATH_LIKE}:extra\n')
+        outside = tmp_path / 'outside'
+        outside.mkdir()
+        original = {'PATH_LIKE': '/bin'}
+
+        monkeypatch.chdir(project)
+        environ = _apply(hook.build_script('bash', environ=dict(original)), dict(original))
+        assert environ['PATH_LIKE'] == '/bin:extra'
+
+        monkeypatch.chdir(outside)
+        if hook.find_env_file() is not None:
+            pytest.skip('a .env file exists above the temporary directory')
+        environ = _apply(hook.build_script('bash', environ=environ), environ)
+
+        assert environ == original
+
+    def test_reapply_does_not_stack(self, tmp_path):
+        """Test that appends are applied against the original value."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('P+=:x\n')
+        environ = _apply(hook.build_script('bash', str(env_file), environ={'P': 'a'}), {'P': 'a'})
+
+        os.utime(env_file, ns=(0, 10 ** 18))
+        environ = _apply(hook.build_script('bash', str(env_file), environ=environ), environ)
+
+        assert environ['P'] == 'a:x'
+
+    def test_expansion_error(self, tmp_path, monkeypatch, capsys):
+        """Test that an expansion error is reported without a traceback."""
+        (tmp_path / '.env').write_text('B=${A}\n')
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv('A', '${A}x')
+        monkeypatch.setenv('DOTENV_TOOLS_SOCKET', '')
+        monkeypatch.delenv(hook.HOOK_FINGERPRINT_VAR, raising=False)
+
+        with pytest.raises(SystemExit) as exc_info:
+            hook.main(['--hook', 'bash'])
+
+        assert exc_info.value.code == 1
+        assert 'Error expanding variables' in capsys.readouterr().err
+
+    def test_quoting(self):
+        """Test quoting for each shell."""
+        assert hook.quote('bash', "a'b") == "'a'\\''b'"
+        assert hook.quote('fish', "a'b\\") == "'a\\'b\\\\'"
+        assert hook.render_script('fish', {'A': '1'}, ['B']) == "set -e B;\nset -gx A '1';"
+
+
+class TestHookFastPath:
+    """Test the stat-only fast path."""
+
+    def test_parse_hook_args(self):
+        """Test which command lines take the fast path."""
+        assert hook._parse_hook_args(['--hook', 'zsh']) == {'shell': 'zsh', 'file': None}
+        assert hook._parse_hook_args(['--hook=fish', '-o', 'x.env']) == {
+            'shell': 'fish', 'file': 'x.env'}
+        assert hook._parse_hook_args(['--hook', 'csh']) is None
+        assert hook._parse_hook_args(['--verbose', '--hook', 'bash']) is None
+        assert hook._parse_hook_args(['x.env']) is None
+
+    def test_fast_path_latency(self, tmp_path):
+        """Test that the freshness check stays well under 5ms."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        environ = {hook.HOOK_FINGERPRINT_VAR: hook.file_fingerprint(str(env_file))}
+
+        timings = []
+        for _ in range(50):
+            start = time.perf_counter()
+            assert hook.is_fresh(str(env_file), environ)
+            timings.append(time.perf_counter() - start)
+
+        assert sorted(timings)[len(timings) // 2] < 0.005
+
+    def test_fast_path_skips_heavy_imports(self, tmp_path):
+        """Test that a fresh hook run imports neither click nor the parser."""
+        (tmp_path / '.env').write_text('A=1\n')
+        env = dict(os.environ, PYTHONPATH=SRC)
+        env[hook.HOOK_FINGERPRINT_VAR] = hook.file_fingerprint(str(tmp_path / '.env'))
+        code = (
+            "import sys; sys.argv = ['load-dotenv', '--hook', 'bash']\n"
+            "from dotenv_tools.hook import main; main()\n"
+            "heavy = ['click', 'dotenv_tools.parser', 'dotenv_tools.expansion']\n"
+            "print(sorted(m for m in heavy if m in sys.modules))\n"
+        )
+
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=str(tmp_path), env=env,
+            capture_output=True, text=True, check=True,
+        )
+
+        assert result.stdout.strip() == '[]'
+
+    @pytest.mark.skipif(shutil.which('bash') is None, reason='bash not available')
+    def test_bash_eval_roundtrip(self, tmp_path):
+        """Test the hook end to end through bash eval."""
+        (tmp_path / '.env').write_text('GREETING="hello world"\n')
+        env = dict(os.environ, PYTHONPATH=SRC)
+        env.pop(hook.HOOK_FINGERPRINT_VAR, None)
+        env.pop(hook.HOOK_STATE_VAR, None)
+        run_hook = f"{sys.executable} -c 'from dotenv_tools.hook import main; main()' --hook bash"
+        script = (
+            f'eval "$({run_hook})"; echo "$GREETING"; '
+            f'out="$({run_hook})"; echo "second:[$out]"'
+        )
+
+        result = subprocess.run(
+            ['bash', '-c', script], cwd=str(tmp_path), env=env,
+            capture_output=True, text=True, check=True,
+        )
+
+        assert result.stdout.splitlines() == ['hello world', 'second:[]']
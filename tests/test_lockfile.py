@@ -0,0 +1,188 @@
+"""Tests for .env lockfiles."""
+
+import json
+import os
+
+from dotenv_tools import lockfile
+from dotenv_tools.lockfile import (
+    create_lock, default_lock_path, load_locked, read_lock, write_lock
+)
+
+
+def _age(path, seconds=10):
+    """Move a file's mtime into the past."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+class TestCreateLock:
+    """Test building lock data."""
+
+    def test_lock_contents(self, tmp_path):
+        """Test values, sources and environment dependencies."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('HOST=localhost\nURL=http://${HOST}:${PORT}\n')
+
+        lock = create_lock(env_file, env={'PORT': '80'})
+
+        assert lock['values'] == {'HOST': 'localhost', 'URL': 'http://localhost:80'}
+        assert list(lock['sources']) == ['.env']
+        assert lock['sources']['.env']['size'] == env_file.stat().st_size
+        assert sorted(lock['environment']) == ['HOST', 'PORT', 'URL']
+        assert lock['environment']['HOST'] is None
+        assert lock['environment']['PORT'] is not None
+
+    def test_output_is_deterministic(self, tmp_path):
+        """Test that rewriting an unchanged file gives identical bytes."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('B=2\nA=1\n')
+
+        first = write_lock(env_file, env={}).read_bytes()
+        os.utime(env_file)
+        second = write_lock(env_file, env={}).read_bytes()
+
+        assert first == second
+        assert list(json.loads(first)['values']) == ['A', 'B']
+
+    def test_lock_keeps_env_file_permissions(self, tmp_path):
+        """Test that the lockfile is no more readable than its .env file."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('PASSWORD=${DB_PASSWORD}\n')
+        env_file.chmod(0o600)
+
+        lock_path = write_lock(env_file, env={'DB_PASSWORD': 'hunter2'})
+
+        assert lock_path.stat().st_mode & 0o777 == 0o600
+
+    def test_default_lock_path(self, tmp_path):
+        """Test that .lock is appended to the file name."""
+        assert default_lock_path(tmp_path / '.env.production') == \
+            tmp_path / '.env.production.lock'
+
+
+class TestLoadLocked:
+    """Test verifying and using lockfiles."""
+
+    def _locked(self, tmp_path, content='KEY=value\n', env=None):
+        env_file = tmp_path / '.env'
+        env_file.write_text(content)
+        _age(env_file)
+        write_lock(env_file, env=env or {})
+        return env_file
+
+    def test_current_lock(self, tmp_path):
+        """Test that a current lockfile returns the locked values."""
+        env_file = self._locked(tmp_path)
+
+        assert load_locked(env_file, env={}) == {'KEY': 'value'}
+
+    def test_missing_or_invalid_lock(self, tmp_path):
+        """Test that missing and corrupt lockfiles are ignored."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('KEY=value\n')
+        assert load_locked(env_file, env={}) is None
+
+        default_lock_path(env_file).write_text('{not json')
+        assert read_lock(default_lock_path(env_file)) is None
+        assert load_locked(env_file, env={}) is None
+
+    def test_edited_source_is_stale(self, tmp_path):
+        """Test that changing the .env file invalidates the lock."""
+        env_file = self._locked(tmp_path)
+        env_file.write_text('KEY=other\n')
+
+        assert load_locked(env_file, env={}) is None
+
+    def test_environment_change_is_stale(self, tmp_path):
+        """Test that a changed referenced variable invalidates the lock."""
+        env_file = self._locked(tmp_path, 'URL=http://${HOST}\n', env={'HOST': 'a'})
+
+        assert load_locked(env_file, env={'HOST': 'a'}) == {'URL': 'http://a'}
+        assert load_locked(env_file, env={'HOST': 'b'}) is None
+        assert load_locked(env_file, env={}) is None
+
+    def test_chained_reference_change_is_stale(self, tmp_path):
+        """Test that a variable referenced through another one invalidates the lock."""
+        env_file = self._locked(tmp_path, 'X=${A}\n', env={'A': '${B}', 'B': '1'})
+
+        assert load_locked(env_file, env={'A': '${B}', 'B': '1'}) == {'X': '1'}
+        assert load_locked(env_file, env={'A': '${B}', 'B': '2'}) is None
+
+    def test_assigned_key_in_environment_is_stale(self, tmp_path):
+        """Test that setting a locked key in the environment invalidates the lock."""
+        env_file = self._locked(tmp_path)
+
+        assert load_locked(env_file, env={'KEY': 'preset'}) is None
+
+    def test_override_mode_must_match(self, tmp_path):
+        """Test that a lock is only used with the override mode it was made for."""
+        env_file = self._locked(tmp_path)
+
+        assert load_locked(env_file, override=True, env={}) is None
+
+    def test_touched_source_falls_back_to_hash(self, tmp_path, monkeypatch):
+        """Test that a newer mtime with unchanged content still verifies."""
+        env_file = self._locked(tmp_path)
+        os.utime(env_file)
+        calls = []
+        original = lockfile.sha256_file
+        monkeypatch.setattr(lockfile, 'sha256_file',
+                            lambda path: calls.append(path) or original(path))
+
+        assert load_locked(env_file, env={}) == {'KEY': 'value'}
+        assert len(calls) == 1
+
+    def test_old_source_skips_hash(self, tmp_path, monkeypatch):
+        """Test that an unchanged older source is verified with stat only."""
+        env_file = self._locked(tmp_path)
+        monkeypatch.setattr(lockfile, 'sha256_file', lambda path: 1 / 0)
+
+        assert load_locked(env_file, env={}) == {'KEY': 'value'}
+
+    def test_same_size_edit_is_detected(self, tmp_path):
+        """Test that a same-size edit after locking is caught by the hash."""
+        env_file = self._locked(tmp_path)
+        env_file.write_text('KEY=VALUE\n')
+
+        assert load_locked(env_file, env={}) is None
+
+
+class TestLockCommand:
+    """Test lock-dotenv and load-dotenv with lockfiles."""
+
+    def test_lock_and_check(self, tmp_path, cli_runner):
+        """Test writing and checking a lockfile from the CLI."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('LOCKED_KEY=value\n')
+
+        result = cli_runner(['lock-dotenv', '.env'])
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / '.env.lock').exists()
+
+        assert cli_runner(['lock-dotenv', '--check']).exit_code == 0
+
+        env_file.write_text('LOCKED_KEY=changed\n')
+        result = cli_runner(['lock-dotenv', '--check'])
+        assert result.exit_code == 1
+        assert 'out of date' in result.output
+
+    def test_load_dotenv_uses_lock(self, tmp_path, cli_runner):
+        """Test that load-dotenv takes values from a current lockfile."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('LOCKED_NAME=value\n')
+        _age(env_file)
+        lock_path = write_lock(env_file, env={})
+        lock = json.loads(lock_path.read_text())
+        lock['values']['LOCKED_NAME'] = 'from-lock'
+        lock_path.write_text(json.dumps(lock))
+        state_file = tmp_path / 'state.json'
+
+        result = cli_runner(['load-dotenv', '.env', '--state-file', str(state_file), '-v'])
+        assert 'Using lockfile' in result.output
+        assert 'LOCKED_NAME = from-lock' in result.output
+
+        # From a fresh shell, without the first load's variables
+        result = cli_runner(['load-dotenv', '.env', '--state-file', str(state_file),
+                             '--no-lock', '-v'], LOCKED_NAME=None)
+        assert 'Using lockfile' not in result.output
+        assert 'LOCKED_NAME = value' in result.output
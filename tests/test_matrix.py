@@ -0,0 +1,137 @@
+"""Tests for running a command under many .env files."""
+
+import io
+import os
+import sys
+import time
+
+from dotenv_tools.matrix import (
+    MatrixResult, expand_matrix, format_summary, resolve_matrix, run_matrix
+)
+
+PRINT_TENANT = [sys.executable, '-c', 'import os; print("tenant", os.environ["TENANT"])']
+
+
+def _tenants(tmp_path, names):
+    envs = tmp_path / 'envs'
+    envs.mkdir()
+    for name in names:
+        (envs / f'{name}.env').write_text(f'TENANT={name}\nURL=${{BASE_URL}}/{name}\n')
+    return envs
+
+
+class TestResolveMatrix:
+    """Test expanding and resolving matrix files."""
+
+    def test_expand_matrix(self, tmp_path):
+        """Test that patterns are expanded, sorted and de-duplicated."""
+        envs = _tenants(tmp_path, ['b', 'a'])
+
+        files = expand_matrix([str(envs / '*.env'), str(envs / 'a.env')])
+
+        assert files == [str(envs / 'a.env'), str(envs / 'b.env')]
+
+    def test_common_files(self, tmp_path):
+        """Test that each matrix file is resolved on top of the common files."""
+        envs = _tenants(tmp_path, ['a', 'b'])
+        common = tmp_path / 'common.env'
+        common.write_text('BASE_URL=https://example.com\n')
+
+        results = resolve_matrix(expand_matrix([str(envs / '*.env')]), [common],
+                                 environ={'KEEP': '1'})
+
+        assert [r['URL'] for r in results] == ['https://example.com/a',
+                                               'https://example.com/b']
+        assert all(r['KEEP'] == '1' for r in results)
+
+
+class TestRunMatrix:
+    """Test running the command."""
+
+    def test_prefixed_output_and_results(self):
+        """Test that output lines carry the label and results keep order."""
+        out = io.BytesIO()
+        runs = [('a.env', dict(os.environ, TENANT='a')),
+                ('b.env', dict(os.environ, TENANT='b'))]
+
+        results = run_matrix(runs, PRINT_TENANT, jobs=2, out=out)
+
+        lines = sorted(out.getvalue().decode().splitlines())
+        assert lines == ['[a.env] tenant a', '[b.env] tenant b']
+        assert [(r.label, r.returncode) for r in results] == [('a.env', 0), ('b.env', 0)]
+
+    def test_runs_in_parallel(self):
+        """Test that -j bounds but allows concurrency."""
+        sleep = [sys.executable, '-c', 'import time; time.sleep(0.5)']
+        runs = [(str(i), dict(os.environ)) for i in range(4)]
+
+        start = time.monotonic()
+        results = run_matrix(runs, sleep, jobs=4, out=io.BytesIO())
+        elapsed = time.monotonic() - start
+
+        assert all(r.ok for r in results)
+        assert elapsed < 1.5
+
+    def test_missing_command(self):
+        """Test that a command that can't start is reported as 127."""
+        out = io.BytesIO()
+
+        results = run_matrix([('a', {})], ['no-such-command-dotenv-tools'], out=out)
+
+        assert results[0].returncode == 127
+        assert b'[a] Cannot run' in out.getvalue()
+
+    def test_format_summary(self):
+        """Test the summary table."""
+        summary = format_summary([MatrixResult('a.env', 0, 1.5),
+                                  MatrixResult('b.env', 3, 0.25)])
+
+        assert 'a.env' in summary and '1.50s' in summary
+        assert summary.splitlines()[-1] == '1 passed, 1 failed'
+
+
+class TestMatrixCommand:
+    """Test dotenv-run --matrix."""
+
+    def test_matrix(self, tmp_path, cli_runner):
+        """Test a matrix run end to end."""
+        _tenants(tmp_path, ['a', 'b', 'c'])
+
+        result = cli_runner(['dotenv-run', '--matrix', 'envs/*.env', '-j', '2', '--']
+                            + PRINT_TENANT)
+
+        assert result.exit_code == 0, result.output
+        assert sorted(result.stdout.splitlines()) == [
+            '[envs/a.env] tenant a', '[envs/b.env] tenant b', '[envs/c.env] tenant c',
+        ]
+        assert '3 passed, 0 failed' in result.output
+
+    def test_failure_exit_code(self, tmp_path, cli_runner):
+        """Test that any failing run fails the whole matrix."""
+        _tenants(tmp_path, ['a', 'b'])
+        fail_b = [sys.executable, '-c',
+                  'import os; raise SystemExit(os.environ["TENANT"] == "b")']
+
+        result = cli_runner(['dotenv-run', '--matrix', 'envs/*.env', '--'] + fail_b)
+
+        assert result.exit_code == 1
+        assert '1 passed, 1 failed' in result.output
+
+    def test_no_matches(self, tmp_path, cli_runner):
+        """Test that a pattern without matches is an error."""
+        result = cli_runner(['dotenv-run', '--matrix', 'envs/*.env', '--', 'true'])
+
+        assert result.exit_code == 1
+        assert 'No .env files match' in result.output
+
+    def test_expansion_error(self, tmp_path, cli_runner):
+        """Test that expansion errors are reported without a traceback."""
+        envs = tmp_path / 'envs'
+        envs.mkdir()
+        (envs / 'a.env').write_text('X=${MATRIX_Y}\n')
+
+        result = cli_runner(['dotenv-run', '--matrix', 'envs/*.env', '--', 'true'],
+                            MATRIX_Y='${MATRIX_Y}x')
+
+        assert result.exit_code == 1
+        assert 'Error expanding variables' in result.output
@@ -1,9 +1,13 @@
 """Tests for the parser module."""
 
+import os
+
 import pytest
+from src.dotenv_tools import parser
 from src.dotenv_tools.parser import (
     parse_line,
     parse_file_to_dict,
+    parse_path,
     ParseError,
 )
 
@@ -131,3 +135,64 @@ class TestParseFileToDict:
         assert "KEY2" in result
         assert result["KEY1"] == ("=", "value1")
         assert result["KEY2"] == ("=", "value2")
+
+
+class TestParsePath:
+    """Test parsing files through the parse cache."""
+
+    def _write_old(self, path, content):
+        """Write a file with an mtime outside the racy window."""
+        path.write_text(content)
+        os.utime(path, (1_000_000_000, 1_000_000_000))
+
+    def test_parse_path(self, tmp_path):
+        """Test parsing a file from disk."""
+        env_file = tmp_path / '.env'
+        self._write_old(env_file, 'A=1\nB:=2\n')
+
+        assert parse_path(env_file) == {'A': ('=', '1'), 'B': (':=', '2')}
+
+    def test_unchanged_file_is_cached(self, tmp_path, monkeypatch):
+        """Test that an unchanged file is not parsed again."""
+        env_file = tmp_path / '.env'
+        self._write_old(env_file, 'A=1\n')
+        parse_path(env_file)
+
+        def fail(content):
+            raise AssertionError('file was parsed again')
+
+        monkeypatch.setattr(parser, 'parse_file_to_dict', fail)
+
+        assert parse_path(env_file) == {'A': ('=', '1')}
+
+    def test_changed_file_is_parsed_again(self, tmp_path):
+        """Test that a modified file is not served from the cache."""
+        env_file = tmp_path / '.env'
+        self._write_old(env_file, 'A=1\n')
+        parse_path(env_file)
+
+        env_file.write_text('A=2\n')
+        os.utime(env_file, (2_000_000_000, 2_000_000_000))
+
+        assert parse_path(env_file) == {'A': ('=', '2')}
+
+    def test_recently_modified_file_is_not_cached(self, tmp_path):
+        """Test that a file inside the racy window is always re-read."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        parse_path(env_file)
+        mtime = os.stat(env_file).st_mtime_ns
+
+        env_file.write_text('A=2\n')
+        os.utime(env_file, ns=(mtime, mtime))
+
+        assert parse_path(env_file) == {'A': ('=', '2')}
+
+    def test_result_is_a_copy(self, tmp_path):
+        """Test that callers can't modify the cached result."""
+        env_file = tmp_path / '.env'
+        self._write_old(env_file, 'A=1\n')
+
+        parse_path(env_file)['A'] = ('=', 'changed')
+
+        assert parse_path(env_file) == {'A': ('=', '1')}
@@ -0,0 +1,190 @@
+"""Tests for the pytest plugin."""
+
+import os
+from importlib import metadata
+
+import pytest
+
+from dotenv_tools.pytest_plugin import DotenvCache
+
+pytest_plugins = ['pytester']
+
+
+def _plugin_args():
+    """Load the plugin explicitly unless its entry point is installed."""
+    try:
+        entry_points = metadata.entry_points().select(group='pytest11')
+    except AttributeError:  # Python < 3.10
+        entry_points = metadata.entry_points().get('pytest11', [])
+    if any(ep.value == 'dotenv_tools.pytest_plugin' for ep in entry_points):
+        return []
+    return ['-p', 'dotenv_tools.pytest_plugin']
+
+
+def _age(path, seconds=10):
+    """Move a file's mtime out of the racy window."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+@pytest.fixture
+def project(pytester, monkeypatch):
+    monkeypatch.delenv('PLUGIN_DB', raising=False)
+    monkeypatch.delenv('PLUGIN_URL', raising=False)
+    monkeypatch.setenv('PLUGIN_EXISTING', 'original')
+    pytester.makefile('.test', **{'.env': (
+        'PLUGIN_DB=test\n'
+        'PLUGIN_URL=db://${PLUGIN_DB}\n'
+        'PLUGIN_EXISTING=replaced\n'
+    )})
+    return pytester
+
+
+class TestMarker:
+    """Test the dotenv marker."""
+
+    def test_marker_applies_and_restores(self, project):
+        """Test that marked tests see the file and others don't."""
+        project.makepyfile("""
+            import os
+            import pytest
+
+            @pytest.mark.dotenv('.env.test')
+            def test_marked():
+                assert os.environ['PLUGIN_URL'] == 'db://test'
+                assert os.environ['PLUGIN_EXISTING'] == 'original'
+
+            def test_unmarked():
+                assert 'PLUGIN_URL' not in os.environ
+        """)
+
+        result = project.runpytest(*_plugin_args())
+
+        result.assert_outcomes(passed=2)
+
+    def test_override_and_class_marker(self, project):
+        """Test override and markers on classes."""
+        project.makepyfile("""
+            import os
+            import pytest
+
+            @pytest.mark.dotenv('.env.test', override=True)
+            class TestClass:
+                def test_one(self):
+                    assert os.environ['PLUGIN_EXISTING'] == 'replaced'
+
+            def test_after():
+                assert os.environ['PLUGIN_EXISTING'] == 'original'
+        """)
+
+        result = project.runpytest(*_plugin_args())
+
+        result.assert_outcomes(passed=2)
+
+    def test_missing_file_errors(self, project):
+        """Test that a missing file is a setup error."""
+        project.makepyfile("""
+            import pytest
+
+            @pytest.mark.dotenv('missing.env')
+            def test_marked():
+                pass
+        """)
+
+        result = project.runpytest(*_plugin_args())
+
+        result.assert_outcomes(errors=1)
+
+    def test_marker_is_registered(self, project):
+        """Test that --strict-markers accepts the marker."""
+        project.makepyfile("""
+            import pytest
+
+            @pytest.mark.dotenv('.env.test')
+            def test_marked():
+                pass
+        """)
+
+        result = project.runpytest(*_plugin_args(), '--strict-markers')
+
+        result.assert_outcomes(passed=1)
+
+
+class TestFixtures:
+    """Test the dotenv fixture."""
+
+    def test_fixture_apply(self, project):
+        """Test applying a file from inside a test."""
+        project.makepyfile("""
+            import os
+
+            def test_apply(dotenv):
+                values = dotenv.apply('.env.test')
+                assert values['PLUGIN_DB'] == 'test'
+                assert os.environ['PLUGIN_DB'] == 'test'
+
+            def test_after():
+                assert 'PLUGIN_DB' not in os.environ
+        """)
+
+        result = project.runpytest(*_plugin_args())
+
+        result.assert_outcomes(passed=2)
+
+
+class TestDotenvCache:
+    """Test session caching."""
+
+    def test_parsed_once(self, tmp_path, monkeypatch):
+        """Test that an unchanged file is parsed once."""
+        from dotenv_tools import pytest_plugin
+
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        _age(env_file)
+        calls = []
+        original = pytest_plugin.parse_path
+        monkeypatch.setattr(pytest_plugin, 'parse_path',
+                            lambda path: calls.append(path) or original(path))
+        cache = DotenvCache(str(tmp_path))
+
+        first = cache.resolve('.env')
+        assert cache.resolve('.env') is first
+        assert len(calls) == 1
+
+    def test_dependent_environment_changes(self, tmp_path, monkeypatch):
+        """Test that a changed referenced variable resolves again."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('URL=http://${PLUGIN_HOST}\n')
+        _age(env_file)
+        cache = DotenvCache(str(tmp_path))
+
+        monkeypatch.setenv('PLUGIN_HOST', 'a')
+        assert cache.resolve('.env') == {'URL': 'http://a'}
+        monkeypatch.setenv('PLUGIN_HOST', 'b')
+        assert cache.resolve('.env') == {'URL': 'http://b'}
+
+    def test_chained_reference_changes(self, tmp_path, monkeypatch):
+        """Test that a variable referenced through another one resolves again."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('URL=http://${PLUGIN_HOST}\n')
+        _age(env_file)
+        cache = DotenvCache(str(tmp_path))
+        monkeypatch.setenv('PLUGIN_HOST', '${PLUGIN_NAME}')
+
+        monkeypatch.setenv('PLUGIN_NAME', 'a')
+        assert cache.resolve('.env') == {'URL': 'http://a'}
+        monkeypatch.setenv('PLUGIN_NAME', 'b')
+        assert cache.resolve('.env') == {'URL': 'http://b'}
+
+    def test_edited_file(self, tmp_path):
+        """Test that an edited file is parsed again."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        _age(env_file)
+        cache = DotenvCache(str(tmp_path))
+        assert cache.resolve('.env') == {'A': '1'}
+
+        env_file.write_text('A=22\n')
+
+        assert cache.resolve('.env') == {'A': '22'}
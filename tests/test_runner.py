@@ -0,0 +1,103 @@
+"""Tests for running commands with .env files."""
+
+import sys
+
+import pytest
+
+from dotenv_tools.core import LoadDotenvFileNotFound
+from dotenv_tools.runner import resolve_environment
+
+PRINT_ENV = [sys.executable, '-c', 'import os, sys; print(os.environ[sys.argv[1]])']
+
+
+class TestResolveEnvironment:
+    """Test merging .env files into an environment."""
+
+    def test_files_apply_in_order(self, tmp_path):
+        """Test that later files see variables from earlier ones."""
+        first = tmp_path / 'first.env'
+        first.write_text('HOST=localhost\nPORT=1\n')
+        second = tmp_path / 'second.env'
+        second.write_text('URL=http://${HOST}:${PORT}\nPORT=2\n')
+
+        env = resolve_environment([first, second], environ={'KEEP': 'yes'})
+
+        assert env == {'KEEP': 'yes', 'HOST': 'localhost', 'PORT': '1',
+                       'URL': 'http://localhost:1'}
+
+    def test_override(self, tmp_path):
+        """Test that override lets files replace existing values."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('PORT=2\n')
+
+        assert resolve_environment([env_file], environ={'PORT': '1'})['PORT'] == '1'
+        assert resolve_environment([env_file], True, {'PORT': '1'})['PORT'] == '2'
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file raises."""
+        with pytest.raises(LoadDotenvFileNotFound):
+            resolve_environment([tmp_path / 'missing.env'], environ={})
+
+
+class TestExecCommands:
+    """Test dotenv-run and load-dotenv --exec."""
+
+    def test_dotenv_run(self, tmp_path, run_cli):
+        """Test that the command sees the variables."""
+        (tmp_path / 'app.env').write_text('GREETING=hello\n')
+
+        result = run_cli(['dotenv-run', '-f', 'app.env', '--'] + PRINT_ENV + ['GREETING'],
+                         tmp_path)
+
+        assert result.returncode == 0
+        assert result.stdout == 'hello\n'
+
+    def test_dotenv_run_discovers_file(self, tmp_path, run_cli):
+        """Test that dotenv-run finds .env without --file."""
+        (tmp_path / '.env').write_text('GREETING=found\n')
+
+        result = run_cli(['dotenv-run'] + PRINT_ENV + ['GREETING'], tmp_path)
+
+        assert result.stdout == 'found\n'
+
+    def test_load_dotenv_exec(self, tmp_path, run_cli):
+        """Test load-dotenv --exec without writing the state file."""
+        (tmp_path / 'app.env').write_text('GREETING=exec\n')
+        state_file = tmp_path / 'state.json'
+
+        result = run_cli(['load-dotenv', 'app.env', '--state-file', str(state_file),
+                          '--exec', '--'] + PRINT_ENV + ['GREETING'], tmp_path)
+
+        assert result.returncode == 0
+        assert result.stdout == 'exec\n'
+        assert not state_file.exists()
+
+    def test_exit_code_is_passed_through(self, tmp_path, run_cli):
+        """Test that the command's exit code is the process exit code."""
+        (tmp_path / '.env').write_text('A=1\n')
+
+        result = run_cli(['dotenv-run', '--', sys.executable, '-c', 'raise SystemExit(3)'],
+                         tmp_path)
+
+        assert result.returncode == 3
+
+    def test_expansion_error(self, tmp_path, run_cli, monkeypatch):
+        """Test that expansion errors are reported without a traceback."""
+        (tmp_path / '.env').write_text('B=${A}\n')
+        monkeypatch.setenv('A', '${A}x')
+
+        for args in (['dotenv-run', '--', 'true'], ['load-dotenv', '--exec', '--', 'true']):
+            result = run_cli(args, tmp_path)
+
+            assert result.returncode == 1
+            assert 'Error expanding variables' in result.stderr
+            assert 'Traceback' not in result.stderr
+
+    def test_command_not_found(self, tmp_path, run_cli):
+        """Test the exit code for a missing command."""
+        (tmp_path / '.env').write_text('A=1\n')
+
+        result = run_cli(['dotenv-run', '--', 'no-such-command-dotenv-tools'], tmp_path)
+
+        assert result.returncode == 127
+        assert 'Cannot run' in result.stderr
@@ -0,0 +1,260 @@
+"""Tests for the setter module."""
+
+import multiprocessing
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from dotenv_tools.setter import SetDotenv, SetDotenvError
+
+
+def _concurrent_set(args):
+    """Set one key, as a separate set-dotenv run would."""
+    path, index = args
+    SetDotenv(Path(path)).set_variable(f'KEY_{index}', str(index))
+
+
+def _watch(path, stop, torn):
+    """Read the file until told to stop; count reads missing the first line."""
+    while not stop.is_set():
+        if not Path(path).read_text().startswith('SEED=1\n'):
+            torn.value += 1
+
+
+class TestSetDotenv:
+    """Test single set and remove operations."""
+
+    def test_set_appends_without_blank_lines(self, tmp_path):
+        """Test that new keys are appended directly after the last line."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        setter = SetDotenv(env_file)
+
+        setter.set_variable('B', '2')
+        setter.set_variable('C', '3')
+
+        assert env_file.read_text() == 'A=1\nB=2\nC=3\n'
+
+    def test_set_updates_first_line_and_keeps_export(self, tmp_path):
+        """Test that an existing key is updated in place."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('# comment\nexport A=1\nB=2\n')
+
+        SetDotenv(env_file).set_variable('A', '10', ':=')
+
+        assert env_file.read_text() == '# comment\nexport A:=10\nB=2\n'
+
+    def test_remove(self, tmp_path):
+        """Test removing every line of a key."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\nB=2\nA+=3\n')
+        setter = SetDotenv(env_file)
+
+        assert setter.remove_variable('A')
+        assert not setter.remove_variable('A')
+        assert env_file.read_text() == 'B=2\n'
+
+    def test_invalid_key(self, tmp_path):
+        """Test that invalid names are rejected."""
+        with pytest.raises(SetDotenvError):
+            SetDotenv(tmp_path / '.env').set_variable('1BAD', 'x')
+
+
+class TestBatch:
+    """Test applying many operations with one write."""
+
+    def test_batch_writes_once(self, tmp_path, monkeypatch):
+        """Test that a batch reads and writes the file once."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('KEEP=1\nOLD=2\n')
+        setter = SetDotenv(env_file)
+        writes = []
+        original = setter._write_lines
+        monkeypatch.setattr(setter, '_write_lines', lambda lines: writes.append(1) or original(lines))
+
+        with setter.batch() as batch:
+            for i in range(500):
+                batch.set(f'KEY_{i}', str(i))
+            batch.set('KEEP', 'updated')
+            assert batch.remove('OLD')
+
+        assert len(writes) == 1
+        lines = env_file.read_text().splitlines()
+        assert lines[0] == 'KEEP=updated'
+        assert lines[1:] == [f'KEY_{i}={i}' for i in range(500)]
+
+    def test_failed_batch_writes_nothing(self, tmp_path):
+        """Test that an error inside the batch leaves the file alone."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+
+        with pytest.raises(SetDotenvError):
+            SetDotenv(env_file).apply([('set', 'B', '2'), ('set', 'not valid', '3')])
+
+        assert env_file.read_text() == 'A=1\n'
+
+    def test_apply_results(self, tmp_path):
+        """Test the per-operation results of apply()."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+
+        results = SetDotenv(env_file).apply([
+            ('remove', 'A'), ('remove', 'MISSING'), ('set', 'B', '2', '?='),
+        ])
+
+        assert results == [True, False, True]
+        assert env_file.read_text() == 'B?=2\n'
+
+    def test_unchanged_batch_does_not_write(self, tmp_path):
+        """Test that setting the same value leaves the file untouched."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        mtime = env_file.stat().st_mtime_ns
+        os.utime(env_file, ns=(mtime - 10**9, mtime - 10**9))
+
+        SetDotenv(env_file).set_variable('A', '1')
+
+        assert env_file.stat().st_mtime_ns == mtime - 10**9
+
+
+class TestAtomicWrite:
+    """Test that writes replace the file atomically and under a lock."""
+
+    def test_keeps_permissions(self, tmp_path):
+        """Test that the file's mode survives the rewrite."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        env_file.chmod(0o640)
+
+        SetDotenv(env_file).set_variable('B', '2')
+
+        assert stat.S_IMODE(env_file.stat().st_mode) == 0o640
+        assert [p.name for p in tmp_path.iterdir()] == ['.env']
+
+    def test_writes_through_symlink(self, tmp_path):
+        """Test that a symlinked .env file stays a symlink."""
+        target = tmp_path / 'shared.env'
+        target.write_text('A=1\n')
+        link = tmp_path / '.env'
+        link.symlink_to(target)
+
+        SetDotenv(link).set_variable('B', '2')
+
+        assert link.is_symlink()
+        assert target.read_text() == 'A=1\nB=2\n'
+
+    def test_creates_missing_file(self, tmp_path):
+        """Test that setting a key in a missing file creates it."""
+        env_file = tmp_path / 'sub' / '.env'
+
+        SetDotenv(env_file).set_variable('A', '1')
+
+        assert env_file.read_text() == 'A=1\n'
+
+    @pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(),
+                        reason="requires fork")
+    def test_concurrent_writers(self, tmp_path):
+        """Test that concurrent writers lose no keys and readers see no torn file."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('SEED=1\n')
+        ctx = multiprocessing.get_context('fork')
+        stop, torn = ctx.Event(), ctx.Value('i', 0)
+        watcher = ctx.Process(target=_watch, args=(str(env_file), stop, torn))
+        watcher.start()
+
+        with ctx.Pool(8) as pool:
+            pool.map(_concurrent_set, [(str(env_file), i) for i in range(64)])
+        stop.set()
+        watcher.join(30)
+
+        assert torn.value == 0
+
+        lines = env_file.read_text().splitlines()
+        assert lines[0] == 'SEED=1'
+        assert sorted(lines[1:]) == sorted(f'KEY_{i}={i}' for i in range(64))
+
+
+class TestInPlace:
+    """Test that single sets avoid rewriting the file where they can."""
+
+    def _batch_result(self, tmp_path, content, key, value):
+        """Set a key through a batch, which always rewrites."""
+        env_file = tmp_path / 'batch.env'
+        env_file.write_bytes(content)
+        with SetDotenv(env_file).batch() as batch:
+            batch.set(key, value)
+        return env_file.read_bytes()
+
+    @pytest.mark.parametrize('content,key,value', [
+        (b'A=1\n', 'B', '2'),
+        (b'A=1', 'B', '2'),
+        (b'', 'B', '2'),
+        (b'A=1\nexport B=2\n# note\n', 'B', '3'),
+        (b'A=1\nA=2\n', 'A', '9'),
+        (b'A=\xc3\xa9\n', 'A', 'xy'),
+        (b'A=\xc3\xa9\nB=1\n', 'B', '2'),
+    ])
+    def test_matches_rewrite(self, tmp_path, content, key, value):
+        """Test that appends and patches leave the file as a rewrite would."""
+        env_file = tmp_path / '.env'
+        env_file.write_bytes(content)
+        inode = env_file.stat().st_ino
+
+        SetDotenv(env_file).set_variable(key, value)
+
+        assert env_file.read_bytes() == self._batch_result(tmp_path, content, key, value)
+        assert env_file.stat().st_ino == inode
+
+    def test_longer_value_rewrites(self, tmp_path):
+        """Test that a change in line length falls back to a full rewrite."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\nB=2\n')
+        inode = env_file.stat().st_ino
+
+        SetDotenv(env_file).set_variable('A', '100')
+
+        assert env_file.read_text() == 'A=100\nB=2\n'
+        assert env_file.stat().st_ino != inode
+
+    def test_carriage_returns_rewrite(self, tmp_path):
+        """Test that files with carriage returns are rewritten, as text."""
+        env_file = tmp_path / '.env'
+        env_file.write_bytes(b'A=1\r\nB=2\r\n')
+
+        SetDotenv(env_file).set_variable('B', '3')
+
+        assert env_file.read_bytes() == b'A=1\nB=3\n'
+
+
+class TestSetCommand:
+    """Test set-dotenv with several variables."""
+
+    def test_set_many(self, tmp_path, cli_runner):
+        """Test set-dotenv A=1 B:=2 C=3."""
+        (tmp_path / '.env').write_text('')
+
+        result = cli_runner(['set-dotenv', 'A=1', 'B:=2', 'C=3'])
+
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / '.env').read_text() == 'A=1\nB:=2\nC=3\n'
+
+    def test_key_value_form(self, tmp_path, cli_runner):
+        """Test that KEY VALUE still works."""
+        (tmp_path / '.env').write_text('')
+
+        result = cli_runner(['set-dotenv', 'PORT', '3000'])
+
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / '.env').read_text() == 'PORT=3000\n'
+
+    def test_remove_many(self, tmp_path, cli_runner):
+        """Test set-dotenv --remove A B C."""
+        (tmp_path / '.env').write_text('A=1\nB=2\nD=4\n')
+
+        result = cli_runner(['set-dotenv', '--remove', 'A', 'B', 'C'])
+
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / '.env').read_text() == 'D=4\n'
+        assert "Variable 'C' not found" in result.stdout
@@ -0,0 +1,129 @@
+"""Tests for shared-memory environment distribution."""
+
+import multiprocessing
+import os
+
+import pytest
+
+from dotenv_tools.shared import (
+    SHARED_ENV_VAR, SharedEnvError, SharedEnvPublisher, SharedEnvReader,
+    _decode, _encode, publish_dotenv
+)
+
+
+@pytest.fixture
+def publisher(monkeypatch):
+    monkeypatch.delenv(SHARED_ENV_VAR, raising=False)
+    publisher = SharedEnvPublisher({'HOST': 'localhost', 'PORT': '8080'})
+    yield publisher
+    publisher.close()
+
+
+def _worker(queue):
+    """Attach in a child process and report what it sees."""
+    with SharedEnvReader() as reader:
+        queue.put((reader.version, reader.read()))
+
+
+class TestEncoding:
+    """Test the payload format."""
+
+    def test_roundtrip(self):
+        """Test that values survive encoding, including non-ASCII."""
+        values = {'A': '', 'URL': 'http://x/?a=b', 'NAME': 'café', 'EMPTY_KEY': ''}
+
+        assert _decode(_encode(values)) == values
+
+    def test_empty(self):
+        """Test encoding no variables."""
+        assert _decode(_encode({})) == {}
+
+
+class TestSharedEnvironment:
+    """Test publishing and reading."""
+
+    def test_read(self, publisher):
+        """Test that a reader sees the published values."""
+        with SharedEnvReader(publisher.name) as reader:
+            assert reader.read() == {'HOST': 'localhost', 'PORT': '8080'}
+            assert reader.version == publisher.version == 1
+
+    def test_name_is_exported(self, publisher):
+        """Test that the segment name is stored for child processes."""
+        assert os.environ[SHARED_ENV_VAR] == publisher.name
+        with SharedEnvReader() as reader:
+            assert reader.read()['PORT'] == '8080'
+
+    def test_republish_bumps_version(self, publisher):
+        """Test that readers pick up reloads through the version."""
+        with SharedEnvReader(publisher.name) as reader:
+            assert reader.refresh() is not None
+            assert reader.refresh() is None
+
+            assert publisher.publish({'HOST': 'example.com'}) == 2
+
+            assert reader.version == 2
+            assert reader.refresh() == {'HOST': 'example.com'}
+            assert reader.refresh() is None
+
+    def test_payload_too_large(self, monkeypatch):
+        """Test that publishing more than the segment holds raises."""
+        monkeypatch.delenv(SHARED_ENV_VAR, raising=False)
+        with SharedEnvPublisher({'A': '1'}, size=128) as publisher:
+            with pytest.raises(SharedEnvError):
+                publisher.publish({'A': 'x' * 200})
+            with SharedEnvReader(publisher.name) as reader:
+                assert reader.read() == {'A': '1'}
+
+    def test_missing_segment(self, monkeypatch):
+        """Test attaching to a segment that doesn't exist."""
+        monkeypatch.delenv(SHARED_ENV_VAR, raising=False)
+        with pytest.raises(SharedEnvError):
+            SharedEnvReader()
+        with pytest.raises(SharedEnvError):
+            SharedEnvReader('dotenv-tools-missing-segment')
+
+    def test_reader_close_keeps_segment(self, publisher):
+        """Test that a reader detaching doesn't remove the segment."""
+        SharedEnvReader(publisher.name).close()
+
+        with SharedEnvReader(publisher.name) as reader:
+            assert reader.read()['HOST'] == 'localhost'
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires fork")
+    def test_forked_workers(self, publisher):
+        """Test that forked workers read values and later reloads."""
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+
+        workers = [context.Process(target=_worker, args=(queue,)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        results = [queue.get(timeout=10) for _ in workers]
+        for worker in workers:
+            worker.join(timeout=10)
+
+        assert results == [(1, {'HOST': 'localhost', 'PORT': '8080'})] * 4
+
+        publisher.publish({'HOST': 'reloaded'})
+        worker = context.Process(target=_worker, args=(queue,))
+        worker.start()
+        assert queue.get(timeout=10) == (2, {'HOST': 'reloaded'})
+        worker.join(timeout=10)
+
+
+class TestPublishDotenv:
+    """Test publishing a .env file."""
+
+    def test_publish_dotenv(self, tmp_path, monkeypatch):
+        """Test that the file is resolved once and published."""
+        monkeypatch.delenv(SHARED_ENV_VAR, raising=False)
+        monkeypatch.delenv('SHARED_HOST', raising=False)
+        env_file = tmp_path / '.env'
+        env_file.write_text('SHARED_HOST=db\nSHARED_URL=postgres://${SHARED_HOST}\n')
+
+        with publish_dotenv(env_file) as publisher:
+            with SharedEnvReader(publisher.name) as reader:
+                assert reader.read() == {
+                    'SHARED_HOST': 'db', 'SHARED_URL': 'postgres://db'
+                }
@@ -0,0 +1,181 @@
+"""Import-time budgets for the command-line entry points.
+
+Each command is run in a fresh interpreter with ``-X importtime``. The test
+fails if a command imports a module it doesn't need, or if the time spent
+importing dotenv_tools' own modules exceeds the command's budget.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from dotenv_tools.hook import HOOK_FINGERPRINT_VAR, HOOK_STATE_VAR, file_fingerprint
+
+SRC = str(Path(__file__).resolve().parent.parent / 'src')
+
+# Generous: -X importtime itself slows imports down, and CI machines vary
+BUDGET_MS = 60
+
+# (entry point, arguments, modules that must not be imported)
+COMMANDS = {
+    'load-dotenv': (
+        'dotenv_tools.hook:main', ['{env}', '--state-file', '{state}'],
+        ['yaml', 'dotenv_tools.extras', 'dotenv_tools.setter'],
+    ),
+    'load-dotenv --hook': (
+        'dotenv_tools.hook:main', ['--hook', 'bash', '{env}'],
+        ['click', 'yaml', 'dotenv_tools.parser', 'dotenv_tools.expansion'],
+    ),
+    'unload-dotenv': (
+        'dotenv_tools.cli:unload_dotenv', ['--state-file', '{state}', '--force'],
+        ['yaml', 'dotenv_tools.extras', 'dotenv_tools.setter', 'dotenv_tools.parser'],
+    ),
+    'dotenv-status': (
+        'dotenv_tools.cli:dotenv_status', ['--state-file', '{state}'],
+        ['yaml', 'dotenv_tools.extras', 'dotenv_tools.setter', 'dotenv_tools.expansion'],
+    ),
+    'set-dotenv': (
+        'dotenv_tools.cli:set_dotenv', ['--file', '{env}', '--list'],
+        ['yaml', 'dotenv_tools.extras', 'dotenv_tools.tracker', 'dotenv_tools.parser'],
+    ),
+    'dotenv-run': (
+        'dotenv_tools.cli:dotenv_run', ['-f', '{env}', '--', 'true'],
+        ['yaml', 'dotenv_tools.extras', 'dotenv_tools.setter', 'dotenv_tools.tracker'],
+    ),
+    'export-dotenv': (
+        'dotenv_tools.cli:export_dotenv_cmd', ['{env}', '--format', 'json'],
+        ['yaml', 'dotenv_tools.setter', 'dotenv_tools.tracker'],
+    ),
+    'generate-template': (
+        'dotenv_tools.cli:generate_template_cmd', [],
+        ['yaml', 'dotenv_tools.setter', 'dotenv_tools.tracker', 'dotenv_tools.core'],
+    ),
+    'compile-dotenv': (
+        'dotenv_tools.cli:compile_dotenv_cmd', ['{env}', '-o', '{tmp}/env_module.py'],
+        ['yaml', 'dotenv_tools.setter', 'dotenv_tools.tracker'],
+    ),
+    'compare-env': (
+        'dotenv_tools.cli:compare_env_cmd', ['{env}', '{env}'],
+        ['yaml', 'dotenv_tools.setter', 'dotenv_tools.tracker'],
+    ),
+}
+
+
+def _import_times(entry_point, args, cwd, extra_env):
+    """Run an entry point and return {module: self time in ms}."""
+    module, attr = entry_point.split(':')
+    code = (
+        f"import sys; from {module} import {attr} as main; "
+        f"sys.argv[0] = 'cmd'; main()"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC)
+    for key in (HOOK_FINGERPRINT_VAR, HOOK_STATE_VAR):
+        env.pop(key, None)
+    env.update(extra_env)
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code] + args,
+        cwd=str(cwd), env=env, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(self_us) / 1000
+    return times
+
+
+@pytest.mark.parametrize('command', sorted(COMMANDS))
+def test_command_startup_budget(command, tmp_path):
+    """Test that a command imports only what it needs, within budget."""
+    entry_point, args, forbidden = COMMANDS[command]
+    env_file = tmp_path / '.env'
+    env_file.write_text('APP_NAME=demo\nPORT=8080\n')
+    args = [arg.format(env=env_file, state=tmp_path / 'state.json', tmp=tmp_path)
+            for arg in args]
+
+    # The hook is measured on its fast path: the file is already applied
+    extra_env = {}
+    if '--hook' in args:
+        extra_env[HOOK_FINGERPRINT_VAR] = file_fingerprint(str(env_file))
+
+    times = _import_times(entry_point, args, tmp_path, extra_env)
+
+    assert sorted(m for m in forbidden if m in times) == []
+    own = sum(ms for name, ms in times.items() if name.startswith('dotenv_tools'))
+    assert own < BUDGET_MS, f"{command} spent {own:.1f} ms importing dotenv_tools"
+
+
+class TestLoad:
+    """Test dotenv_tools.load()."""
+
+    def test_load_sets_environment(self, tmp_path, monkeypatch):
+        """Test that load() resolves and applies the file."""
+        import dotenv_tools
+
+        env_file = tmp_path / 'app.env'
+        env_file.write_text('STARTUP_HOST=localhost\nSTARTUP_URL=http://${STARTUP_HOST}\n')
+        monkeypatch.delenv('STARTUP_HOST', raising=False)
+        monkeypatch.delenv('STARTUP_URL', raising=False)
+
+        loaded = dotenv_tools.load(str(env_file))
+
+        assert loaded == {'STARTUP_HOST': 'localhost', 'STARTUP_URL': 'http://localhost'}
+        assert os.environ['STARTUP_URL'] == 'http://localhost'
+
+    def test_load_respects_override(self, tmp_path, monkeypatch):
+        """Test that existing variables win unless override is set."""
+        import dotenv_tools
+
+        env_file = tmp_path / 'app.env'
+        env_file.write_text('STARTUP_PORT=2\n')
+        monkeypatch.setenv('STARTUP_PORT', '1')
+
+        dotenv_tools.load(str(env_file))
+        assert os.environ['STARTUP_PORT'] == '1'
+
+        dotenv_tools.load(str(env_file), override=True)
+        assert os.environ['STARTUP_PORT'] == '2'
+
+    def test_load_discovers_file(self, tmp_path, monkeypatch):
+        """Test that load() finds .env from the current directory."""
+        import dotenv_tools
+
+        (tmp_path / '.env').write_text('STARTUP_FOUND=yes\n')
+        nested = tmp_path / 'pkg'
+        nested.mkdir()
+        monkeypatch.chdir(nested)
+        monkeypatch.delenv('STARTUP_FOUND', raising=False)
+
+        assert dotenv_tools.load() == {'STARTUP_FOUND': 'yes'}
+
+    def test_load_missing_explicit_file(self, tmp_path):
+        """Test that an explicit missing path raises FileNotFoundError."""
+        import dotenv_tools
+
+        with pytest.raises(FileNotFoundError):
+            dotenv_tools.load(str(tmp_path / 'missing.env'))
+
+    def test_load_imports_only_parser_and_expansion(self, tmp_path):
+        """Test the modules imported by a cold load()."""
+        (tmp_path / '.env').write_text('A=1\n')
+        code = (
+            "import sys, dotenv_tools; dotenv_tools.load()\n"
+            "print(sorted(m for m in sys.modules if m.startswith('dotenv_tools.')"
+            " or m in ('click', 'yaml')))\n"
+        )
+        env = dict(os.environ, PYTHONPATH=SRC)
+
+        result = subprocess.run([sys.executable, '-c', code], cwd=str(tmp_path),
+                                env=env, capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == str([
+            'dotenv_tools.expansion', 'dotenv_tools.hook',
+            'dotenv_tools.parser', 'dotenv_tools.startup',
+        ])
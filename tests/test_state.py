@@ -0,0 +1,207 @@
+"""Tests for tracker state stores and sessions."""
+
+import multiprocessing
+import os
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from dotenv_tools import state
+from dotenv_tools.state import (
+    JsonStateStore, SESSION_ENV_VAR, SessionStore, current_session, import_json_state,
+    open_state_store
+)
+from dotenv_tools.tracker import Tracker
+
+
+def _session_load(args):
+    """Load one variable in a named session, as a separate CLI run would."""
+    db, index = args
+    Tracker(Path(db), session=f's{index % 4}').load_variables({f'SESSION_{index}': '1'})
+
+
+def _dead_pid():
+    """Return the pid of a process that has exited."""
+    child = subprocess.Popen([sys.executable, '-c', 'pass'])
+    child.wait()
+    return child.pid
+
+
+class TestOpenStateStore:
+    """Test choosing a store."""
+
+    def test_suffix_selects_store(self, tmp_path):
+        """Test that .db files use sessions and others use JSON."""
+        assert isinstance(open_state_store(tmp_path / 'state.db'), SessionStore)
+        assert isinstance(open_state_store(tmp_path / 'state.json'), JsonStateStore)
+
+    def test_session_needs_db(self, tmp_path):
+        """Test that naming a session for a JSON file is an error."""
+        with pytest.raises(ValueError):
+            open_state_store(tmp_path / 'state.json', session='a')
+
+    def test_current_session(self, monkeypatch):
+        """Test explicit and terminal sessions."""
+        monkeypatch.setenv(SESSION_ENV_VAR, 'ci-job')
+        assert current_session() == ('ci-job', None)
+
+        monkeypatch.delenv(SESSION_ENV_VAR)
+        name, pid = current_session()
+        assert name == f'pid-{pid}'
+
+
+class TestSessionStore:
+    """Test the sqlite session store."""
+
+    def test_sessions_are_isolated(self, tmp_path, monkeypatch):
+        """Test that unloading one session leaves the other alone."""
+        db = tmp_path / 'state.db'
+        monkeypatch.delenv('ISO_A', raising=False)
+        monkeypatch.delenv('ISO_B', raising=False)
+        Tracker(db, session='a').load_variables({'ISO_A': '1'})
+        Tracker(db, session='b').load_variables({'ISO_B': '2'})
+
+        tracker = Tracker(db, session='a')
+        assert tracker.load_state()
+        assert tracker.loaded_vars == {'ISO_A'}
+        tracker.unload_all()
+
+        other = Tracker(db, session='b')
+        assert other.load_state()
+        assert other.loaded_vars == {'ISO_B'}
+        assert not Tracker(db, session='a').load_state()
+        other.unload_all()
+
+    def test_missing_database_is_not_created_by_reads(self, tmp_path):
+        """Test that reading and clearing don't create the database."""
+        store = SessionStore(tmp_path / 'state.db', 'a')
+
+        assert store.read() is None
+        store.clear()
+
+        assert not (tmp_path / 'state.db').exists()
+
+    def test_permissions(self, tmp_path):
+        """Test that the database is private."""
+        store = SessionStore(tmp_path / 'state.db', 'a')
+
+        store.update(lambda stored: {'loaded_vars': []})
+
+        assert stat.S_IMODE((tmp_path / 'state.db').stat().st_mode) == 0o600
+
+    def test_dead_sessions_are_collected(self, tmp_path, monkeypatch):
+        """Test that sessions of exited processes are removed on write."""
+        db = tmp_path / 'state.db'
+        dead = SessionStore(db, 'a')
+        dead.pid = _dead_pid()
+        dead.update(lambda stored: {'loaded_vars': ['X']})
+        alive = SessionStore(db, 'b')
+        alive.pid = os.getpid()
+        alive.update(lambda stored: {'loaded_vars': ['Y']})
+        dead.close()
+
+        # The collection above ran before 'b' existed; force the next one
+        monkeypatch.setattr(state, 'GC_INTERVAL', 0.0)
+        SessionStore(db, 'c').update(lambda stored: {'loaded_vars': []})
+
+        assert [s[0] for s in alive.sessions()] == ['b', 'c']
+
+    def test_idle_named_sessions_are_collected(self, tmp_path, monkeypatch):
+        """Test that named sessions expire after MAX_IDLE."""
+        db = tmp_path / 'state.db'
+        SessionStore(db, 'old').update(lambda stored: {'loaded_vars': []})
+        store = SessionStore(db, 'new')
+
+        monkeypatch.setattr(state, 'MAX_IDLE', -1.0)
+
+        assert store.collect_garbage() == 1
+        assert store.sessions() == []
+
+    @pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(),
+                        reason="requires fork")
+    def test_concurrent_sessions(self, tmp_path):
+        """Test that concurrent writers to several sessions lose nothing."""
+        db = tmp_path / 'state.db'
+
+        with multiprocessing.get_context('fork').Pool(8) as pool:
+            pool.map(_session_load, [(str(db), i) for i in range(32)])
+
+        for session in range(4):
+            tracker = Tracker(db, session=f's{session}')
+            tracker.load_state()
+            assert tracker.loaded_vars == {f'SESSION_{i}' for i in range(session, 32, 4)}
+
+
+class TestImportJsonState:
+    """Test importing the pre-session JSON state file."""
+
+    def test_import_into_empty_session(self, tmp_path):
+        """Test that legacy state is moved into the session once."""
+        legacy = tmp_path / 'state.json'
+        JsonStateStore(legacy).update(lambda stored: {'loaded_vars': ['OLD']})
+        store = SessionStore(tmp_path / 'state.db', 'a')
+
+        assert import_json_state(legacy, store)
+
+        assert store.read() == {'loaded_vars': ['OLD']}
+        assert not legacy.exists()
+        assert (tmp_path / 'state.json.migrated').exists()
+        assert not import_json_state(legacy, store)
+
+    def test_existing_session_state_wins(self, tmp_path):
+        """Test that a session with state is left alone, and so is the JSON file."""
+        legacy = tmp_path / 'state.json'
+        JsonStateStore(legacy).update(lambda stored: {'loaded_vars': ['OLD']})
+        store = SessionStore(tmp_path / 'state.db', 'a')
+        store.update(lambda stored: {'loaded_vars': ['NEW']})
+
+        assert not import_json_state(legacy, store)
+
+        assert store.read() == {'loaded_vars': ['NEW']}
+        assert legacy.exists()
+
+
+class TestSessionCommands:
+    """Test --session on the command line."""
+
+    def test_unload_other_session(self, tmp_path, cli_runner):
+        """Test that unload-dotenv only sees its own session."""
+        (tmp_path / '.env').write_text('SESSION_CLI=1\n')
+        db = str(tmp_path / 'state.db')
+
+        cli_runner(['load-dotenv', '.env', '--state-file', db, '--session', 'a'])
+        other = cli_runner(['unload-dotenv', '--state-file', db, '--session', 'b', '-f'])
+        own = cli_runner(['unload-dotenv', '--state-file', db, '--session', 'a', '-f'])
+
+        assert 'No environment variables to unload' in other.output
+        assert 'Successfully unloaded' in own.output
+
+    def test_session_with_json_state_file(self, tmp_path, cli_runner):
+        """Test that --session with a JSON state file is a usage error."""
+        (tmp_path / '.env').write_text('SESSION_CLI=1\n')
+
+        result = cli_runner(['load-dotenv', '.env', '--state-file',
+                             str(tmp_path / 'state.json'), '--session', 'a'])
+
+        assert result.exit_code == 2
+        assert 'Sessions need a .db state file' in result.output
+
+    def test_unload_last(self, tmp_path, cli_runner):
+        """Test that unload-dotenv --last undoes only the latest load."""
+        (tmp_path / 'a.env').write_text('LAST_A=1\n')
+        (tmp_path / 'b.env').write_text('LAST_B=2\n')
+        db = str(tmp_path / 'state.db')
+        for name in ('a.env', 'b.env'):
+            cli_runner(['load-dotenv', name, '--state-file', db, '--session', 's'])
+
+        result = cli_runner(['unload-dotenv', '--state-file', db, '--session', 's',
+                             '--last', '-f'])
+
+        assert result.exit_code == 0, result.output
+        assert 'b.env' in result.output
+        tracker = Tracker(Path(db), session='s')
+        tracker.load_state()
+        assert tracker.loaded_vars == {'LAST_A'}
@@ -0,0 +1,252 @@
+"""Tests for detecting drift with dotenv-status."""
+
+import os
+
+import pytest
+
+from dotenv_tools import status
+from dotenv_tools.fingerprint import file_fingerprint
+from dotenv_tools.status import check_status
+from dotenv_tools.tracker import Tracker
+
+
+def _age(path, seconds=10):
+    """Move a file's mtime out of the racy window."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+def _load(tracker, env_file, variables, override=False):
+    """Load variables the way load-dotenv does."""
+    source = str(env_file)
+    tracker.record_source(source, file_fingerprint(env_file), variables, override)
+    tracker.load_variables(variables, source=source)
+
+
+@pytest.fixture
+def loaded(tmp_path, monkeypatch):
+    """A tracker that loaded STATUS_A and STATUS_B from an aged .env file."""
+    for key in ('STATUS_A', 'STATUS_B', 'STATUS_C'):
+        monkeypatch.delenv(key, raising=False)
+    env_file = tmp_path / '.env'
+    env_file.write_text('STATUS_A=1\nSTATUS_B=2\n')
+    _age(env_file)
+    tracker = Tracker(tmp_path / 'state.json')
+    _load(tracker, env_file, {'STATUS_A': '1', 'STATUS_B': '2'})
+    yield tracker, env_file
+    tracker.unload_all()
+
+
+class TestCheckStatus:
+    """Test check_status()."""
+
+    def test_clean_needs_no_parse_or_hash(self, loaded, monkeypatch):
+        """Test that the no-drift case only stats the file."""
+        tracker, env_file = loaded
+        monkeypatch.setattr(status, 'sha256_file', lambda path: pytest.fail('hashed'))
+        monkeypatch.setattr('dotenv_tools.parser.parse_path', lambda path: pytest.fail('parsed'))
+
+        report = check_status(tracker)
+
+        assert report.clean
+        assert (report.tracked, report.files) == (2, 1)
+
+    def test_changed_file(self, loaded):
+        """Test that an edited file reports stale, new and removed keys."""
+        tracker, env_file = loaded
+        env_file.write_text('STATUS_A=10\nSTATUS_C=3\n')
+
+        report = check_status(tracker)
+
+        [drift] = report.changed_files
+        assert drift.path == str(env_file)
+        assert (drift.stale, drift.new, drift.removed) == (['STATUS_A'], ['STATUS_C'], ['STATUS_B'])
+
+    def test_touched_file_is_not_drift(self, loaded):
+        """Test that a new mtime with the same contents is not reported."""
+        tracker, env_file = loaded
+        os.utime(env_file)
+
+        assert check_status(tracker).clean
+
+    def test_environment_drift(self, loaded, monkeypatch):
+        """Test keys modified or unset outside the tool."""
+        tracker, env_file = loaded
+        monkeypatch.setenv('STATUS_A', 'changed')
+        monkeypatch.delenv('STATUS_B')
+
+        assert check_status(tracker).clean
+        report = check_status(tracker, check_env=True)
+
+        assert report.modified_keys == ['STATUS_A']
+        assert report.unset_keys == ['STATUS_B']
+        assert report.changed_files == []
+
+    def test_missing_file(self, loaded):
+        """Test that a deleted source file is reported."""
+        tracker, env_file = loaded
+        env_file.unlink()
+
+        [drift] = check_status(tracker).changed_files
+
+        assert drift.missing
+
+    def test_pop_forgets_source(self, loaded):
+        """Test that undoing a load drops its file from the status."""
+        tracker, env_file = loaded
+
+        tracker.pop()
+
+        reloaded = Tracker(tracker.state_file)
+        reloaded.load_state()
+        assert reloaded.sources == {}
+
+
+class TestStatusCommand:
+    """Test the dotenv-status command."""
+
+    def test_status_after_edit(self, tmp_path, cli_runner):
+        """Test that dotenv-status exits 1 and names the stale key after an edit."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('STATUS_CLI=1\n')
+        state = str(tmp_path / 'state.json')
+        cli_runner(['load-dotenv', '.env', '--state-file', state])
+
+        env_file.write_text('STATUS_CLI=2\n')
+        result = cli_runner(['dotenv-status', '--state-file', state])
+
+        assert result.exit_code == 1
+        assert f'Changed: {env_file.resolve()}' in result.output
+        assert 'stale: STATUS_CLI' in result.output
+
+    def test_plain_load_is_clean(self, tmp_path, cli_runner):
+        """Test that variables load-dotenv couldn't export aren't drift by default."""
+        (tmp_path / '.env').write_text('STATUS_CLI=1\n')
+        state = str(tmp_path / 'state.json')
+        cli_runner(['load-dotenv', '.env', '--state-file', state])
+
+        # As if from another shell, which load-dotenv couldn't export to
+        result = cli_runner(['dotenv-status', '--state-file', state], STATUS_CLI=None)
+        with_env = cli_runner(['dotenv-status', '--state-file', state, '--env'],
+                              STATUS_CLI=None)
+
+        assert result.exit_code == 0, result.output
+        assert with_env.exit_code == 1
+        assert 'Unset in the environment: STATUS_CLI' in with_env.output
+
+    def test_nothing_loaded(self, tmp_path, cli_runner):
+        """Test dotenv-status without any state."""
+        result = cli_runner(['dotenv-status', '--state-file', str(tmp_path / 'state.json')])
+
+        assert result.exit_code == 0
+        assert 'No environment variables loaded' in result.output
+
+
+class TestReload:
+    """Test applying only what changed since the last load."""
+
+    def test_reload_applies_delta(self, loaded, monkeypatch):
+        """Test that only changed keys are set and removed keys restored."""
+        tracker, env_file = loaded
+        monkeypatch.setenv('STATUS_C', 'before')
+        env_file.write_text('STATUS_A=1\nSTATUS_B=20\n')
+        calls = []
+        original_putenv = os.putenv
+        monkeypatch.setattr(os, 'putenv', lambda k, v: calls.append(os.fsdecode(k))
+                            or original_putenv(k, v))
+
+        delta = tracker.reload(str(env_file), {'STATUS_B': '20'}, file_fingerprint(env_file))
+
+        assert delta.changed == {'STATUS_B': '20'}
+        assert delta.removed == ['STATUS_A']
+        assert calls == ['STATUS_B']
+        assert 'STATUS_A' not in os.environ
+        assert tracker.loaded_vars == {'STATUS_B'}
+        assert check_status(tracker).clean
+
+    def test_reload_compares_with_last_load(self, loaded, monkeypatch):
+        """Test that the diff is against the last load, not os.environ."""
+        tracker, env_file = loaded
+        monkeypatch.setenv('STATUS_A', 'set elsewhere')
+
+        delta = tracker.reload(str(env_file), {'STATUS_A': '1', 'STATUS_B': '2'},
+                               file_fingerprint(env_file))
+
+        assert not delta
+
+    def test_restored_keys_are_removed(self, loaded, monkeypatch):
+        """Test that a removed key with a prior value is reported as removed."""
+        tracker, env_file = loaded
+        tracker.original_values['STATUS_A'] = 'before'
+
+        delta = tracker.reload(str(env_file), {'STATUS_B': '2'}, file_fingerprint(env_file))
+
+        assert delta.removed == ['STATUS_A']
+        assert delta.restored == {'STATUS_A': 'before'}
+        assert not delta.changed and delta.unset == []
+        assert os.environ['STATUS_A'] == 'before'
+
+    def test_base_environment(self, loaded, monkeypatch):
+        """Test that a source's own keys are put back to their prior values."""
+        tracker, env_file = loaded
+
+        base = tracker.base_environment(str(env_file), {'STATUS_A': '1', 'OTHER': 'x'})
+
+        assert base == {'OTHER': 'x'}
+
+
+class TestReloadCommand:
+    """Test the reload-dotenv command."""
+
+    def test_hook_script_is_minimal(self, tmp_path, cli_runner):
+        """Test that --hook emits only the changed keys."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('RELOAD_A=1\nRELOAD_B=2\nRELOAD_C=3\n')
+        state = str(tmp_path / 'state.json')
+        cli_runner(['load-dotenv', '.env', '--state-file', state])
+
+        env_file.write_text('RELOAD_A=1\nRELOAD_B=22\n')
+        # As if the shell had applied the first load
+        result = cli_runner(['reload-dotenv', '--state-file', state, '--hook', 'bash'],
+                            RELOAD_A='1', RELOAD_B='2', RELOAD_C='3')
+
+        assert result.exit_code == 0, result.output
+        assert result.stdout.splitlines() == ['unset RELOAD_C;', "export RELOAD_B='22';"]
+
+    def test_keeps_recorded_override(self, tmp_path, cli_runner):
+        """Test that a reload resolves the file as its last load did."""
+        (tmp_path / '.env').write_text('RELOAD_HOME=fromfile\n')
+        state = str(tmp_path / 'state.json')
+        cli_runner(['load-dotenv', '.env', '--override', '--state-file', state],
+                   RELOAD_HOME='orig')
+
+        result = cli_runner(['reload-dotenv', '--state-file', state, '--hook', 'bash'],
+                            RELOAD_HOME='fromfile')
+        restored = cli_runner(['reload-dotenv', '--state-file', state, '--no-override', '-v'],
+                              RELOAD_HOME='fromfile')
+
+        assert result.exit_code == 0, result.output
+        assert result.stdout == ''
+        assert '- RELOAD_HOME' in restored.output
+        assert '0 changed, 1 removed' in restored.output
+
+    def test_reload_unchanged(self, tmp_path, cli_runner):
+        """Test reloading a file that didn't change."""
+        (tmp_path / '.env').write_text('RELOAD_A=1\n')
+        state = str(tmp_path / 'state.json')
+        cli_runner(['load-dotenv', '.env', '--state-file', state])
+
+        result = cli_runner(['reload-dotenv', '--state-file', state])
+
+        assert result.exit_code == 0, result.output
+        assert 'is unchanged' in result.output
+
+    def test_expansion_error(self, tmp_path, cli_runner):
+        """Test that expansion errors are reported without a traceback."""
+        (tmp_path / '.env').write_text('X=${RELOAD_Y}\n')
+
+        result = cli_runner(['reload-dotenv', '--state-file', str(tmp_path / 'state.json')],
+                            RELOAD_Y='${RELOAD_Y}x')
+
+        assert result.exit_code == 1
+        assert 'Error expanding variables' in result.output
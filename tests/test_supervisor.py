@@ -0,0 +1,162 @@
+"""Tests for dotenv-run --watch."""
+
+import json
+import signal
+import sys
+import threading
+import time
+
+import pytest
+
+from dotenv_tools.supervisor import Supervisor, parse_signal
+from dotenv_tools.watcher import Watcher
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, 'SIGHUP'), reason="requires POSIX signals")
+
+# Appends the value of MODE to a log file, then waits to be stopped
+CHILD = """
+import json, os, signal, sys, time
+log = sys.argv[1]
+
+def write(line):
+    with open(log, 'a') as f:
+        f.write(line + '\\n')
+
+def on_hup(signum, frame):
+    with open(os.environ['DOTENV_DELTA_FILE']) as f:
+        write('delta ' + json.dumps(json.load(f), sort_keys=True))
+
+signal.signal(signal.SIGHUP, on_hup)
+write(f"start {os.getpid()} {os.environ['MODE']}")
+while True:
+    time.sleep(0.05)
+"""
+
+
+def _wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.02)
+    raise AssertionError("timed out")
+
+
+def _lines(log):
+    return log.read_text().splitlines() if log.exists() else []
+
+
+@pytest.fixture
+def supervise(tmp_path):
+    """Start a supervisor in a background thread."""
+    running = []
+
+    def start(reload_signal='restart'):
+        env_file = tmp_path / '.env'
+        log = tmp_path / 'log.txt'
+        supervisor = Supervisor(
+            [env_file], [sys.executable, '-c', CHILD, str(log)],
+            override=True, reload_signal=reload_signal, debounce=0.1,
+            watcher=Watcher(debounce=0.05, poll_interval=0.05, backend='polling'),
+            log=lambda message: None,
+        )
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(code=supervisor.run()))
+        thread.start()
+        running.append((supervisor, thread))
+        _wait_for(lambda: _lines(log))
+        return supervisor, log, result
+
+    yield start
+
+    for supervisor, thread in running:
+        if supervisor.child is not None and supervisor.child.poll() is None:
+            supervisor.child.terminate()
+        thread.join(timeout=10)
+        supervisor.watcher.stop()
+
+
+class TestSupervisor:
+    """Test reloading the command."""
+
+    def test_restart_on_change(self, tmp_path, supervise):
+        """Test that the command restarts with the new value."""
+        (tmp_path / '.env').write_text('MODE=one\n')
+        supervisor, log, result = supervise()
+        first_pid = supervisor.child.pid
+
+        (tmp_path / '.env').write_text('MODE=two\n')
+
+        _wait_for(lambda: len(_lines(log)) == 2)
+        assert _lines(log)[1].endswith(' two')
+        assert supervisor.child.pid != first_pid
+
+    def test_unchanged_values_do_not_reload(self, tmp_path, supervise):
+        """Test that an edit that resolves to the same values is ignored."""
+        (tmp_path / '.env').write_text('MODE=one\n')
+        supervisor, log, result = supervise()
+
+        (tmp_path / '.env').write_text('# a comment\nMODE=one\n')
+        time.sleep(0.6)
+
+        assert len(_lines(log)) == 1
+
+    def test_signal_with_delta_file(self, tmp_path, supervise):
+        """Test that signal mode sends the changed keys without restarting."""
+        (tmp_path / '.env').write_text('MODE=one\nKEEP=same\n')
+        supervisor, log, result = supervise('HUP')
+        pid = supervisor.child.pid
+
+        (tmp_path / '.env').write_text('MODE=two\nKEEP=same\nEXTRA=1\n')
+
+        _wait_for(lambda: len(_lines(log)) == 2)
+        delta = json.loads(_lines(log)[1][len('delta '):])
+        assert delta == {'added': {'EXTRA': '1'}, 'changed': {'MODE': 'two'}, 'removed': []}
+        assert supervisor.child.pid == pid
+
+    def test_child_exit_code(self, tmp_path):
+        """Test that the supervisor returns when the command exits."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+
+        supervisor = Supervisor([env_file], [sys.executable, '-c', 'raise SystemExit(4)'],
+                                watcher=Watcher(backend='polling'))
+
+        assert supervisor.run() == 4
+
+    def test_parse_signal(self):
+        """Test signal name parsing."""
+        assert parse_signal('hup') == signal.SIGHUP
+        assert parse_signal('SIGUSR1') == signal.SIGUSR1
+        with pytest.raises(ValueError):
+            parse_signal('NOPE')
+
+
+class TestWatchCommand:
+    """Test the dotenv-run --watch options."""
+
+    def test_signal_requires_watch(self, tmp_path, cli_runner):
+        """Test that --signal without --watch is a usage error."""
+        (tmp_path / '.env').write_text('A=1\n')
+
+        result = cli_runner(['dotenv-run', '--signal', 'HUP', '--', 'true'])
+
+        assert result.exit_code == 2
+
+    def test_watch_passes_exit_code(self, tmp_path, run_cli):
+        """Test that the supervisor exits with the command's code."""
+        (tmp_path / '.env').write_text('A=1\n')
+
+        result = run_cli(['dotenv-run', '--watch', '--', sys.executable, '-c',
+                          'import os; raise SystemExit(int(os.environ["A"]) + 2)'],
+                         tmp_path)
+
+        assert result.returncode == 3
+
+    def test_watch_without_env_file(self, tmp_path, cli_runner):
+        """Test that a missing .env file is reported without a traceback."""
+        result = cli_runner(['dotenv-run', '--watch', '--', 'true'])
+
+        assert result.exit_code == 1
+        assert 'No .env file found' in result.output
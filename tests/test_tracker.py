@@ -1,26 +1,51 @@
 """Tests for the tracker module."""
 
+import json
+import multiprocessing
 import os
+import stat
 import tempfile
 from pathlib import Path
+
+import pytest
+
+from src.dotenv_tools import locking
 from src.dotenv_tools.tracker import Tracker
 
 
+def _concurrent_load(args):
+    """Load one variable through a fresh tracker, as a separate CLI run would."""
+    state_file, index = args
+    tracker = Tracker(Path(state_file))
+    tracker.load_variables({f'STRESS_{index}': str(index)})
+
+
 class TestTracker:
     """Test environment variable tracking."""
 
     def test_snapshot_environment(self):
-        """Test snapshotting current environment."""
+        """Test snapshotting only the keys about to change."""
         tracker = Tracker(Path(tempfile.mktemp()))
 
         # Set a test variable
         os.environ['TEST_VAR'] = 'test_value'
+        os.environ.pop('TEST_UNSET_VAR', None)
+
+        tracker.snapshot_environment(['TEST_VAR', 'TEST_UNSET_VAR'])
+
+        # Only the requested keys are recorded
+        assert tracker.original_values == {'TEST_VAR': 'test_value', 'TEST_UNSET_VAR': None}
+
+    def test_snapshot_whole_environment(self):
+        """Test that snapshotting without keys records every set variable."""
+        tracker = Tracker(Path(tempfile.mktemp()))
+        os.environ['TEST_VAR'] = 'test_value'
+        tracker.original_values['TEST_VAR'] = 'earlier'
 
         tracker.snapshot_environment()
 
-        # Check that the variable is in original_values
-        assert 'TEST_VAR' in tracker.original_values
-        assert tracker.original_values['TEST_VAR'] == 'test_value'
+        assert tracker.original_values['TEST_VAR'] == 'earlier'
+        assert tracker.original_values['PATH'] == os.environ['PATH']
 
     def test_load_variables(self):
         """Test loading and tracking variables."""
@@ -39,9 +64,11 @@ class TestTracker:
         assert os.environ['VAR1'] == 'value1'
         assert os.environ['VAR2'] == 'value2'
 
-    def test_unload_all(self):
+    def test_unload_all(self, monkeypatch):
         """Test unloading all tracked variables."""
         tracker = Tracker(Path(tempfile.mktemp()))
+        monkeypatch.delenv('VAR1', raising=False)
+        monkeypatch.delenv('VAR2', raising=False)
 
         # Load some variables
         variables = {'VAR1': 'value1', 'VAR2': 'value2'}
@@ -55,6 +82,24 @@ class TestTracker:
         assert 'VAR2' not in os.environ
         assert len(tracker.loaded_vars) == 0
 
+    def test_unload_restores_overwritten_values(self, monkeypatch):
+        """Test that unloading puts back values that existed before loading."""
+        tracker = Tracker(Path(tempfile.mktemp()))
+        monkeypatch.setenv('RESTORE_VAR', 'before')
+        monkeypatch.delenv('RESTORE_NEW', raising=False)
+
+        tracker.load_variables({'RESTORE_VAR': 'after', 'RESTORE_NEW': '1'})
+        assert os.environ['RESTORE_VAR'] == 'after'
+
+        # A later CLI run only has the state file to go on
+        reloaded = Tracker(tracker.state_file)
+        reloaded.load_state()
+        unloaded = reloaded.unload_all()
+
+        assert unloaded == 2
+        assert os.environ['RESTORE_VAR'] == 'before'
+        assert 'RESTORE_NEW' not in os.environ
+
     def test_get_loaded_variables(self):
         """Test getting currently loaded variables."""
         tracker = Tracker(Path(tempfile.mktemp()))
@@ -87,3 +132,229 @@ class TestTracker:
 
         assert count == 3
         assert loaded == {'VAR1', 'VAR2', 'VAR3'}
+
+    def test_apply_variables_sets_only_changed(self, monkeypatch):
+        """Test that unchanged variables are not set again."""
+        tracker = Tracker(Path(tempfile.mktemp()))
+        tracker.apply_variables({'DIFF_A': '1', 'DIFF_B': '2'})
+
+        calls = []
+        original_putenv = os.putenv
+
+        def counting_putenv(key, value):
+            calls.append(key)
+            original_putenv(key, value)
+
+        monkeypatch.setattr(os, 'putenv', counting_putenv)
+
+        delta = tracker.apply_variables({'DIFF_A': '1', 'DIFF_B': '3', 'DIFF_C': '4'})
+
+        assert [os.fsdecode(key) for key in calls] == ['DIFF_B', 'DIFF_C']
+        assert delta.added == {'DIFF_C': '4'}
+        assert delta.changed == {'DIFF_B': '3'}
+        assert delta.removed == []
+        tracker.unload_all()
+
+    def test_apply_variables_prune(self):
+        """Test that pruning removes tracked variables that disappeared."""
+        tracker = Tracker(Path(tempfile.mktemp()))
+        tracker.apply_variables({'PRUNE_A': '1', 'PRUNE_B': '2'})
+
+        delta = tracker.apply_variables({'PRUNE_A': '1'}, prune=True)
+
+        assert delta.removed == ['PRUNE_B']
+        assert not delta.added and not delta.changed
+        assert 'PRUNE_B' not in os.environ
+        assert not tracker.is_tracked('PRUNE_B')
+        assert tracker.is_tracked('PRUNE_A')
+        tracker.unload_all()
+
+    def test_apply_variables_without_prune_keeps_others(self):
+        """Test that other tracked variables survive without pruning."""
+        tracker = Tracker(Path(tempfile.mktemp()))
+        tracker.apply_variables({'KEEP_A': '1'})
+
+        delta = tracker.apply_variables({'KEEP_B': '2'})
+
+        assert delta.added == {'KEEP_B': '2'}
+        assert os.environ['KEEP_A'] == '1'
+        assert tracker.is_tracked('KEEP_A')
+        tracker.unload_all()
+
+
+class TestTrackerState:
+    """Test the state file shared between processes."""
+
+    def test_state_holds_only_touched_keys(self, tmp_path, monkeypatch):
+        """Test that the state file doesn't copy the rest of the environment."""
+        state_file = tmp_path / 'state.json'
+        monkeypatch.setenv('UNRELATED_SECRET', 'hunter2')
+        monkeypatch.delenv('TOUCHED_A', raising=False)
+        tracker = Tracker(state_file)
+
+        tracker.load_variables({'TOUCHED_A': '1'})
+
+        state = json.loads(state_file.read_text())
+        assert state['loaded_vars'] == ['TOUCHED_A']
+        assert state['original_values'] == {'TOUCHED_A': None}
+        assert [entry['prior'] for entry in state['journal']] == [{'TOUCHED_A': None}]
+        tracker.unload_all()
+
+    def test_prune_restores_overwritten_value(self, tmp_path, monkeypatch):
+        """Test that pruning a key that existed before puts its value back."""
+        monkeypatch.setenv('PRUNE_HOME', 'before')
+        tracker = Tracker(tmp_path / 'state.json')
+        tracker.apply_variables({'PRUNE_HOME': 'after'})
+
+        delta = tracker.apply_variables({}, prune=True)
+
+        assert delta.changed == {'PRUNE_HOME': 'before'}
+        assert os.environ['PRUNE_HOME'] == 'before'
+
+    def test_state_is_merged(self, tmp_path):
+        """Test that two trackers on one file keep each other's variables."""
+        state_file = tmp_path / 'state.json'
+        first = Tracker(state_file)
+        second = Tracker(state_file)
+
+        first.load_variables({'MERGE_A': '1'})
+        second.load_variables({'MERGE_B': '2'})
+
+        reloaded = Tracker(state_file)
+        assert reloaded.load_state()
+        assert reloaded.loaded_vars == {'MERGE_A', 'MERGE_B'}
+        reloaded.unload_all()
+
+    def test_pruned_variables_stay_removed(self, tmp_path):
+        """Test that merging doesn't bring back a pruned variable."""
+        state_file = tmp_path / 'state.json'
+        tracker = Tracker(state_file)
+        tracker.apply_variables({'GONE_A': '1', 'GONE_B': '2'})
+
+        tracker.apply_variables({'GONE_A': '1'}, prune=True)
+
+        reloaded = Tracker(state_file)
+        reloaded.load_state()
+        assert reloaded.loaded_vars == {'GONE_A'}
+        tracker.unload_all()
+
+    def test_permissions_and_no_temp_files(self, tmp_path):
+        """Test that the state file is private and temp files are cleaned up."""
+        state_file = tmp_path / 'state.json'
+        tracker = Tracker(state_file, fsync=True)
+
+        tracker.load_variables({'PERM_A': '1'})
+
+        assert stat.S_IMODE(state_file.stat().st_mode) == 0o600
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['state.json', 'state.json.lck']
+        tracker.unload_all()
+
+    def test_corrupted_state_is_replaced(self, tmp_path):
+        """Test that a corrupted state file is ignored and then overwritten."""
+        state_file = tmp_path / 'state.json'
+        state_file.write_text('{"loaded_vars": [')
+        tracker = Tracker(state_file)
+
+        assert not tracker.load_state()
+        tracker.load_variables({'FIX_A': '1'})
+
+        assert json.loads(state_file.read_text())['loaded_vars'] == ['FIX_A']
+        tracker.unload_all()
+
+    @pytest.mark.skipif(locking.fcntl is None or
+                        'fork' not in multiprocessing.get_all_start_methods(),
+                        reason="requires fcntl and fork")
+    def test_concurrent_loaders(self, tmp_path):
+        """Test that dozens of concurrent loaders neither corrupt nor lose state."""
+        state_file = tmp_path / 'state.json'
+        count = 48
+
+        with multiprocessing.get_context('fork').Pool(12) as pool:
+            pool.map(_concurrent_load, [(str(state_file), i) for i in range(count)])
+
+        state = json.loads(state_file.read_text())
+        assert sorted(state['loaded_vars']) == sorted(f'STRESS_{i}' for i in range(count))
+
+
+class TestJournal:
+    """Test undoing loads one at a time."""
+
+    def test_pop_restores_previous_load(self, tmp_path, monkeypatch):
+        """Test that pop undoes only the most recent load."""
+        monkeypatch.delenv('STACK_A', raising=False)
+        monkeypatch.delenv('STACK_B', raising=False)
+        tracker = Tracker(tmp_path / 'state.json')
+        tracker.load_variables({'STACK_A': 'outer'}, source='outer.env')
+        tracker.load_variables({'STACK_A': 'inner', 'STACK_B': '1'}, source='inner.env')
+
+        entry = tracker.pop()
+
+        assert entry['source'] == 'inner.env'
+        assert os.environ['STACK_A'] == 'outer'
+        assert 'STACK_B' not in os.environ
+        assert tracker.loaded_vars == {'STACK_A'}
+
+        tracker.pop()
+        assert 'STACK_A' not in os.environ
+        assert tracker.pop() is None
+
+    def test_pop_from_saved_state(self, tmp_path, monkeypatch):
+        """Test that a later run can pop a load made by an earlier one."""
+        monkeypatch.setenv('STACK_HOME', 'before')
+        state_file = tmp_path / 'state.json'
+        Tracker(state_file).load_variables({'STACK_HOME': 'after'}, source='a.env')
+
+        tracker = Tracker(state_file)
+        tracker.load_state()
+        tracker.pop()
+
+        assert os.environ['STACK_HOME'] == 'before'
+        reloaded = Tracker(state_file)
+        reloaded.load_state()
+        assert reloaded.journal == [] and reloaded.loaded_vars == set()
+
+    def test_same_source_folds(self, tmp_path, monkeypatch):
+        """Test that reloading the same file doesn't grow the journal."""
+        monkeypatch.delenv('FOLD_A', raising=False)
+        tracker = Tracker(tmp_path / 'state.json')
+
+        for value in ('1', '2', '3'):
+            tracker.load_variables({'FOLD_A': value}, source='app.env')
+
+        assert len(tracker.journal) == 1
+        tracker.pop()
+        assert 'FOLD_A' not in os.environ
+
+    def test_compaction(self, tmp_path, monkeypatch):
+        """Test that the journal stays bounded and unload stays exact."""
+        from src.dotenv_tools import tracker as tracker_module
+
+        monkeypatch.setattr(tracker_module, 'MAX_JOURNAL', 4)
+        monkeypatch.setenv('COMPACT_A', 'before')
+        tracker = Tracker(tmp_path / 'state.json')
+
+        for i in range(10):
+            tracker.load_variables({'COMPACT_A': str(i), f'COMPACT_{i}': '1'},
+                                   source=f'{i}.env')
+
+        assert len(tracker.journal) == 4
+        assert tracker.journal[-1]['source'] == '9.env'
+        tracker.unload_all()
+        assert os.environ['COMPACT_A'] == 'before'
+        assert not any(f'COMPACT_{i}' in os.environ for i in range(10))
+
+    def test_concurrent_push_survives_pop(self, tmp_path, monkeypatch):
+        """Test that popping in one tracker keeps another tracker's load."""
+        monkeypatch.delenv('RACE_A', raising=False)
+        monkeypatch.delenv('RACE_B', raising=False)
+        state_file = tmp_path / 'state.json'
+        first = Tracker(state_file)
+        first.load_variables({'RACE_A': '1'}, source='a.env')
+        Tracker(state_file).load_variables({'RACE_B': '2'}, source='b.env')
+
+        first.pop()
+
+        reloaded = Tracker(state_file)
+        reloaded.load_state()
+        assert [e['source'] for e in reloaded.journal] == ['b.env']
+        assert reloaded.loaded_vars == {'RACE_B'}
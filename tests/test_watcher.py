@@ -0,0 +1,159 @@
+"""Tests for the watcher module and LoadDotenv.watch()."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from dotenv_tools.core import LoadDotenv
+from dotenv_tools.delta import EnvDelta, compute_delta
+from dotenv_tools.watcher import Watcher, _load_inotify
+
+BACKENDS = [
+    'polling',
+    pytest.param('inotify', marks=pytest.mark.skipif(
+        _load_inotify() is None, reason='inotify not available')),
+]
+
+
+def _bump_mtime(path):
+    """Make sure a rewrite is visible even on coarse-mtime filesystems."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestComputeDelta:
+    """Test per-key deltas."""
+
+    def test_added_changed_removed(self):
+        """Test all three kinds of change."""
+        delta = compute_delta({'A': '1', 'B': '2'}, {'B': '3', 'C': '4'})
+
+        assert delta.added == {'C': '4'}
+        assert delta.changed == {'B': '3'}
+        assert delta.removed == ['A']
+        assert delta.updated == {'B': '3', 'C': '4'}
+
+    def test_no_change(self):
+        """Test that identical sets produce an empty delta."""
+        delta = compute_delta({'A': '1'}, {'A': '1'})
+
+        assert not delta
+        assert delta == EnvDelta()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+class TestWatcher:
+    """Test change notifications."""
+
+    def test_change_fires_callback(self, tmp_path, backend):
+        """Test that modifying a file calls its callback."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        fired = threading.Event()
+
+        with Watcher(debounce=0.05, poll_interval=0.02, backend=backend) as watcher:
+            watcher.add(env_file, lambda path: fired.set())
+            env_file.write_text('A=2\n')
+            _bump_mtime(env_file)
+
+            assert fired.wait(5)
+            assert watcher.backend == backend
+
+    def test_burst_is_debounced(self, tmp_path, backend):
+        """Test that a burst of writes fires one callback."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=0\n')
+        calls = []
+
+        with Watcher(debounce=0.3, poll_interval=0.02, backend=backend) as watcher:
+            watcher.add(env_file, calls.append)
+            for i in range(5):
+                env_file.write_text(f'A={i + 1}\n')
+                _bump_mtime(env_file)
+                time.sleep(0.03)
+            time.sleep(1.0)
+
+        assert len(calls) == 1
+
+    def test_one_thread_many_files(self, tmp_path, backend):
+        """Test that several files share one watcher thread."""
+        files = [tmp_path / f'{i}.env' for i in range(3)]
+        for path in files:
+            path.write_text('A=1\n')
+        seen = set()
+        done = threading.Event()
+
+        def callback(path):
+            seen.add(path.name)
+            if len(seen) == len(files):
+                done.set()
+
+        before = threading.active_count()
+        with Watcher(debounce=0.05, poll_interval=0.02, backend=backend) as watcher:
+            for path in files:
+                watcher.add(path, callback)
+            assert threading.active_count() == before + 1
+
+            for path in files:
+                path.write_text('A=2\n')
+                _bump_mtime(path)
+
+            assert done.wait(5)
+
+    def test_atomic_rename_is_detected(self, tmp_path, backend):
+        """Test editors that save by renaming a temp file over the original."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        fired = threading.Event()
+
+        with Watcher(debounce=0.05, poll_interval=0.02, backend=backend) as watcher:
+            watcher.add(env_file, lambda path: fired.set())
+            tmp = tmp_path / '.env.swp'
+            tmp.write_text('A=2\n')
+            os.replace(tmp, env_file)
+
+            assert fired.wait(5)
+
+
+class TestLoadDotenvWatch:
+    """Test LoadDotenv.watch() deltas."""
+
+    def test_watch_delivers_delta(self, tmp_path):
+        """Test that the callback receives only changed keys."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\nB=2\nC=3\n')
+        deltas = []
+        received = threading.Event()
+
+        def callback(delta):
+            deltas.append(delta)
+            received.set()
+
+        with Watcher(debounce=0.05, poll_interval=0.02) as watcher:
+            handle = LoadDotenv(env_file).watch(callback, env={}, watcher=watcher)
+            assert handle.values == {'A': '1', 'B': '2', 'C': '3'}
+
+            env_file.write_text('A=1\nB=20\nD=4\n')
+            _bump_mtime(env_file)
+            assert received.wait(5)
+            handle.stop()
+
+        assert deltas == [EnvDelta({'D': '4'}, {'B': '20'}, ['C'])]
+
+    def test_watch_ignores_invalid_file(self, tmp_path):
+        """Test that a temporarily invalid file produces no delta."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('A=1\n')
+        deltas = []
+
+        with Watcher(debounce=0.05, poll_interval=0.02) as watcher:
+            handle = LoadDotenv(env_file).watch(deltas.append, env={}, watcher=watcher)
+            env_file.write_text('not valid\n')
+            _bump_mtime(env_file)
+            time.sleep(0.5)
+            handle.stop()
+
+        assert deltas == []
+        assert handle.values == {'A': '1'}